@@ -0,0 +1,5 @@
+import pandas as pd
+
+# Copy-on-Write for the whole package, set once on import (pool workers import it too): the option is
+# process global, toggling it per call would change pandas under the writer and decoder threads mid-operation
+pd.set_option('mode.copy_on_write', True)
@@ -0,0 +1,48 @@
+"""
+pandas vs polars decoder backends on synthetic registers.
+
+Both backends decode the same register, the outputs must be identical (pandas.testing.assert_frame_equal)
+and the timings are printed side by side. --no-phones drops the phone columns to time the other decoders alone,
+the numbers PolarsPhoneParser can't match with an expression are still resolved row by row through phonenumbers
+and that residue dominates both timings.
+
+Usage (from src/):
+    python -m logics.benchmarks.backends --rows 10000 100000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from logics.benchmarks.synthetic import make_register
+from logics.interfaces.xl import Backend
+from logics.namespaces.enums import PhoneEnum
+from logics.processors.core.data import DataProcessor
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--no-phones', action='store_true')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'pandas s':>12}{'polars s':>12}{'speedup':>10}  output")
+    for rows in args.rows:
+        df = make_register(rows)
+        if args.no_phones:
+            df = df.drop(columns=[phone.value for phone in PhoneEnum if phone.value in df.columns])
+        results, timings = {}, {}
+        for backend in Backend:
+            start = time.perf_counter()
+            results[backend] = DataProcessor(workers=args.workers, backend=backend).process_data(df.copy())
+            timings[backend] = time.perf_counter() - start
+        try:
+            pd.testing.assert_frame_equal(results[Backend.PANDAS], results[Backend.POLARS])
+            output = 'identical'
+        except AssertionError as ex:
+            output = f"DIFFERENT: {ex}"
+        pandas, polars = timings[Backend.PANDAS], timings[Backend.POLARS]
+        print(f"{rows:>10}{pandas:>12.2f}{polars:>12.2f}{pandas / polars:>9.1f}x  {output}")
+
+if __name__ == '__main__':
+    main()
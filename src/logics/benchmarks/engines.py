@@ -0,0 +1,66 @@
+"""
+Excel reader engine benchmark on synthetic registers.
+
+Times every installed engine (plus the streaming openpyxl reader) on default registers
+of the given sizes and prints the fastest one per size.
+
+Usage (from src/):
+    python -m logics.benchmarks.engines --rows 10000 100000 1000000 --workdir /tmp/xl
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict
+
+from logics.benchmarks.synthetic import make_register, write_workbook
+from logics.interfaces.xl import ExcelEngine
+from logics.processors.core.readers import FileReader, ENGINE_MODULES, resolve_engine
+
+STREAM = 'openpyxl (stream)'
+
+def readers(path: str, stem: str) -> Dict[str, Callable[[], object]]:
+    candidates: Dict[str, Callable[[], object]] = {}
+    for engine in ExcelEngine:
+        if resolve_engine(engine) is engine:
+            candidates[engine.value] = lambda engine=engine: FileReader(path, stem, '.xlsx', engine=engine).read_file()
+        else:
+            print(f"skipping {engine.value}: {ENGINE_MODULES[engine]} is not installed")
+    candidates[STREAM] = lambda: sum(len(chunk) for _, chunk in FileReader(path, stem, '.xlsx').read_chunks())
+    return candidates
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--workdir', default=None, help='keep generated registers here between runs')
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp()
+    os.makedirs(workdir, exist_ok=True)
+    results: Dict[int, Dict[str, float]] = {}
+    for rows in args.rows:
+        stem = f"register_{rows}"
+        file_path = os.path.join(workdir, f"{stem}.xlsx")
+        if not os.path.isfile(file_path):
+            print(f"generating {file_path}")
+            write_workbook(file_path, {'Main': make_register(rows)})
+        results[rows] = {}
+        for name, read in readers(workdir, stem).items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                read()
+                timings.append(time.perf_counter() - start)
+            results[rows][name] = min(timings)
+            print(f"{rows:>10} {name:<20}{results[rows][name]:>10.2f}s")
+
+    print()
+    names = list(next(iter(results.values())))
+    print(f"{'rows':>10}" + ''.join(f"{name:>20}" for name in names) + f"{'fastest':>20}")
+    for rows, timings in results.items():
+        fastest = min(timings, key=timings.get)
+        print(f"{rows:>10}" + ''.join(f"{timings[name]:>19.2f}s" for name in names) + f"{fastest:>20}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Peak memory of DataProcessor.process_data on a synthetic register.
+
+tracemalloc follows python and numpy allocations, so the peak is reported as a multiple
+of the input frame (deep memory_usage). ru_maxrss is the peak RSS of the whole process.
+
+Usage (from src/):
+    python -m logics.benchmarks.memory --rows 100000
+"""
+import argparse
+import resource
+import time
+import tracemalloc
+
+from logics.benchmarks.synthetic import make_register
+from logics.processors.core.data import DataProcessor
+
+MB = 1024 ** 2
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000])
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'input MB':>12}{'peak MB':>12}{'peak/input':>12}{'seconds':>10}{'max RSS MB':>12}")
+    for rows in args.rows:
+        df = make_register(rows)
+        size = df.memory_usage(index=True, deep=True).sum()
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        DataProcessor(workers=args.workers).process_data(df)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{rows:>10}{size / MB:>12.1f}{peak / MB:>12.1f}{peak / size:>12.2f}{seconds:>10.2f}{rss:>12.1f}")
+
+if __name__ == '__main__':
+    main()
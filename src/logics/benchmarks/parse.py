@@ -0,0 +1,60 @@
+"""
+Workbook parse benchmark: one pd.read_excel per sheet vs a single parse of the workbook.
+
+Usage (from src/):
+    python -m logics.benchmarks.parse --rows 20000 --repeat 3
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from typing import Callable, Dict
+
+from logics.benchmarks.synthetic import make_post_register, write_workbook
+from logics.processors.core.readers import FileReader
+from logics.namespaces.enums import Sheets
+
+def read_per_sheet(file_path: str) -> Dict[str, pd.DataFrame]:
+    """
+    Previous FileReader behaviour: the workbook is opened to list the sheets, then parsed again for every sheet
+    """
+    excel = pd.ExcelFile(file_path, engine='openpyxl')
+    sheets = excel.sheet_names
+    dataframes = {}
+    for sheet in Sheets:
+        if sheet.value in sheets:
+            dataframes[sheet.name] = pd.read_excel(file_path, sheet_name=sheet.value)
+    return dataframes
+
+def read_single_pass(file_path: str) -> Dict[str, pd.DataFrame]:
+    path, file = os.path.split(file_path)
+    stem, ext = os.path.splitext(file)
+    return FileReader(path, stem, ext).read_file()
+
+def measure(fn: Callable[[str], Dict[str, pd.DataFrame]], file_path: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(file_path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='contracts per workbook')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = write_workbook(os.path.join(tmp, 'post.xlsx'), make_post_register(args.rows))
+        per_sheet = measure(read_per_sheet, file_path, args.repeat)
+        single_pass = measure(read_single_pass, file_path, args.repeat)
+
+    print(f"rows={args.rows} sheets={len(Sheets)} repeat={args.repeat}")
+    print(f"{'per-sheet read_excel':<24}{per_sheet:>10.2f}s")
+    print(f"{'single pass':<24}{single_pass:>10.2f}s")
+    print(f"{'saved':<24}{per_sheet - single_pass:>10.2f}s ({1 - single_pass / per_sheet:.0%})")
+
+if __name__ == '__main__':
+    main()
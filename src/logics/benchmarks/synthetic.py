@@ -0,0 +1,89 @@
+import importlib.util
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+from logics.namespaces.enums import Person, Passport, Debt, Register, PhoneEnum, Phones, NameVariants, Sheets
+
+SURNAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнова', 'Кузнецова', 'Попов']
+NAMES = ['Иван', 'Петр', 'Анна', 'Мария', 'Олег', 'Елена']
+PATRONYMICS = ['Иванович', 'Петрович', 'Сергеевна', 'Олеговна', 'Андреевич']
+# Azerbaijani patronymics carry a fourth word, the decoder splits fio_full into four names
+ADDNAMES = {'Мамедов Рашид Ахмед': 'оглы', 'Алиева Лейла Ахмед': 'кызы', 'Гасанов Эльдар Рафик': 'оглы'}
+ADDNAME_EVERY = 20
+PRODUCT_GROUPS = ['НСО', 'Автокредит', 'Целевой потребительский кредит', 'Нецелевой потребительский кредит']
+CODES = ['916', '903', '926', '495', '812', '343']
+
+def make_register(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic default register shaped like a typical bank upload
+    """
+    rng = np.random.default_rng(seed)
+    phones = _phones(rng, rows)
+    return pd.DataFrame({
+        NameVariants.FIO.value: _names(rng, rows),
+        Person.BIRTH_DATE.value: pd.to_datetime(rng.integers(-7_000, 12_000, rows), unit='D').strftime('%d.%m.%Y'),
+        Person.MAIL.value: np.where(rng.random(rows) < 0.5, 'CLIENT@MAIL.RU', 'не задано'),
+        Person.POSITION.value: np.where(rng.random(rows) < 0.5, 'Инженер', ''),
+        Passport.SERIES.value: rng.integers(1_000, 9_999, rows),
+        Passport.NUMBER.value: rng.integers(1, 999_999, rows),
+        Passport.ORGANIZATION.value: 'ОУФМС России',
+        PhoneEnum.PHONES.value: phones + ', ' + _phones(rng, rows),
+        PhoneEnum.P1.value: _phones(rng, rows),
+        Debt.NUM.value: pd.Series(np.arange(rows)).map('CR{:08d}'.format),
+        Debt.TOTAL.value: rng.random(rows).round(2) * 100_000,
+        Debt.OVERDUE.value: rng.random(rows).round(2) * 50_000,
+        Debt.OVERDUE_PERCENT.value: rng.random(rows).round(2) * 5_000,
+        Debt.FINES.value: rng.random(rows).round(2) * 500,
+        Register.CLIENT_ID.value: rng.integers(1, 10_000_000, rows),
+        Register.CREDIT_ID.value: rng.integers(1, 10_000_000, rows),
+        Register.OUTER_ID.value: rng.integers(1, 10_000_000, rows),
+        Register.PRODUCT_GROUP.value: _choice(rng, PRODUCT_GROUPS, rows),
+        Register.CURRENCY.value: 'RUR',
+    })
+
+def make_post_register(rows: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """
+    Synthetic Post Bank workbook: contracts, telephones and addresses sheets joined by id
+    """
+    rng = np.random.default_rng(seed)
+    contracts = make_register(rows, seed).drop(columns=[PhoneEnum.PHONES.value, PhoneEnum.P1.value])
+    contracts.insert(0, Register.ID.value, np.arange(rows))
+    ids = np.repeat(np.arange(rows), 2)
+    telephones = pd.DataFrame({
+        Register.ID.value: ids,
+        PhoneEnum.P1.value: _phones(rng, len(ids)),
+        Phones.TYPE.value: _choice(rng, ['Мобильный', 'Рабочий'], len(ids)),
+    })
+    addresses = pd.DataFrame({
+        Register.ID.value: ids,
+        Register.ADDRESS.value: 'г. Москва, ул. Ленина, д. ' + pd.Series(rng.integers(1, 200, len(ids))).astype(str),
+        Register.ADDRESS_TYPE.value: np.tile(['Регистрация', 'Фактический'], rows),
+    })
+    return {
+        Sheets.CONTRACTS.value: contracts,
+        Sheets.TELEPHONES.value: telephones,
+        Sheets.ADDRESSES.value: addresses,
+    }
+
+def write_workbook(path: str, sheets: Dict[str, pd.DataFrame]) -> str:
+    engine = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') is not None else 'openpyxl'
+    with pd.ExcelWriter(path, engine=engine) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return path
+
+def _choice(rng: np.random.Generator, values: list, rows: int) -> pd.Series:
+    return pd.Series(np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)])
+
+def _names(rng: np.random.Generator, rows: int) -> pd.Series:
+    '''Surname, name and patronymic, every ADDNAME_EVERY-th one a four word name so the split is always four wide'''
+    names = _choice(rng, SURNAMES, rows) + ' ' + _choice(rng, NAMES, rows) + ' ' + _choice(rng, PATRONYMICS, rows)
+    four = np.arange(rows) % ADDNAME_EVERY == 0
+    names[four] = _choice(rng, [f'{name} {addname}' for name, addname in ADDNAMES.items()], int(four.sum())).to_numpy()
+    return names
+
+def _phones(rng: np.random.Generator, rows: int) -> pd.Series:
+    body = pd.Series(rng.integers(0, 10_000_000, rows)).map('{:07d}'.format)
+    prefix = _choice(rng, ['8', '+7', '7', ''], rows)
+    return prefix + _choice(rng, CODES, rows) + body
@@ -1,10 +1,25 @@
 from dataclasses import dataclass
 
+from logics.namespaces.enums import RunStatus
+
 @dataclass
 class ProgramPaths:
     input_path: str = 'assets/uploads'
     output_path: str = 'assets/downloads'
+    cache_path: str = 'assets/cache'
+    store_path: str = 'assets/store'
+    checkpoint_path: str = 'assets/checkpoints'
+    phone_cache_path: str = 'assets/cache/phones.json'
+    numbering_path: str = 'assets/numbering'
 
 @dataclass
 class ProgramConfig:
-    pass
\ No newline at end of file
+    pass
+
+@dataclass
+class FileStatus:
+    file: str
+    status: RunStatus = RunStatus.PENDING
+    outputs: tuple = ()
+    error: str = ''
+    elapsed: float = 0.0
\ No newline at end of file
@@ -1,10 +1,26 @@
+import os
+import time
+from collections import Counter
+from contextlib import nullcontext
+import pandas as pd
 import logging as lg
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List
 
 from .processors.core.readers import FileReader
-from .processors.core.data import DataProcessor
-from .processors.core.writers import DataWriter
-from .namespaces.enums import Datasets
+from .processors.core.data import DataProcessor, pool_context
+from .processors.core.store import RowStore
+from .processors.core.checkpoint import Checkpoint
+from .processors.data.normalizer import PHONE_CACHE, PHONE_POOL
+from .processors.core.writers import DataWriter, BackgroundWriter, MAIN_SHEET, MAX_PENDING
+from .namespaces.enums import Datasets, RunStatus
 from .interfaces.paths import Extension
+from .interfaces.xl import ExcelEngine, Backend
+from .functions.profiling import Profiler
+from .entities.program import ProgramPaths, FileStatus
+
+BATCH_EXTENSIONS = (Extension.XLSX.value, Extension.CSV.value, Extension.NDJSON.value)
+POST_SHEET = 'Post'
 
 def execute() -> None:
     """
@@ -17,24 +33,188 @@ def execute() -> None:
         file = r"post"
         extension = r".xlsx"
 
-        file_reader = FileReader(path, file, extension)
-        data_processor = DataProcessor()
-        data_writer = DataWriter()
-
-        dataset_hash = file_reader.read_file()
-        assert dataset_hash is not None, "Reading failed"
-
-        datasets = []
-        for sheet, dataset in dataset_hash.items():
-            if sheet == 'default':
-                processed_dataset = data_processor.process_data(dataset)
-                data_writer.save_file(processed_dataset, method=Extension.XLSX, name='output')
-            if sheet != 'default':
-                datasets.append(dataset)
-        if datasets:
-            contracts, phones, addresses = datasets
-            processed_dataset = data_processor.process_post(contracts=contracts, phones=phones, addresses=addresses)
-            data_writer.save_file(processed_dataset, method=Extension.XLSX, name='output')
+        process_file(path, file, extension, name='output')
     except Exception as e:
         lg.exception('Err in |main|')
         lg.error(f'Err::{e}')
+
+def process_file(path: str, file: str, extension: str, output_path: str = ProgramPaths.output_path, name: str = '',
+                 engine: ExcelEngine = ExcelEngine.OPENPYXL, profile: bool = False,
+                 backend: Backend = Backend.PANDAS, store: RowStore | None = None,
+                 checkpoint: bool = False, phone_cache: str | None = None,
+                 phone_processes: int | None = None) -> List[str]:
+    """
+    Read -> DataProcessor -> DataWriter for a single register.
+    Returns the paths of the written outputs, output_path/name.xlsx. name defaults to the register's file name
+    without its extension, output_names tells apart registers sharing one.
+    With profile set, per-step timings are logged as a table and saved to output_path/name.profile.json.
+    With a store, rows decoded by an earlier run are reused instead of decoded again.
+    With checkpoint set, a run that failed before its output was written resumes after the last decoder it completed,
+    the checkpoint is removed once the output is written.
+    phone_cache is a file the parsed phones are kept in between runs (see ProgramPaths.phone_cache_path),
+    phone_processes sizes the pool phones are parsed in (see PhonePool), None leaves it as it is.
+    """
+    name = name or file
+    stages = Checkpoint(file + extension) if checkpoint else None
+    if phone_processes is not None:
+        PHONE_POOL.resize(phone_processes)
+    if phone_cache:
+        PHONE_CACHE.load(phone_cache)
+    with Profiler() if profile else nullcontext() as profiler:
+        processed = decode_file(path, file, extension, engine, backend, store, stages)
+        if phone_cache:
+            PHONE_CACHE.save(phone_cache)
+        outputs = [DataWriter(output_path).save_workbook(processed, name=name)] if processed else []
+    if stages is not None:
+        stages.clear()
+    if profiler is not None:
+        profiler.save(os.path.join(output_path, f'{name}.profile.json'))
+        lg.info(f'|profile| {name}\n{profiler.table()}')
+    return outputs
+
+def decode_file(path: str, file: str, extension: str, engine: ExcelEngine = ExcelEngine.OPENPYXL,
+                backend: Backend = Backend.PANDAS, store: RowStore | None = None,
+                checkpoint: Checkpoint | None = None) -> Dict[str, pd.DataFrame]:
+    """
+    Read -> DataProcessor for a single register, processed datasets keyed by output sheet
+    """
+    file_reader = FileReader(path, file, extension, engine=engine)
+    data_processor = DataProcessor(backend=backend, store=store, checkpoint=checkpoint)
+
+    dataset_hash = file_reader.read_file()
+    assert dataset_hash is not None, "Reading failed"
+    if isinstance(dataset_hash, pd.DataFrame):
+        dataset_hash = {'default': dataset_hash}
+
+    processed = {}
+    datasets = []
+    for sheet, dataset in dataset_hash.items():
+        if sheet == 'default':
+            processed[MAIN_SHEET] = data_processor.process_data(dataset)
+        if sheet != 'default':
+            datasets.append(dataset)
+    if datasets:
+        contracts, phones, addresses = datasets
+        processed[POST_SHEET] = data_processor.process_post(contracts=contracts, phones=phones, addresses=addresses)
+    return processed
+
+def execute_pipeline(input_path: str = ProgramPaths.input_path, output_path: str = ProgramPaths.output_path,
+                     engine: ExcelEngine = ExcelEngine.OPENPYXL, max_pending: int = MAX_PENDING,
+                     on_done: Callable[[FileStatus], None] | None = None,
+                     on_error: Callable[[FileStatus], None] | None = None,
+                     backend: Backend = Backend.PANDAS, store: RowStore | None = None,
+                     checkpoint: bool = False, phone_cache: str | None = None,
+                     phone_processes: int | None = None) -> Dict[str, FileStatus]:
+    """
+    Decode the registers in input_path one after another on the calling thread,
+    while a BackgroundWriter serialises the previous outputs to output_path.
+    With checkpoint set, a register's checkpoint is removed once its output is written.
+    phone_cache and phone_processes are those of process_file, for the whole pipeline.
+    """
+    lg.info(f'Executing |pipeline| on {input_path}')
+    files = find_registers(input_path)
+    names = output_names(files)
+    os.makedirs(output_path, exist_ok=True)
+    if phone_processes is not None:
+        PHONE_POOL.resize(phone_processes)
+    if phone_cache:
+        PHONE_CACHE.load(phone_cache)
+
+    def written(status: FileStatus) -> None:
+        Checkpoint(status.file).clear()
+        if on_done is not None:
+            on_done(status)
+
+    with BackgroundWriter(DataWriter(output_path), max_pending, written if checkpoint else on_done, on_error) as writer:
+        for file in files:
+            stem, extension = os.path.splitext(file)
+            try:
+                processed = decode_file(input_path, stem, extension, engine, backend, store,
+                                        Checkpoint(file) if checkpoint else None)
+            except Exception as e:
+                lg.exception(f'Err in |pipeline| for {file}')
+                writer.statuses[file] = FileStatus(file, RunStatus.FAILED, error=f'{type(e).__name__}: {e}')
+                if on_error is not None:
+                    on_error(writer.statuses[file])
+                continue
+            writer.submit(processed, names[file], file=file)
+    if phone_cache:
+        PHONE_CACHE.save(phone_cache)
+    return writer.statuses
+
+def execute_batch(input_path: str = ProgramPaths.input_path, output_path: str = ProgramPaths.output_path,
+                  workers: int | None = None, engine: ExcelEngine = ExcelEngine.OPENPYXL,
+                  backend: Backend = Backend.PANDAS, store: RowStore | None = None,
+                  checkpoint: bool = False, phone_cache: str | None = None) -> Dict[str, FileStatus]:
+    """
+    Process every register found in input_path in a bounded process pool.
+    Each file is written to output_path under its own name (see output_names), the per-file status is returned.
+    With a phone_cache, every worker saves its entries to a part of its own, merged into the cache once at the end.
+    """
+    lg.info(f'Executing |batch| on {input_path}')
+    files = find_registers(input_path)
+    statuses = {file: FileStatus(file) for file in files}
+    if not files:
+        lg.warning(f'No registers found in {input_path}')
+        return statuses
+    names = output_names(files)
+    os.makedirs(output_path, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(files)),
+                             mp_context=pool_context(backend)) as pool:
+        futures = {pool.submit(_run_file, input_path, file, names[file], output_path, engine, backend, store,
+                               checkpoint, phone_cache): file for file in files}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                statuses[file] = future.result()
+            except Exception as e:
+                statuses[file] = FileStatus(file, RunStatus.FAILED, error=f'{type(e).__name__}: {e}')
+            lg.info(f'|batch| {file}: {statuses[file].status.value} {statuses[file].error}')
+    if phone_cache:
+        PHONE_CACHE.merge_parts(phone_cache)
+
+    failed = [file for file, status in statuses.items() if status.status is RunStatus.FAILED]
+    lg.info(f'|batch| finished: {len(files) - len(failed)} done, {len(failed)} failed {failed}')
+    return statuses
+
+def find_registers(input_path: str) -> List[str]:
+    """
+    Registers currently present in input_path, Excel lock files excluded
+    """
+    if not os.path.isdir(input_path):
+        return []
+    return sorted(
+        f for f in os.listdir(input_path)
+        if os.path.isfile(os.path.join(input_path, f))
+        and f.endswith(BATCH_EXTENSIONS)
+        and not f.startswith('~$')
+    )
+
+def output_names(files: List[str]) -> Dict[str, str]:
+    """
+    Output name of each register: its file name without the extension,
+    registers sharing a stem (foo.xlsx and foo.csv) keep their format in it, foo_xlsx and foo_csv
+    """
+    stems = Counter(os.path.splitext(file)[0] for file in files)
+    names = {}
+    for file in files:
+        stem, extension = os.path.splitext(file)
+        names[file] = stem if stems[stem] == 1 else f"{stem}_{extension.lstrip('.')}"
+    return names
+
+def _run_file(input_path: str, file: str, name: str, output_path: str, engine: ExcelEngine, backend: Backend,
+              store: RowStore | None, checkpoint: bool, phone_cache: str | None) -> FileStatus:
+    start = time.perf_counter()
+    stem, extension = os.path.splitext(file)
+    try:
+        if phone_cache:
+            PHONE_CACHE.load(phone_cache)
+        outputs = process_file(input_path, stem, extension, output_path, name, engine=engine, backend=backend,
+                               store=store, checkpoint=checkpoint)
+        if phone_cache:
+            PHONE_CACHE.save(PHONE_CACHE.part(phone_cache))
+        return FileStatus(file, RunStatus.DONE, tuple(outputs), elapsed=time.perf_counter() - start)
+    except Exception as e:
+        lg.exception(f'Err in |batch| for {file}')
+        return FileStatus(file, RunStatus.FAILED, error=f'{type(e).__name__}: {e}', elapsed=time.perf_counter() - start)
@@ -0,0 +1,99 @@
+import os
+import numpy as np
+import pandas as pd
+import logging as lg
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_SUFFIX = '.arrow'
+PICKLE_SUFFIX = '.pkl'
+
+def arrow_safe(df: pd.DataFrame) -> bool:
+    """
+    True when the frame survives an Arrow round trip unchanged:
+    string column names, and object columns holding only strings with NaN as the missing value
+    """
+    if pa is None:
+        return False
+    if not all(isinstance(column, str) for column in df.columns) or not df.columns.is_unique:
+        return False
+    for column in df.columns:
+        series = df[column]
+        if series.dtype != object:
+            continue
+        if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+            return False
+        if (series.values == None).any():
+            return False
+    return True
+
+def dump_frame(df: pd.DataFrame, path: str) -> str:
+    """
+    Persist a dataframe under path (without suffix) as Arrow IPC, or as pickle when Arrow would alter it.
+    Returns the written file path.
+    """
+    if arrow_safe(df):
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            target = path + ARROW_SUFFIX
+            with pa.OSFile(target, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            return target
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as ex:
+            lg.warning(f"Arrow could not serialise dataframe, falling back to pickle: {ex}")
+    target = path + PICKLE_SUFFIX
+    df.to_pickle(target)
+    return target
+
+def load_frame(path: str) -> pd.DataFrame:
+    """
+    Load a dataframe written by dump_frame. Arrow files are memory mapped.
+    """
+    if path.endswith(ARROW_SUFFIX):
+        if pa is None:
+            raise ImportError("pyarrow is required to load Arrow IPC files")
+        with pa.memory_map(path, 'r') as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas()
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].where(df[column].notna(), np.nan)
+        return df
+    return pd.read_pickle(path)
+
+def remove_frame(path: str) -> None:
+    for suffix in (ARROW_SUFFIX, PICKLE_SUFFIX):
+        if os.path.isfile(path + suffix):
+            os.remove(path + suffix)
+
+def is_text(series: pd.Series) -> bool:
+    """
+    True for typed string columns (see namespaces.schema), False for plain object columns
+    """
+    return isinstance(series.dtype, pd.StringDtype)
+
+def as_text(series: pd.Series) -> pd.Series:
+    """
+    Typed string columns keep their dtype, anything else is cast with astype(str).
+    Missing values become 'nan' either way, which is what the decoders expect from astype(str).
+    """
+    if is_text(series):
+        return series.fillna('nan')
+    return series.astype(str)
+
+def arrow_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of the frame that Arrow can serialise: object columns mixing strings and other values are cast to str,
+    missing values stay null
+    """
+    mixed = [
+        column for column in df.columns[df.dtypes == object]
+        if pd.api.types.infer_dtype(df[column], skipna=True) not in ('string', 'empty')
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for column in mixed:
+        df[column] = df[column].astype(str).where(df[column].notna(), None)
+    return df
@@ -0,0 +1,122 @@
+import json
+import time
+import pandas as pd
+import logging as lg
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Any, Dict, List
+
+from logics.functions.std import Some
+
+MB = 1024 ** 2
+
+@dataclass
+class StepRecord:
+    step: str
+    seconds: float
+    rows: int
+    memory_before: int
+    memory_after: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+class Profiler:
+    """
+    Collects wall time, rows and dataframe memory of every @profiled step run while it is active:
+        with Profiler() as profiler:
+            DataProcessor().process_data(df)
+        profiler.save(path); print(profiler.table())
+    Memory is DataFrame.memory_usage, deep=True also counts the python strings of object columns but is much slower.
+    Steps run in partition worker processes are not recorded.
+    """
+    def __init__(self, deep: bool = False):
+        self.deep = deep
+        self.records: List[StepRecord] = []
+        self._token = None
+
+    def __enter__(self) -> 'Profiler':
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active.reset(self._token)
+
+    def memory(self, df: Some[pd.DataFrame]) -> int:
+        return int(df.memory_usage(index=True, deep=self.deep).sum()) if isinstance(df, pd.DataFrame) else 0
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Records aggregated per step, in the order steps first finished
+        """
+        steps: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            step = steps.setdefault(record.step, {
+                'step': record.step, 'calls': 0, 'seconds': 0.0, 'rows': 0,
+                'memory_before': record.memory_before, 'memory_after': 0,
+            })
+            step['calls'] += 1
+            step['seconds'] += record.seconds
+            step['rows'] += record.rows
+            step['memory_after'] = record.memory_after
+        for step in steps.values():
+            step['rows_per_second'] = step['rows'] / step['seconds'] if step['seconds'] else 0.0
+        return list(steps.values())
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'deep_memory': self.deep,
+            'summary': self.summary(),
+            'records': [dict(asdict(record), rows_per_second=record.rows_per_second) for record in self.records],
+        }
+
+    def save(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        lg.info(f"Profile saved to {path}")
+        return path
+
+    def table(self) -> str:
+        header = f"{'step':<45}{'calls':>7}{'seconds':>10}{'rows/s':>12}{'MB before':>11}{'MB after':>10}"
+        lines = [header, '-' * len(header)]
+        for step in self.summary():
+            lines.append(
+                f"{step['step']:<45}{step['calls']:>7}{step['seconds']:>10.3f}{step['rows_per_second']:>12.0f}"
+                f"{step['memory_before'] / MB:>11.1f}{step['memory_after'] / MB:>10.1f}"
+            )
+        return '\n'.join(lines)
+
+_active: ContextVar[Some[Profiler]] = ContextVar('profiler', default=None)
+
+def active_profiler() -> Some[Profiler]:
+    return _active.get()
+
+def profiled(func):
+    """
+    Record the decorated step on the active Profiler, a plain call when there is none.
+    The frame measured is self.df for decoder methods, otherwise the first dataframe argument.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active.get()
+        if profiler is None:
+            return func(*args, **kwargs)
+        before = _frame(args, kwargs)
+        rows, memory_before = (len(before), profiler.memory(before)) if before is not None else (0, 0)
+        result = None
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            after = result if isinstance(result, pd.DataFrame) else _frame(args, kwargs)
+            profiler.records.append(StepRecord(func.__qualname__, seconds, rows, memory_before, profiler.memory(after)))
+    return wrapper
+
+def _frame(args: tuple, kwargs: dict) -> Some[pd.DataFrame]:
+    if args and isinstance(getattr(args[0], 'df', None), pd.DataFrame):
+        return args[0].df
+    return next((arg for arg in (*args, *kwargs.values()) if isinstance(arg, pd.DataFrame)), None)
@@ -1,6 +1,58 @@
-from typing import Protocol
+from typing import Protocol, ClassVar, FrozenSet, Any, List
 from pandas import DataFrame
 
+ALL_COLUMNS: FrozenSet[str] = frozenset(['*'])
+
 class Decoder(Protocol):
+    """
+    reads / writes declare the columns a decoder looks at and the ones it creates, overwrites or drops.
+    ALL_COLUMNS means the whole frame, such a decoder runs alone on the full dataframe.
+    A skippable decoder is a no-op when none of its reads are present, so it is not run at all.
+    failed is set when decode gave up half way and returned the frame as it was at that point.
+    """
+    reads: ClassVar[FrozenSet[str]] = ALL_COLUMNS
+    writes: ClassVar[FrozenSet[str]] = ALL_COLUMNS
+    skippable: ClassVar[bool] = False
+    failed: bool = False
+
     def decode(self) -> DataFrame:
-        ...
\ No newline at end of file
+        ...
+
+    @classmethod
+    def frame_hints(cls, df: DataFrame) -> Any:
+        """
+        Decisions taken over the whole input frame (delimiters, widths, column-wide checks),
+        passed to the decoders of every row partition so they decide the same way. None when there are none.
+        """
+        return None
+
+    @classmethod
+    def chunk_hints(cls, df: DataFrame) -> Any:
+        """
+        What frame_hints needs from one chunk of a frame read in chunks, see merge_hints
+        """
+        return cls.frame_hints(df)
+
+    @classmethod
+    def merge_hints(cls, hints: List[Any]) -> Any:
+        """
+        frame_hints of the whole frame from the chunk_hints of its chunks.
+        A decoder whose hints differ between chunks has to say how they combine.
+        """
+        if any(hint != hints[0] for hint in hints):
+            raise NotImplementedError(f"{cls.__name__} cannot merge the frame hints of chunks")
+        return hints[0] if hints else None
+
+    @classmethod
+    def partitionable(cls, df: DataFrame) -> bool:
+        """
+        False when the output shape depends on the frame in a way frame_hints does not capture
+        """
+        return True
+
+    @classmethod
+    def data_version(cls) -> str:
+        """
+        Version of the data files the output depends on besides the code (reference tables), '' when there are none
+        """
+        return ''
@@ -11,6 +11,11 @@ class Extension(Enum):
     XLSX = ".xlsx"
     CSV = ".csv"
     JSON = ".json"
+    NDJSON = ".ndjson"
+    PARQUET = ".parquet"
+    FEATHER = ".feather"
+    CSV_GZ = ".csv.gz"
+    SQLITE = ".sqlite"
     PDF = ".pdf"
     DOCX = ".docx"
 
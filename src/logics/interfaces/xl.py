@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Protocol, Dict, Iterable, Iterator, Tuple
 from enum import Enum
 
 from pandas import DataFrame
@@ -10,14 +10,28 @@ class FileType(Enum):
     CSV = 'csv'
     JSON = 'json'
 
+class ExcelEngine(Enum):
+    OPENPYXL = 'openpyxl'
+    CALAMINE = 'calamine'
+
+class Backend(Enum):
+    PANDAS = 'pandas'
+    POLARS = 'polars'
+
 class FileReaderProtocol(Protocol):
     def read_file(self) -> DataFrame:
         ...
 
+    def read_chunks(self, chunk_size: int) -> Iterator[Tuple[str, DataFrame]]:
+        ...
+
 class DataProcessorProtocol(Protocol):
-    def process_data(self, df: DataFrame) -> DataFrame:
+    def process_data(self, df: DataFrame | Iterable[DataFrame]) -> DataFrame | Iterator[DataFrame]:
         ...
 
 class DataWriterProtocol(Protocol):
-    def save_file(self, df: DataFrame, method: FileType) -> None:
+    def save_file(self, df: DataFrame | Iterable[DataFrame], method: FileType, name: str) -> None:
+        ...
+
+    def save_workbook(self, datasets: Dict[str, DataFrame | Iterable[DataFrame]], name: str) -> str:
         ...
\ No newline at end of file
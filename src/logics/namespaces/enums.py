@@ -12,10 +12,25 @@ class Person(Enum):
     REG_ADDRESS = "reg_addr"
     HOME_ADDRESS = "home_addr"
     MAIL = "mail"
+    MAILS = "mails"
     POSITION = "position"
     WORK = "work"
     REGISTRATION = "registration"
 
+class Residence(Enum):
+    REG_REGION = "rg_reg"
+    REG_LOCALITY = "np_reg"
+    REG_STREET = "st_reg"
+    REG_HOUSE = "hs_reg"
+    REG_BUILDING = "cp_reg"
+    REG_FLAT = "ft_reg"
+    LIV_REGION = "rg_liv"
+    LIV_LOCALITY = "np_liv"
+    LIV_STREET = "st_liv"
+    LIV_HOUSE = "hs_liv"
+    LIV_BUILDING = "cp_liv"
+    LIV_FLAT = "ft_liv"
+
 class NameVariants(Enum):
     IFO = "ifo_full"
     FIO = "fio_full"
@@ -87,6 +102,10 @@ class Phones(Enum):
     RESULT = 'phone_result'
     PHONE_NUM = "phone_num"
 
+class PhoneType(Enum):
+    MOBILE = "mobile"
+    LANDLINE = "landline"
+
 class PhoneEnum(Enum):
     PHONES = "phones"
     PHONES_2 = "phones_2"
@@ -141,4 +160,14 @@ class Datasets(Enum):
 class Sheets(Enum):
     CONTRACTS = 'Договоры'
     TELEPHONES = 'Телефоны'
-    ADDRESSES = 'Адреса'
\ No newline at end of file
+    ADDRESSES = 'Адреса'
+
+class RunStatus(Enum):
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+class Partition(Enum):
+    REGION = 'region'
+    PRODUCT = 'product'
+    REG_DATE = 'reg_date'
\ No newline at end of file
@@ -0,0 +1,80 @@
+import pandas as pd
+import logging as lg
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet
+
+from logics.namespaces.enums import Clients, Passport, PassportVariants, Debt, Register, Phones, PhoneEnum
+
+try:
+    import pyarrow
+    TEXT = pd.StringDtype('pyarrow')
+except ImportError:
+    TEXT = pd.StringDtype('python')
+CATEGORY = 'category'
+MONEY = 'float64'
+# grouping spaces of Russian formatted amounts, regular and non-breaking: '1 234,56'
+GROUPING = r'[\s\u00a0]'
+
+@dataclass(frozen=True)
+class Schema:
+    """
+    Column dtypes declared for a register type.
+    Text and categorical columns are typed by the reader while parsing, money columns are coerced to float64 after it.
+    Values that are not amounts are kept as they were, the column then stays object.
+    """
+    text: FrozenSet[str] = field(default_factory=frozenset)
+    categories: FrozenSet[str] = field(default_factory=frozenset)
+    money: FrozenSet[str] = field(default_factory=frozenset)
+
+    def read_dtypes(self) -> Dict[str, object]:
+        dtypes: Dict[str, object] = {column: TEXT for column in self.text}
+        dtypes.update({column: CATEGORY for column in self.categories})
+        return dtypes
+
+    def coerce(self, df: pd.DataFrame) -> pd.DataFrame:
+        for column in self.money:
+            if column in df.columns and df[column].dtype != MONEY:
+                df[column] = self.amounts(df[column])
+        return df
+
+    @staticmethod
+    def amounts(column: pd.Series) -> pd.Series:
+        '''Amounts with grouping spaces and a decimal comma as float64, the values that still fail are left unchanged'''
+        text = column.astype(str).str.replace(GROUPING, '', regex=True).str.replace(',', '.', regex=False)
+        present = column.notna() & (text != '')
+        numbers = pd.to_numeric(text.where(present), errors='coerce').astype(MONEY)
+        failed = present & numbers.isna()
+        if not failed.any():
+            return numbers
+        lg.warning(f"{int(failed.sum())} values of {column.name} are not amounts, kept as they are: "
+                   f"{column[failed].unique()[:5].tolist()}")
+        return numbers.astype(object).where(~failed, column)
+
+    def extend(self, text: FrozenSet[str] = frozenset(), categories: FrozenSet[str] = frozenset(),
+               money: FrozenSet[str] = frozenset()) -> 'Schema':
+        return Schema(self.text | text, self.categories | categories, self.money | money)
+
+DEFAULT_SCHEMA = Schema(
+    text=frozenset(
+        [variant.value for variant in PassportVariants]
+        + [Passport.SERIES.value, Passport.NUMBER.value, Passport.ORGANIZATION.value]
+        + [phone.value for phone in PhoneEnum]
+        + [Debt.NUM.value]
+    ),
+    categories=frozenset([Register.CURRENCY.value, Register.PRODUCT_GROUP.value]),
+    money=frozenset([
+        Debt.SUM.value, Debt.TOTAL.value, Debt.CURRENT.value, Debt.CURRENT_PERCENT.value,
+        Debt.OVERDUE.value, Debt.OVERDUE_PERCENT.value, Debt.COMISSIONS.value, Debt.FINES.value,
+        Debt.FINAL_CURRENT.value, Debt.FINAL_CURRENT_PERCENT.value, Debt.STATE_DUTY.value,
+    ]),
+)
+
+POST_SCHEMA = DEFAULT_SCHEMA.extend(
+    text=frozenset([Register.ID.value, Register.ADDRESS.value]),
+    categories=frozenset([Register.ADDRESS_TYPE.value, Phones.TYPE.value]),
+)
+
+SCHEMAS: Dict[Clients, Schema] = {
+    Clients.DEFAULT: DEFAULT_SCHEMA,
+    Clients.POST: POST_SCHEMA,
+}
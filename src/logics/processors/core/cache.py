@@ -0,0 +1,113 @@
+import os
+import json
+import shutil
+import hashlib
+import pandas as pd
+import logging as lg
+from typing import Dict, List, Tuple
+
+from logics.entities.program import ProgramPaths
+from logics.functions.frames import dump_frame, load_frame
+from logics.functions.std import Some
+
+CACHE_SIZE = 2 * 1024 ** 3
+MANIFEST = 'manifest.json'
+BLOCK_SIZE = 1024 ** 2
+
+class SheetCache:
+    """
+    Content-addressed cache of parsed registers.
+    Entries are keyed by the SHA-256 of the file (plus an optional reader variant) and hold one
+    Arrow IPC file per sheet, loaded with memory mapping on a hit. The cache is size bounded
+    and evicts the least recently used entries first.
+    """
+    def __init__(self, cache_path: str = ProgramPaths.cache_path, max_bytes: int = CACHE_SIZE):
+        self._cache_path = cache_path
+        self._max_bytes = max_bytes
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        os.makedirs(self._cache_path, exist_ok=True)
+
+    def read(self, file_path: str, variant: str = '') -> Some[Dict[str, pd.DataFrame]]:
+        entry = self._entry_path(file_path, variant)
+        manifest = os.path.join(entry, MANIFEST)
+        if not os.path.isfile(manifest):
+            lg.info(f"Cache miss for {file_path}")
+            return None
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                sheets: dict = json.load(f)
+            dataframes = {sheet: load_frame(os.path.join(entry, file)) for sheet, file in sheets.items()}
+        except (OSError, ValueError) as e:
+            lg.warning(f"Dropping unreadable cache entry {entry}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(manifest)
+        lg.info(f"Cache hit for {file_path}, sheets: {list(dataframes)}")
+        return dataframes
+
+    def write(self, file_path: str, dataframes: Dict[str, pd.DataFrame], variant: str = '') -> None:
+        entry = self._entry_path(file_path, variant)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.makedirs(entry)
+        sheets = {}
+        for i, (sheet, dataframe) in enumerate(dataframes.items()):
+            sheets[sheet] = os.path.basename(dump_frame(dataframe, os.path.join(entry, f"sheet_{i}")))
+        # manifest is written last, an entry without it is never read
+        with open(os.path.join(entry, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(sheets, f, ensure_ascii=False)
+        lg.info(f"Cached {file_path}, sheets: {list(sheets)}")
+        self.evict()
+
+    def invalidate(self, file_path: Some[str] = None) -> None:
+        """
+        Drop every cached variant of file_path, or the whole cache when no file is given
+        """
+        prefix = self.file_hash(file_path) if file_path is not None else ''
+        for entry in self._entries():
+            if os.path.basename(entry).startswith(prefix):
+                shutil.rmtree(entry, ignore_errors=True)
+        lg.info(f"Cache invalidated: {file_path or 'all entries'}")
+
+    def evict(self) -> None:
+        entries = sorted(self._entries(), key=self._last_access)
+        sizes = {entry: self._size(entry) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self._max_bytes:
+                break
+            lg.info(f"Evicting cache entry {entry}")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+
+    def file_hash(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        stamp = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if stamp not in self._hashes:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                    digest.update(block)
+            self._hashes[stamp] = digest.hexdigest()
+        return self._hashes[stamp]
+
+    def _entry_path(self, file_path: str, variant: str) -> str:
+        key = self.file_hash(file_path)
+        if variant:
+            key += '-' + hashlib.sha256(variant.encode()).hexdigest()[:16]
+        return os.path.join(self._cache_path, key)
+
+    def _entries(self) -> List[str]:
+        return [entry.path for entry in os.scandir(self._cache_path) if entry.is_dir()]
+
+    @staticmethod
+    def _last_access(entry: str) -> float:
+        manifest = os.path.join(entry, MANIFEST)
+        return os.path.getmtime(manifest) if os.path.isfile(manifest) else 0.0
+
+    @staticmethod
+    def _size(entry: str) -> int:
+        return sum(file.stat().st_size for file in os.scandir(entry) if file.is_file())
+
+    @property
+    def get_cache_path(self):
+        return self._cache_path
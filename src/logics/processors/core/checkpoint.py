@@ -0,0 +1,78 @@
+import os
+import json
+import shutil
+import pandas as pd
+import logging as lg
+from typing import Any, Dict, Tuple
+
+from logics.entities.program import ProgramPaths
+from logics.functions.frames import dump_frame, load_frame
+from logics.functions.std import Some
+
+STATE = 'state.json'
+STAGE = 'stage_{}'
+
+class Checkpoint:
+    """
+    Frame of one register after each decoder of a graph run, persisted with dump_frame (Arrow IPC when the frame
+    allows it), so that a failed or interrupted run resumes after the last decoder it completed.
+    A checkpoint belongs to the run that took it through a key over the input rows and everything fingerprinted
+    with them (see DecoderGraph.run_key): a run over anything else starts over and replaces it.
+    The last checkpoint of a complete run is kept until clear(), called once the output is written.
+    """
+    def __init__(self, name: str, checkpoint_path: str = ProgramPaths.checkpoint_path):
+        self._path = os.path.join(checkpoint_path, name)
+        self.key = ''
+        self.resumed: Some[Tuple[pd.DataFrame, Dict[str, Any]]] = None
+
+    def start(self, key: str) -> Some[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Bind the checkpoint to a run, returns the frame and run state to resume from when there are any
+        """
+        self.key = key
+        self.resumed = self._load()
+        return self.resumed
+
+    def save(self, df: pd.DataFrame, state: Dict[str, Any]) -> None:
+        if not all(isinstance(column, str) for column in df.columns):
+            lg.debug("Frame has non string columns, not checkpointed")
+            return
+        os.makedirs(self._path, exist_ok=True)
+        frame = os.path.basename(dump_frame(df, os.path.join(self._path, STAGE.format(len(state['done'])))))
+        # the state is replaced atomically, an interrupted save leaves the previous checkpoint in effect
+        temporary = os.path.join(self._path, STATE + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'key': self.key, 'frame': frame, **state}, f, ensure_ascii=False)
+        os.replace(temporary, os.path.join(self._path, STATE))
+        for file in os.listdir(self._path):
+            if file.startswith(STAGE.format('')) and file != frame:
+                try:
+                    os.remove(os.path.join(self._path, file))
+                except OSError:
+                    # still memory mapped by the frame resumed from, removed with the checkpoint
+                    pass
+        lg.debug(f"Checkpoint after {state['done'][-1:]} saved to {frame}")
+
+    def clear(self) -> None:
+        if os.path.isdir(self._path):
+            shutil.rmtree(self._path, ignore_errors=True)
+            lg.info(f"Checkpoint {self._path} cleared")
+
+    def _load(self) -> Some[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        state_path = os.path.join(self._path, STATE)
+        if not os.path.isfile(state_path):
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state['key'] != self.key:
+                lg.info(f"Checkpoint {self._path} belongs to another run, starting over")
+                self.clear()
+                return None
+            df = load_frame(os.path.join(self._path, state['frame']))
+        except (OSError, ValueError, KeyError) as e:
+            lg.warning(f"Dropping unreadable checkpoint {self._path}: {e}")
+            self.clear()
+            return None
+        lg.info(f"Resuming from checkpoint {self._path} after {state['done']}")
+        return df, state
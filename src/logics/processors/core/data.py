@@ -1,8 +1,14 @@
+import importlib.util
+import multiprocessing as mp
+import numpy as np
 import pandas as pd
 import logging as lg
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type
 
 from logics.namespaces.namespace import *
-from logics.interfaces.xl import DataProcessorProtocol
+from logics.namespaces.enums import Sheets, Datasets
+from logics.interfaces.xl import DataProcessorProtocol, Backend
 
 from logics.processors.data.dates import DateDecoder
 from logics.processors.data.debt import DebtDecoder
@@ -11,10 +17,51 @@ from logics.processors.data.passport import PassportDecoder
 from logics.processors.data.register import RegisterDecoder
 from logics.processors.data.phones import PhoneParser, Clients
 from logics.processors.data.dataframe import DataframeDecoder
-from logics.namespaces.enums import Sheets, Datasets
+from logics.processors.core.graph import DecoderGraph
+from logics.processors.polars.graph import PolarsGraph
+from logics.processors.core.store import RowStore, STAMPS
+from logics.processors.core.checkpoint import Checkpoint
+from logics.interfaces.decoders import Decoder
+from logics.functions.profiling import profiled
+from logics.functions.std import Some
+
+PARTITION_SIZE = 50_000
+
+def resolve_backend(backend: Backend) -> Backend:
+    """
+    Requested backend when its package is installed, pandas otherwise
+    """
+    if backend is Backend.POLARS and importlib.util.find_spec('polars') is None:
+        lg.warning(f"Backend [{backend.value}] is not installed, falling back to pandas")
+        return Backend.PANDAS
+    return backend
+
+def pool_context(backend: Backend) -> mp.context.BaseContext:
+    """
+    Start method of process pools: Polars' thread pool does not survive a fork, so with it workers are spawned
+    """
+    return mp.get_context('spawn') if backend is Backend.POLARS else mp.get_context()
+
+def _process_partition(df: pd.DataFrame, hints: Dict[Type[Decoder], Any]) -> Tuple[pd.DataFrame, List[str]]:
+    return DataProcessor(workers=1).graph.run_checked(df, hints)
 
 class DataProcessor(DataProcessorProtocol):
-    def __init__(self):
+    def __init__(self, workers: int | None = None, processes: int = 1, partition_size: int = PARTITION_SIZE,
+                 backend: Backend = Backend.PANDAS, store: Some[RowStore] = None, checkpoint: Some[Checkpoint] = None):
+        """
+        workers bounds the threads running independent decoders at once, 1 runs them one by one.
+        With processes > 1, frames longer than partition_size are split into row partitions decoded in a process pool.
+        The polars backend runs the decoders it has ports for as one lazy Polars query, the rest with pandas;
+        row partitions are always decoded with pandas.
+        With a store, only the rows it has no output for are decoded (see _process_incremental).
+        With a checkpoint, the frame is saved after every decoder and a failed run over the same frame resumes
+        where it stopped; row partitions are not checkpointed.
+        """
+        self.backend = resolve_backend(backend)
+        self.processes = processes
+        self.partition_size = partition_size
+        self.store = store
+        self.checkpoint = checkpoint
         self.decoders = [
             PersonDecoder,
             DateDecoder,
@@ -24,17 +71,130 @@ class DataProcessor(DataProcessorProtocol):
             RegisterDecoder,
             DataframeDecoder
         ]
+        if self.backend is Backend.POLARS:
+            self.graph = PolarsGraph(self.decoders, workers)
+        else:
+            self.graph = DecoderGraph(self.decoders, workers)
 
-    def process_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        for decoder in self.decoders:
-            lg.debug(f"_Call_::{decoder.__name__}")
-            decoded_df = decoder(df).decode()
-            if decoded_df is None:
-                raise ValueError(f"Decoder::{decoder} returned Null")
-            lg.debug(f"_Exit_::{decoder.__name__}")
-            df = decoded_df
-        return df
+    def process_data(self, df: pd.DataFrame | Iterable[Tuple[str, pd.DataFrame]],
+                     hints: Some[Dict[str, Dict[Type[Decoder], Any]]] = None
+                     ) -> pd.DataFrame | Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Run the decoder chain on a dataframe.
+        When given (sheet, chunk) pairs (see FileReader.read_chunks), returns a lazy iterator of (sheet, processed chunk)
+        pairs instead. hints are then required, the frame hints of every sheet over the whole file (see chunk_hints):
+        every chunk decides the way the whole sheet would, and comes out with the same columns.
+        """
+        if not isinstance(df, pd.DataFrame):
+            if hints is None:
+                raise ValueError("Chunks are decoded with the frame hints of the whole file, see chunk_hints")
+            return self._process_chunks(df, hints)
+        if self.store is not None:
+            return self._process_incremental(df)
+        return self._process_frame(df)
+
+    def chunk_hints(self, chunks: Iterable[Tuple[str, pd.DataFrame]]) -> Dict[str, Dict[Type[Decoder], Any]]:
+        """
+        Frame hints of every decoder for every sheet over the whole file, in a first pass over its chunks:
+        each decoder takes its chunk_hints of every chunk and merges them (see Decoder.merge_hints)
+        """
+        hints: Dict[str, Dict[Type[Decoder], List[Any]]] = {}
+        for sheet, chunk in chunks:
+            sheet_hints = hints.setdefault(sheet, {})
+            for decoder in self.decoders:
+                sheet_hints.setdefault(decoder, []).append(decoder.chunk_hints(chunk))
+        return {
+            sheet: {decoder: decoder.merge_hints(chunk_hints) for decoder, chunk_hints in sheet_hints.items()}
+            for sheet, sheet_hints in hints.items()
+        }
+
+    def _process_frame(self, df: pd.DataFrame, hints: Some[Dict[Type[Decoder], Any]] = None) -> pd.DataFrame:
+        if self.processes > 1 and len(df) > self.partition_size:
+            return self._process_partitions(df, hints)
+        return self.graph.run(df, hints, checkpoint=self.checkpoint)
+
+    @profiled
+    def _process_partitions(self, df: pd.DataFrame, hints: Some[Dict[Type[Decoder], Any]] = None) -> pd.DataFrame:
+        """
+        Row partitions decoded in worker processes with the frame-level hints of the whole frame, concatenated in order.
+        A decoder giving up on any partition would have given up on the whole frame, so the frame is then decoded serially,
+        as it is when the decoders cannot be partitioned.
+        """
+        if not self.graph.partitionable(df):
+            lg.info("Register cannot be partitioned, decoding serially")
+            return self.graph.run(df, hints)
+        hints = {**self.graph.hints(df), **(hints or {})}
+        partitions = [df.iloc[start:start + self.partition_size] for start in range(0, len(df), self.partition_size)]
+        lg.info(f"Decoding {len(df)} rows in {len(partitions)} partitions")
+        results: List[pd.DataFrame | None] = [None] * len(partitions)
+        with ProcessPoolExecutor(max_workers=min(self.processes, len(partitions)),
+                                 mp_context=pool_context(self.backend)) as pool:
+            futures = {pool.submit(_process_partition, partition, hints): i for i, partition in enumerate(partitions)}
+            for future in as_completed(futures):
+                result, failed = future.result()
+                if failed or (results[0] is not None and list(result.columns) != list(results[0].columns)):
+                    for pending in futures:
+                        pending.cancel()
+                    lg.warning(f"Partitions diverged (failed: {failed}), decoding the register serially")
+                    return self.graph.run(df, hints)
+                results[futures[future]] = result
+        columns = list(results[0].columns)
+        if any(list(result.columns) != columns for result in results):
+            lg.warning("Partitions diverged, decoding the register serially")
+            return self.graph.run(df, hints)
+        return pd.concat(results)
+
+    @profiled
+    def _process_incremental(self, df: pd.DataFrame, hints: Some[Dict[Type[Decoder], Any]] = None) -> pd.DataFrame:
+        """
+        Rows found in the store are taken from it, the other ones are decoded with the frame-level hints
+        of the whole frame, the way row partitions are, and spliced back in input order.
+        When any row was decoded, the result then replaces the store entry. Frames that cannot be partitioned,
+        and runs where a decoder gave up, bypass the store.
+        """
+        if not self.graph.partitionable(df):
+            lg.info("Register cannot be partitioned, decoding without the row store")
+            return self._process_frame(df, hints)
+        hints = {**self.graph.hints(df), **(hints or {})}
+        key = self.store.fingerprint(df, self.graph.classes(), hints)
+        hashes = self.store.row_hashes(df)
+        cached, found = self.store.lookup(key, hashes)
+        missing = np.setdiff1d(np.arange(len(df)), found, assume_unique=True)
+        lg.info(f"Row store: {len(found)} of {len(df)} rows reused, decoding {len(missing)}")
+        if not len(found):
+            result, failed = self.graph.run_checked(df, hints, self.checkpoint)
+        else:
+            cached = cached.set_axis(df.index[found])
+            for column, attribute in STAMPS.items():
+                if column in cached.columns:
+                    cached[column] = getattr(Namespace, attribute)
+            if not len(missing):
+                result, failed = cached, []
+            else:
+                decoded, failed = self.graph.run_checked(df.iloc[missing], hints, self.checkpoint)
+                if failed or len(decoded) != len(missing) or list(decoded.columns) != list(cached.columns):
+                    lg.warning(f"Decoded rows do not match the stored ones (failed: {failed}), decoding the register")
+                    return self._process_frame(df, hints)
+                order = np.argsort(np.concatenate([found, missing]), kind='stable')
+                result = pd.concat([cached, decoded]).iloc[order]
+        if len(missing) and not failed:
+            self.store.write(key, result.set_axis(hashes))
+        return result
+
+    def _process_chunks(self, chunks: Iterable[Tuple[str, pd.DataFrame]],
+                        hints: Dict[str, Dict[Type[Decoder], Any]]) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for i, (sheet, chunk) in enumerate(chunks):
+            lg.debug(f"_Call_::chunk::{i}::{sheet}")
+            if sheet not in hints:
+                raise ValueError(f"No frame hints for sheet {sheet}, see chunk_hints")
+            if not self.graph.partitionable(chunk):
+                raise ValueError(f"Sheet {sheet} cannot be decoded in chunks, its columns depend on the whole sheet")
+            if self.store is not None:
+                yield sheet, self._process_incremental(chunk, hints.get(sheet))
+            else:
+                yield sheet, self._process_frame(chunk, hints.get(sheet))
 
+    @profiled
     def process_post(self, contracts: pd.DataFrame, addresses: pd.DataFrame, phones: pd.DataFrame) -> pd.DataFrame:
         """
         POST BANK specific method
@@ -0,0 +1,144 @@
+import sqlite3
+import datetime
+import dataclasses
+import pandas as pd
+import logging as lg
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from logics.namespaces.namespace import Namespace
+from logics.namespaces.enums import Debt, Register
+from logics.namespaces.schema import DEFAULT_SCHEMA
+
+TABLE = 'registers'
+BATCH_SIZE = 10_000
+KEY = (Debt.NUM.value, Register.EXTENSION.value)
+SQL_TYPES = {str: 'TEXT', int: 'INTEGER', float: 'REAL', datetime.date: 'TEXT'}
+DATE_TYPES = ('date', 'datetime', 'datetime64', 'mixed')
+
+def namespace_columns() -> Dict[str, str]:
+    """
+    SQL column types of the register table: Namespace fields by annotation, money columns as REAL.
+    Fields that are not scalar (the dataframe, phone lists) are not stored.
+    """
+    columns = {
+        field.name: SQL_TYPES[field.type]
+        for field in dataclasses.fields(Namespace) if field.type in SQL_TYPES
+    }
+    columns.update({column: 'REAL' for column in DEFAULT_SCHEMA.money})
+    columns.update({column: 'TEXT' for column in KEY})
+    return columns
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+class DatabaseSink:
+    """
+    Bulk loader of processed registers into a DB-API database, SQLite by default.
+    Rows are upserted by (credit_num, extend) with batched executemany, one transaction per load.
+    Rows missing either key, or with a blank one, cannot be matched to a stored row, they are plainly inserted.
+    Other targets plug in through connect, the SQL itself sticks to what SQLite and PostgreSQL share.
+    """
+    def __init__(self, connect: Callable[[], Any], table: str = TABLE, batch_size: int = BATCH_SIZE,
+                 placeholder: str = '?'):
+        self._connect = connect
+        self._table = table
+        self._batch_size = batch_size
+        self._placeholder = placeholder
+
+    @classmethod
+    def sqlite(cls, database: str, table: str = TABLE, batch_size: int = BATCH_SIZE) -> 'DatabaseSink':
+        return cls(lambda: sqlite3.connect(database), table, batch_size)
+
+    def load(self, chunks: Iterable[pd.DataFrame]) -> int:
+        """
+        Upsert every chunk, returns the number of rows stored (inserted or updated)
+        """
+        rows = 0
+        connection = self._connect()
+        try:
+            cursor = connection.cursor()
+            known: Set[str] = set()
+            statements: Tuple[str, str] = ('', '')
+            columns: List[str] = []
+            for chunk in chunks:
+                if list(chunk.columns) != columns:
+                    columns = list(chunk.columns)
+                    self._ensure_table(cursor, columns, known)
+                    statements = (self._upsert(columns), self._insert(columns))
+                keyed, keyless = self.keyed(chunk)
+                if len(keyless):
+                    lg.warning(f"{len(keyless)} rows without {' / '.join(KEY)} are inserted without upsert")
+                for statement, part in zip(statements, (keyed, keyless)):
+                    for batch in self._batches(part):
+                        cursor.executemany(statement, batch)
+                        rows += cursor.rowcount if cursor.rowcount >= 0 else len(batch)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        lg.info(f"Loaded {rows} rows into {self._table}")
+        return rows
+
+    def _ensure_table(self, cursor: Any, columns: List[str], known: Set[str]) -> None:
+        """
+        Create the table from the Namespace schema on first use, columns the frame adds on top are appended as TEXT
+        """
+        declared = namespace_columns()
+        if not known:
+            definitions = ', '.join(f'{quote(column)} {kind}' for column, kind in declared.items())
+            key = ', '.join(quote(column) for column in KEY)
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {quote(self._table)} ({definitions}, UNIQUE ({key}))')
+            cursor.execute(f'SELECT * FROM {quote(self._table)} LIMIT 0')
+            known.update(description[0] for description in cursor.description)
+        for column in columns:
+            if column not in known:
+                cursor.execute(f'ALTER TABLE {quote(self._table)} ADD COLUMN {quote(column)} {declared.get(column, "TEXT")}')
+                known.add(column)
+
+    def _insert(self, columns: List[str]) -> str:
+        names = ', '.join(quote(column) for column in columns)
+        values = ', '.join(self._placeholder for _ in columns)
+        return f'INSERT INTO {quote(self._table)} ({names}) VALUES ({values})'
+
+    def _upsert(self, columns: List[str]) -> str:
+        key = ', '.join(quote(column) for column in KEY)
+        updates = ', '.join(f'{quote(column)} = excluded.{quote(column)}' for column in columns if column not in KEY)
+        action = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+        return f'{self._insert(columns)} ON CONFLICT ({key}) {action}'
+
+    def _batches(self, df: pd.DataFrame) -> Iterator[List[Tuple]]:
+        for start in range(0, len(df), self._batch_size):
+            yield list(self.to_params(df.iloc[start:start + self._batch_size]))
+
+    @staticmethod
+    def to_params(df: pd.DataFrame) -> Iterator[Tuple]:
+        '''Rows of DB-API parameters: missing values as NULL, dates as ISO strings'''
+        dates = [
+            column for column in df.columns
+            if pd.api.types.infer_dtype(df[column], skipna=True) in DATE_TYPES
+        ]
+        df = df.astype(object).where(df.notna(), None)
+        for column in dates:
+            df[column] = df[column].map(lambda value: value.isoformat() if isinstance(value, datetime.date) else value)
+        return df.itertuples(index=False, name=None)
+
+    @staticmethod
+    def keyed(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Rows with both key columns set, the last of each key only as the upsert would leave it,
+        and the rows without, which no key is made up for.
+        Blank keys are missing too, DataframeDecoder has already turned missing values into '': the keyless rows
+        get NULL there, which the UNIQUE key never compares equal, so they neither collide nor collapse.
+        """
+        if not all(column in df.columns for column in KEY):
+            return df.iloc[:0], df
+        keys = df[list(KEY)]
+        blank = keys.isna() | keys.apply(lambda key: key.astype(str).str.strip() == '')
+        complete = ~blank.any(axis=1)
+        keyed = df[complete]
+        keyless = df[~complete]
+        for column in KEY:
+            keyless[column] = keyless[column].astype(object).mask(blank.loc[~complete, column])
+        return keyed[~keyed.duplicated(subset=list(KEY), keep='last')], keyless
@@ -0,0 +1,182 @@
+import hashlib
+import pandas as pd
+import logging as lg
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict, List, Tuple, Type
+
+from logics.interfaces.decoders import Decoder, ALL_COLUMNS
+from logics.functions.profiling import profiled
+from logics.functions.std import Some
+from logics.processors.core.checkpoint import Checkpoint
+from logics.processors.core.store import fingerprint
+
+class DecoderGraph:
+    """
+    Dependency graph of a decoder chain built from the reads / writes declarations.
+    A decoder depends on every earlier one it shares a written column with (read after write,
+    write after read, write after write), so the list order is kept wherever it matters.
+    Decoders of the same level are independent: each one runs on a copy of its own columns,
+    concurrently, and the results are merged back in list order.
+    """
+    def __init__(self, decoders: List[Type[Decoder]], workers: int | None = None):
+        self.decoders = decoders
+        self.workers = workers
+        self.levels = self._levels()
+
+    @staticmethod
+    def full_frame(decoder: Type[Decoder]) -> bool:
+        return bool(ALL_COLUMNS & (decoder.reads | decoder.writes))
+
+    @staticmethod
+    def conflicts(first: Type[Decoder], second: Type[Decoder]) -> bool:
+        if DecoderGraph.full_frame(first) or DecoderGraph.full_frame(second):
+            return True
+        return bool(first.writes & second.reads or first.reads & second.writes or first.writes & second.writes)
+
+    @staticmethod
+    def skipped(decoder: Type[Decoder], df: pd.DataFrame) -> bool:
+        return decoder.skippable and not any(column in decoder.reads for column in df.columns)
+
+    def _levels(self) -> List[List[Type[Decoder]]]:
+        depth: List[int] = []
+        for j, decoder in enumerate(self.decoders):
+            depth.append(max((depth[i] + 1 for i in range(j) if self.conflicts(self.decoders[i], decoder)), default=0))
+        levels: List[List[Type[Decoder]]] = [[] for _ in range(max(depth, default=-1) + 1)]
+        for decoder, level in zip(self.decoders, depth):
+            levels[level].append(decoder)
+        return levels
+
+    def hints(self, df: pd.DataFrame) -> Dict[Type[Decoder], Any]:
+        """
+        Frame-level decisions of every decoder, taken on the input frame
+        """
+        return {decoder: decoder.frame_hints(df) for decoder in self.decoders}
+
+    def partitionable(self, df: pd.DataFrame) -> bool:
+        return all(decoder.partitionable(df) for decoder in self.decoders)
+
+    def classes(self) -> List[type]:
+        '''Classes whose code the decoded frame depends on'''
+        return [*self.decoders, type(self)]
+
+    def run_key(self, df: pd.DataFrame, hints: Dict[Type[Decoder], Any]) -> str:
+        '''Key of a run over the frame: its rows and index, the code and Namespace defaults decoding them'''
+        rows = hashlib.sha256(pd.util.hash_pandas_object(df).to_numpy().tobytes()).hexdigest()
+        return fingerprint(df, self.classes(), hints, rows)
+
+    def run(self, df: pd.DataFrame, hints: Dict[Type[Decoder], Any] | None = None,
+            checkpoint: Some[Checkpoint] = None) -> pd.DataFrame:
+        """
+        Same result as calling the decoders one after another, column order included
+        """
+        return self.run_checked(df, hints, checkpoint)[0]
+
+    @profiled
+    def run_checked(self, df: pd.DataFrame, hints: Dict[Type[Decoder], Any] | None = None,
+                    checkpoint: Some[Checkpoint] = None) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        run, also returning the names of the decoders that gave up half way.
+        With a checkpoint, the frame is saved after every decoder and a run over the same frame resumes from it.
+        """
+        if checkpoint is not None:
+            checkpoint.start(self.run_key(df, hints or {}))
+        return self._run(df, hints or {}, checkpoint)
+
+    def _run(self, df: pd.DataFrame, hints: Dict[Type[Decoder], Any],
+             checkpoint: Some[Checkpoint] = None) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Relies on Copy-on-Write (enabled by the logics package): a decoder's column subset shares memory with the frame until it writes to it,
+        so only the columns a decoder actually changes are copied
+        """
+        failed: List[str] = []
+        order = list(df.columns)
+        changes: Dict[Type[Decoder], Tuple[List[str], List[str]]] = {}
+        done: List[Type[Decoder]] = []
+        if checkpoint is not None and checkpoint.resumed is not None:
+            df, state = checkpoint.resumed
+            decoders = {decoder.__name__: decoder for decoder in self.decoders}
+            done = [decoders[name] for name in state['done']]
+            failed, order = state['failed'], state['order']
+            changes = {decoders[name]: (dropped, added) for name, (dropped, added) in state['changes'].items()}
+        for level in self.levels:
+            active = []
+            for decoder in level:
+                if decoder in done:
+                    continue
+                if self.skipped(decoder, df):
+                    lg.info(f"Skipping {decoder.__name__}, none of its columns are present")
+                else:
+                    active.append(decoder)
+            if any(self.full_frame(decoder) for decoder in active):
+                order = self._order(order, changes)
+                changes.clear()
+                df = df[order] if list(df.columns) != order else df
+            if len(active) > 1 and self.workers != 1:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    # each thread runs in a copy of the caller's context, so the active Profiler follows it
+                    futures = [pool.submit(copy_context().run, self._decode, decoder, df, hints.get(decoder)) for decoder in active]
+                # taken in list order: a decoder that raised leaves the ones before it merged and checkpointed
+                results = (future.result() for future in futures)
+            else:
+                # decoded lazily, one by one: each is merged, and checkpointed, before the next one starts.
+                # decoders of a level do not share columns, so they still see the frame as it was for theirs
+                results = (self._decode(decoder, df, hints.get(decoder)) for decoder in active)
+            for decoder, (columns, result, gave_up) in zip(active, results):
+                df, changes[decoder] = self._merge(df, columns, result, self.full_frame(decoder))
+                if gave_up:
+                    failed.append(decoder.__name__)
+                done.append(decoder)
+                if checkpoint is not None:
+                    checkpoint.save(df, {
+                        'done': [decoder.__name__ for decoder in done], 'failed': failed, 'order': order,
+                        'changes': {decoder.__name__: change for decoder, change in changes.items()},
+                    })
+        order = self._order(order, changes)
+        return (df[order] if list(df.columns) != order else df), failed
+
+    def _decode(self, decoder: Type[Decoder], df: pd.DataFrame, hints: Any = None) -> Tuple[List[str], pd.DataFrame, bool]:
+        lg.debug(f"_Call_::{decoder.__name__}")
+        if self.full_frame(decoder):
+            columns, frame = list(df.columns), df
+        else:
+            columns = [column for column in df.columns if column in decoder.reads or column in decoder.writes]
+            frame = df[columns]
+        instance = decoder(frame) if hints is None else decoder(frame, hints)
+        decoded_df = instance.decode()
+        if decoded_df is None:
+            raise ValueError(f"Decoder::{decoder} returned Null")
+        lg.debug(f"_Exit_::{decoder.__name__}")
+        return columns, decoded_df, instance.failed
+
+    @staticmethod
+    @profiled
+    def _merge(df: pd.DataFrame, columns: List[str], result: pd.DataFrame,
+               full: bool) -> Tuple[pd.DataFrame, Tuple[List[str], List[str]]]:
+        """
+        Apply a decoder result to the frame, returns the frame and the (dropped, added) columns
+        """
+        dropped = [column for column in columns if column not in result.columns]
+        added = [column for column in result.columns if column not in columns]
+        if full:
+            return result, (dropped, added)
+        if dropped:
+            df = df.drop(columns=dropped)
+        for column in result.columns:
+            if column not in added:
+                df[column] = result[column]
+        if added:
+            df = pd.concat([df, result[added]], axis=1)
+        return df, (dropped, added)
+
+    def _order(self, order: List[str], changes: Dict[Type[Decoder], Tuple[List[str], List[str]]]) -> List[str]:
+        """
+        Column order of a serial run: in list order, each decoder drops its columns and appends the new ones
+        """
+        for decoder in self.decoders:
+            if decoder not in changes:
+                continue
+            dropped, added = changes[decoder]
+            order = [column for column in order if column not in dropped]
+            order += [column for column in added if column not in order]
+        return order
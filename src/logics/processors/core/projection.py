@@ -0,0 +1,37 @@
+import logging as lg
+from typing import FrozenSet, Hashable, Iterable, Set
+
+from logics.functions.std import Some
+from logics.namespaces.enums import Person, NameVariants, Residence, Passport, PassportVariants, Debt, Register, Phones, PhoneEnum
+
+PROJECTED_ENUMS = (Person, NameVariants, Residence, Passport, PassportVariants, Debt, Register, Phones, PhoneEnum)
+
+def decoder_columns() -> FrozenSet[str]:
+    """
+    Every column name the decoder pipeline knows about
+    """
+    return frozenset(member.value for enum in PROJECTED_ENUMS for member in enum)
+
+class ColumnProjection:
+    """
+    Column filter for the readers, usable directly as `usecols`.
+    Keeps the decoder columns and any explicitly passed-through ones, every other column is skipped.
+    """
+    def __init__(self, passthrough: Iterable[str] = (), columns: Some[Iterable[str]] = None):
+        self.columns: FrozenSet[str] = frozenset(columns) if columns is not None else decoder_columns()
+        self.passthrough: FrozenSet[str] = frozenset(passthrough)
+        self.skipped: Set[Hashable] = set()
+
+    def __call__(self, column: Hashable) -> bool:
+        if column in self.columns or column in self.passthrough:
+            return True
+        self.skipped.add(column)
+        return False
+
+    def report(self) -> None:
+        if self.skipped:
+            lg.info(f"Projection skipped {len(self.skipped)} unknown columns: {sorted(map(str, self.skipped))}")
+
+    @property
+    def fingerprint(self) -> str:
+        return '|'.join(sorted(self.columns | self.passthrough))
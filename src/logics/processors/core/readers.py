@@ -1,59 +1,204 @@
 import pandas as pd
+import openpyxl
+from pandas.io.parsers import TextParser
 import os
-import json
+import importlib.util
 import logging as lg
+from typing import Iterator, Tuple, List, Any
 
-from logics.interfaces.xl import FileReaderProtocol
+from logics.interfaces.xl import FileReaderProtocol, ExcelEngine
 from logics.interfaces.paths import Path, Extension
-from logics.namespaces.enums import Sheets
+from logics.namespaces.enums import Sheets, Clients
+from logics.namespaces.schema import SCHEMAS
+from logics.processors.core.cache import SheetCache
+from logics.processors.core.projection import ColumnProjection
+from logics.functions.std import Some
+from logics.functions.profiling import profiled
 
 XLSX_EXTENSION = Extension.XLSX.value
 CSV_EXTENSION = Extension.CSV.value
 JSON_EXTENSION = Extension.JSON.value
+NDJSON_EXTENSION = Extension.NDJSON.value
+
+CHUNK_SIZE = 50_000
+
+ENGINE_MODULES = {
+    ExcelEngine.OPENPYXL: 'openpyxl',
+    ExcelEngine.CALAMINE: 'python_calamine',
+}
+
+def resolve_engine(engine: ExcelEngine) -> ExcelEngine:
+    """
+    Requested engine when its package is installed, openpyxl otherwise
+    """
+    if importlib.util.find_spec(ENGINE_MODULES[engine]) is None:
+        lg.warning(f"Excel engine [{engine.value}] is not installed, falling back to openpyxl")
+        return ExcelEngine.OPENPYXL
+    return engine
 
 class FileReader(FileReaderProtocol):
-    def __init__(self, path: Path.PATH, file: Path.FILE, ext: Path.EXTENSION):
+    def __init__(self, path: Path.PATH, file: Path.FILE, ext: Path.EXTENSION, cache: Some[SheetCache] = None,
+                 projection: Some[ColumnProjection] = None, client: Some[Clients] = None,
+                 engine: ExcelEngine = ExcelEngine.OPENPYXL):
         self.path = path
         self.file = file
         self.ext = ext
+        self.cache = cache
+        self.projection = projection
+        self.schema = SCHEMAS[client] if client is not None else None
+        self.client = client
+        self.engine = resolve_engine(engine)
 
     def _get_file_path(self) -> str:
         return os.path.join(self.path, f"{self.file}{self.ext}")
 
     def _read_excel_file(self, file_path: str) -> dict:
+        if self.cache is not None:
+            cached = self.cache.read(file_path, self._variant())
+            if cached is not None:
+                return cached
+        dataframes = self._parse_excel_file(file_path)
+        if self.cache is not None and dataframes:
+            self.cache.write(file_path, dataframes, self._variant())
+        return dataframes
+
+    def _variant(self) -> str:
+        projection = self.projection.fingerprint if self.projection is not None else ''
+        client = self.client.value if self.client is not None else ''
+        engine = self.engine.value if self.engine is not ExcelEngine.OPENPYXL else ''
+        return f"{projection}#{client}#{engine}" if projection or client or engine else ''
+
+    def _dtypes(self) -> Some[dict]:
+        return self.schema.read_dtypes() if self.schema is not None else None
+
+    def _coerce(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.schema.coerce(df) if self.schema is not None else df
+
+    def _parse_excel_file(self, file_path: str) -> dict:
         try:
-            excel = pd.ExcelFile(file_path, engine='openpyxl')
-            sheets = excel.sheet_names
-            lg.info(f"Reading excel, found sheets: {sheets}")
-
-            dataframes = {}
-
-            for sheet in Sheets:
-                if sheet.value in sheets:
-                    dataframes[sheet.name] = pd.read_excel(file_path, sheet_name=sheet.value)
-            if not dataframes:
-                dataframes['default'] = pd.read_excel(file_path, sheet_name=sheets[0])
-            return dataframes
+            with pd.ExcelFile(file_path, engine=self.engine.value) as excel:
+                sheets = excel.sheet_names
+                lg.info(f"Reading excel with [{self.engine.value}], found sheets: {sheets}")
+
+                selected = {sheet.value: sheet.name for sheet in Sheets if sheet.value in sheets}
+                if not selected:
+                    selected = {sheets[0]: 'default'}
+                # one parse of the workbook, every selected sheet is materialised from it
+                parsed = excel.parse(sheet_name=list(selected), usecols=self.projection, dtype=self._dtypes())
+            if self.projection is not None:
+                self.projection.report()
+            return {selected[sheet]: self._coerce(dataframe) for sheet, dataframe in parsed.items()}
         except pd.errors.EmptyDataError as e:
             lg.error(f"Error reading Excel file: {e}")
         except pd.errors.ParserError as e:
             lg.error(f"Error reading Excel file: {e}")
 
+    def _iter_excel_chunks(self, file_path: str, chunk_size: int) -> Iterator[Tuple[str, pd.DataFrame]]:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheets = workbook.sheetnames
+            lg.info(f"Streaming excel, found sheets: {sheets}")
+            selected = [(sheet.name, sheet.value) for sheet in Sheets if sheet.value in sheets]
+            if not selected:
+                selected = [('default', sheets[0])]
+            for key, sheet_name in selected:
+                for chunk in self._iter_sheet_chunks(workbook[sheet_name], chunk_size):
+                    yield key, chunk
+        finally:
+            workbook.close()
+
+    def _iter_sheet_chunks(self, worksheet, chunk_size: int) -> Iterator[pd.DataFrame]:
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        width = len(header)
+        keep = [i for i, name in enumerate(header) if self.projection is None or (name is not None and self.projection(name))]
+        header = tuple(header[i] for i in keep)
+        buffer: List[list] = []
+        offset = 0
+        for row in rows:
+            row = row + (None,) * (width - len(row))
+            row = [row[i] for i in keep]
+            if all(value is None for value in row):
+                continue
+            buffer.append([self.convert_cell(value) for value in row])
+            if len(buffer) == chunk_size:
+                yield self._parse_chunk(header, buffer, offset)
+                offset += len(buffer)
+                buffer = []
+        if buffer or offset == 0:
+            yield self._parse_chunk(header, buffer, offset)
+
+    def _parse_chunk(self, header: tuple, rows: List[list], offset: int) -> pd.DataFrame:
+        """
+        Rows go through the same TextParser as pd.read_excel, so NA values, dtypes and column names match a full read
+        """
+        header = [self.convert_cell(value) for value in header]
+        chunk = TextParser([header] + rows, header=0, dtype=self._dtypes()).read()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        return self._coerce(chunk)
+
     def _read_csv_file(self, file_path: str) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return self._coerce(pd.read_csv(file_path, usecols=self.projection, dtype=self._dtypes()))
         except pd.errors.EmptyDataError as e:
             lg.error(f"Error reading CSV file: {e}")
         except pd.errors.ParserError as e:
             lg.error(f"Error reading CSV file: {e}")
 
-    def _read_json_file(self, file_path: str) -> dict:
+    def _read_json_file(self, file_path: str, lines: bool = False) -> pd.DataFrame:
+        """
+        JSON array of records, or newline-delimited records when lines is set, straight into a DataFrame
+        """
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
+            return self._typed(pd.read_json(file_path, orient='records', lines=lines, dtype=False, convert_dates=False))
+        except ValueError as e:
             lg.error(f"Error reading JSON file: {e}")
 
+    def _typed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Projection and schema for readers without usecols / dtype support
+        """
+        if self.projection is not None:
+            df = df[[column for column in df.columns if self.projection(column)]]
+        dtypes = {column: dtype for column, dtype in (self._dtypes() or {}).items() if column in df.columns}
+        return self._coerce(df.astype(dtypes) if dtypes else df)
+
+    def read_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Stream the file as (sheet, DataFrame) chunks of at most chunk_size rows.
+        Excel sheets are walked with openpyxl in read-only mode, so memory depends on chunk_size instead of file size.
+        """
+        file_path = self._get_file_path()
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"File {self.file}{self.ext} not found in {self.path}")
+        match self.ext:
+            case Extension.XLSX.value:
+                yield from self._iter_excel_chunks(file_path, chunk_size)
+            case Extension.CSV.value:
+                for chunk in pd.read_csv(file_path, chunksize=chunk_size, usecols=self.projection, dtype=self._dtypes()):
+                    yield 'default', self._coerce(chunk)
+            case Extension.NDJSON.value:
+                with pd.read_json(file_path, orient='records', lines=True, chunksize=chunk_size,
+                                  dtype=False, convert_dates=False) as reader:
+                    for chunk in reader:
+                        yield 'default', self._typed(chunk)
+            case _:
+                raise NotImplementedError(f"Streaming of {self.ext} files is not supported")
+
+    @staticmethod
+    def convert_cell(value: Any) -> Any:
+        """
+        Cell conversion of the pandas openpyxl reader: empty cells to '', integral floats to int
+        """
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    @profiled
     def read_file(self) -> pd.DataFrame | dict:
         file_path = self._get_file_path()
         if os.path.isfile(file_path):
@@ -64,6 +209,8 @@ class FileReader(FileReaderProtocol):
                     return self._read_csv_file(file_path)
                 case Extension.JSON.value:
                     return self._read_json_file(file_path)
+                case Extension.NDJSON.value:
+                    return self._read_json_file(file_path, lines=True)
                 case _:
                     raise NotImplementedError(f"File extension {self.ext} not supported")
         else:
@@ -0,0 +1,202 @@
+import os
+import ast
+import json
+import shutil
+import tempfile
+import hashlib
+import dataclasses
+import importlib.util
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import logging as lg
+from typing import Any, Dict, FrozenSet, List, Tuple, Type
+
+from logics.entities.program import ProgramPaths
+from logics.interfaces.decoders import Decoder
+from logics.namespaces.namespace import Namespace
+from logics.namespaces.enums import Register
+from logics.functions.frames import dump_frame, load_frame
+from logics.functions.std import Some
+
+PACKAGE = 'logics'
+# modules the decoded frame depends on that no decoder imports: the readers coerce the input with the schema
+READ_MODULES = frozenset(['logics.namespaces.schema'])
+STORE_SIZE = 2 * 1024 ** 3
+MANIFEST = 'manifest.json'
+ROWS = 'rows'
+# columns RegisterDecoder stamps on every row from Namespace, they describe the run rather than the row
+STAMPS = {
+    Register.NAME.value: 'reg_name',
+    Register.DATE.value: 'reg_date',
+}
+
+def source_hash(classes: List[type]) -> str:
+    """
+    SHA-256 of the source files of the modules the classes (decoders, graph) are defined in
+    and of every logics module they import, transitively: helpers, normaliser, schema, lookup tables
+    """
+    digest = hashlib.sha256()
+    for module in package_modules(READ_MODULES | frozenset(cls.__module__ for cls in classes)):
+        digest.update(module.encode())
+        with open(_origin(module), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+@lru_cache(maxsize=None)
+def package_modules(roots: FrozenSet[str]) -> List[str]:
+    '''The logics modules among roots and everything they import from logics, transitively, sorted'''
+    seen, pending = set(), list(roots)
+    while pending:
+        module = pending.pop()
+        if module in seen or module.split('.')[0] != PACKAGE or _origin(module) is None:
+            continue
+        seen.add(module)
+        pending.extend(_imports(module))
+    return sorted(seen)
+
+def _origin(module: str) -> Some[str]:
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    return spec.origin if spec is not None and spec.has_location else None
+
+def _imports(module: str) -> List[str]:
+    '''Modules imported by the source of module, names imported from a package are tried as submodules too'''
+    origin = _origin(module)
+    with open(origin, 'rb') as f:
+        tree = ast.parse(f.read(), origin)
+    package = module if os.path.basename(origin) == '__init__.py' else module.rpartition('.')[0]
+    imported = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package) if node.level else node.module
+            imported.append(base)
+            imported.extend(f'{base}.{alias.name}' for alias in node.names if alias.name != '*')
+    return imported
+
+def namespace_defaults() -> Dict[str, Any]:
+    return {
+        field.name: getattr(Namespace, field.name) for field in dataclasses.fields(Namespace)
+        if hasattr(Namespace, field.name) and field.name not in STAMPS.values()
+    }
+
+def fingerprint(df: pd.DataFrame, classes: List[type], hints: Dict[Type[Decoder], Any], salt: str = '') -> str:
+    """
+    What the decoded frame depends on besides its rows: decoder code and data files, Namespace defaults,
+    input columns with their dtypes and frame hints
+    """
+    parts = {
+        'salt': salt,
+        'code': source_hash(classes),
+        'data': {cls.__name__: cls.data_version() for cls in classes if hasattr(cls, 'data_version')},
+        'namespace': namespace_defaults(),
+        'columns': [[str(column), str(dtype)] for column, dtype in df.dtypes.items()],
+        'hints': {decoder.__name__: hint for decoder, hint in hints.items()},
+    }
+    text = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=_jsonable)
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+class RowStore:
+    """
+    Decoded rows of previous registers, keyed by a hash of the input row.
+    An entry holds the output of the last frame processed under one fingerprint: the source of the decoder
+    and graph modules, the Namespace defaults, the input columns with their dtypes and the frame hints of the input.
+    A change to any of them lands in a new entry, so stale outputs are never reused; version is mixed
+    into the fingerprint to invalidate every entry by hand. The store is size bounded and evicts the least
+    recently used entries first.
+    """
+    def __init__(self, store_path: str = ProgramPaths.store_path, max_bytes: int = STORE_SIZE, version: str = ''):
+        self._store_path = store_path
+        self._max_bytes = max_bytes
+        self._version = version
+        os.makedirs(self._store_path, exist_ok=True)
+
+    @staticmethod
+    def row_hashes(df: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    def fingerprint(self, df: pd.DataFrame, classes: List[type], hints: Dict[Type[Decoder], Any]) -> str:
+        return fingerprint(df, classes, hints, self._version)
+
+    def read(self, key: str) -> Some[pd.DataFrame]:
+        entry = os.path.join(self._store_path, key)
+        manifest = os.path.join(entry, MANIFEST)
+        if not os.path.isfile(manifest):
+            lg.info(f"Row store miss for {key}")
+            return None
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                rows = load_frame(os.path.join(entry, json.load(f)[ROWS]))
+        except (OSError, ValueError, KeyError) as e:
+            lg.warning(f"Dropping unreadable row store entry {entry}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(manifest)
+        return rows
+
+    def write(self, key: str, rows: pd.DataFrame) -> None:
+        '''rows: decoded frame indexed by the row hashes of its input'''
+        entry = os.path.join(self._store_path, key)
+        # written aside and renamed into place, batch workers may store the same entry at once
+        staging = tempfile.mkdtemp(prefix=f".{key}-", dir=self._store_path)
+        rows = rows[~rows.index.duplicated()]
+        file = os.path.basename(dump_frame(rows, os.path.join(staging, ROWS)))
+        with open(os.path.join(staging, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump({ROWS: file}, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            lg.info(f"Row store entry {key} was written concurrently, keeping it")
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        lg.info(f"Stored {len(rows)} decoded rows under {key}")
+        self.evict()
+
+    def lookup(self, key: str, hashes: np.ndarray) -> Tuple[Some[pd.DataFrame], np.ndarray]:
+        """
+        Stored rows of the given hashes in their order, and the positions they were found at
+        """
+        stored = self.read(key)
+        if stored is None:
+            return None, np.empty(0, dtype=np.intp)
+        positions = stored.index.get_indexer(hashes)
+        found = np.flatnonzero(positions >= 0)
+        return stored.iloc[positions[found]], found
+
+    def invalidate(self) -> None:
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+        lg.info("Row store invalidated")
+
+    def evict(self) -> None:
+        entries = sorted(self._entries(), key=self._last_access)
+        sizes = {entry: self._size(entry) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self._max_bytes:
+                break
+            lg.info(f"Evicting row store entry {entry}")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+
+    def _entries(self) -> List[str]:
+        return [entry.path for entry in os.scandir(self._store_path) if entry.is_dir() and not entry.name.startswith('.')]
+
+    @staticmethod
+    def _last_access(entry: str) -> float:
+        manifest = os.path.join(entry, MANIFEST)
+        return os.path.getmtime(manifest) if os.path.isfile(manifest) else 0.0
+
+    @staticmethod
+    def _size(entry: str) -> int:
+        return sum(file.stat().st_size for file in os.scandir(entry) if file.is_file())
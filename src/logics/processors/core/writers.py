@@ -1,26 +1,284 @@
 import pandas as pd
+import openpyxl
 import os
+import time
+import queue
+import threading
+import logging as lg
+from typing import Callable, Dict, Iterable, Iterator, List
 
 from logics.interfaces.xl import DataWriterProtocol
-from logics.interfaces.paths import Extension 
-from logics.entities.program import ProgramPaths
+from logics.interfaces.paths import Extension
+from logics.namespaces.enums import Partition, RunStatus
+from logics.entities.program import ProgramPaths, FileStatus
+from logics.functions.frames import arrow_frame
+from logics.functions.profiling import profiled
+from logics.processors.core.database import DatabaseSink
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+ARROW_FORMATS = {Extension.PARQUET: 'parquet', Extension.FEATHER: 'feather'}
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_TITLE_LENGTH = 31
+MAIN_SHEET = 'Main'
+MAX_PENDING = 2
+JSON_CHUNK = 50_000
 
 class DataWriter(DataWriterProtocol):
-    def __init__(self, output_path: str = ProgramPaths.output_path):
+    def __init__(self, output_path: str = ProgramPaths.output_path, max_rows: int = EXCEL_MAX_ROWS):
+        """
+        max_rows is the sheet size, header included. Larger outputs continue on Main_2, Main_3...
+        """
         self._output_path = output_path
+        self._max_rows = max_rows
 
-    def save_file(self, df: pd.DataFrame, method: Extension, name: str) -> None:
+    @profiled
+    def save_file(self, df: pd.DataFrame | Iterable[pd.DataFrame], method: Extension, name: str,
+                  partition_by: Partition | None = None) -> None:
+        """
+        Save a dataframe, or an iterable of dataframe chunks, to output_path/name.
+        Excel, CSV and the Arrow formats are streamed chunk by chunk, so memory does not grow with the number of rows.
+        Parquet and Feather outputs can be partitioned hive-style (name/region=.../part-0.parquet).
+        """
         filepath = os.path.join(self._output_path, name)
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        if partition_by is not None and method not in ARROW_FORMATS:
+            raise ValueError(f"Partitioning is only supported for {[ext.value for ext in ARROW_FORMATS]}")
         match method:
             case Extension.XLSX:
-                df.to_excel(f'{filepath}.xlsx', sheet_name='Main', index=False, engine='openpyxl')
+                self.save_workbook({MAIN_SHEET: chunks}, name)
             case Extension.CSV:
-                df.to_csv(f'{filepath}.csv', index=False)
+                self._write_csv(chunks, f'{filepath}.csv')
+            case Extension.CSV_GZ:
+                self._write_csv(chunks, f'{filepath}.csv.gz', compression='gzip')
             case Extension.JSON:
-                df.to_json(f'{filepath}.json', orient='records')
+                self._write_json(chunks, f'{filepath}.json')
+            case Extension.NDJSON:
+                self._write_json(chunks, f'{filepath}.ndjson', lines=True)
+            case Extension.SQLITE:
+                DatabaseSink.sqlite(f'{filepath}.sqlite').load(chunks)
+            case Extension.PARQUET | Extension.FEATHER if partition_by is not None:
+                self._write_partitioned(chunks, filepath, ARROW_FORMATS[method], partition_by)
+            case Extension.PARQUET:
+                self._write_parquet(chunks, f'{filepath}.parquet')
+            case Extension.FEATHER:
+                self._write_feather(chunks, f'{filepath}.feather')
             case _:
                 raise ValueError("Invalid file type")
 
+    @profiled
+    def save_workbook(self, datasets: Dict[str, pd.DataFrame | Iterable[pd.DataFrame]], name: str) -> str:
+        """
+        Write several datasets into one workbook in a single pass, one sheet (or more, past max_rows) per dataset.
+        openpyxl write-only workbook: rows are serialised as they are appended, nothing is kept in memory.
+        Returns the path of the workbook.
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        for title, df in datasets.items():
+            self._write_sheets(workbook, title, [df] if isinstance(df, pd.DataFrame) else df)
+        filepath = os.path.join(self._output_path, f'{name}.xlsx')
+        workbook.save(filepath)
+        return filepath
+
+    def _write_sheets(self, workbook: openpyxl.Workbook, title: str, chunks: Iterable[pd.DataFrame]) -> None:
+        sheet = None
+        header: List = []
+        rows = part = 0
+        for chunk in self._align(chunks):
+            header = list(chunk.columns)
+            for row in self.to_rows(chunk):
+                if sheet is None or rows == self._max_rows:
+                    part += 1
+                    sheet = workbook.create_sheet(self.sheet_title(title, part))
+                    sheet.append(header)
+                    rows = 1
+                sheet.append(row)
+                rows += 1
+        if sheet is None:
+            workbook.create_sheet(self.sheet_title(title, 1)).append(header)
+        elif part > 1:
+            lg.info(f"{title} exceeds {self._max_rows} rows, split across {part} sheets")
+
+    @staticmethod
+    def sheet_title(title: str, part: int) -> str:
+        suffix = f'_{part}' if part > 1 else ''
+        return f'{title[:SHEET_TITLE_LENGTH - len(suffix)]}{suffix}'
+
+    def _write_csv(self, chunks: Iterable[pd.DataFrame], filepath: str, compression: str | None = None) -> None:
+        for i, chunk in enumerate(self._align(chunks)):
+            chunk.to_csv(filepath, index=False, mode='w' if i == 0 else 'a', header=i == 0, compression=compression)
+
+    def _write_json(self, chunks: Iterable[pd.DataFrame], filepath: str, lines: bool = False) -> None:
+        """
+        Records are serialised JSON_CHUNK rows at a time: one record per line for NDJSON,
+        a single array with the same layout as to_json(orient='records') otherwise
+        """
+        with open(filepath, 'w', encoding='utf-8') as f:
+            if not lines:
+                f.write('[')
+            written = False
+            for chunk in self._align(chunks):
+                for start in range(0, len(chunk), JSON_CHUNK):
+                    records = chunk.iloc[start:start + JSON_CHUNK].to_json(orient='records', lines=lines)
+                    if lines:
+                        f.write(records if records.endswith('\n') else records + '\n')
+                        continue
+                    f.write((',' if written else '') + records[1:-1])
+                    written = True
+            if not lines:
+                f.write(']')
+
+    def _write_parquet(self, chunks: Iterable[pd.DataFrame], filepath: str) -> None:
+        writer = None
+        try:
+            for table in self._tables(chunks):
+                if writer is None:
+                    writer = pq.ParquetWriter(filepath, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _write_feather(self, chunks: Iterable[pd.DataFrame], filepath: str) -> None:
+        """
+        Feather v2 is the Arrow IPC file format, written batch by batch
+        """
+        sink = writer = None
+        try:
+            for table in self._tables(chunks):
+                if writer is None:
+                    sink = pa.OSFile(filepath, 'wb')
+                    writer = pa.ipc.new_file(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression='lz4'))
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+            if sink is not None:
+                sink.close()
+
+    def _write_partitioned(self, chunks: Iterable[pd.DataFrame], dirpath: str, file_format: str,
+                           partition_by: Partition) -> None:
+        tables = self._tables(chunks)
+        first = next(tables, None)
+        if first is None:
+            return
+        if partition_by.value not in first.schema.names:
+            raise KeyError(f"Partition column {partition_by.value} is not in the output")
+        ds.write_dataset(
+            self._batches(first, tables), dirpath, schema=first.schema, format=file_format,
+            partitioning=[partition_by.value], partitioning_flavor='hive',
+            existing_data_behavior='delete_matching',
+        )
+
+    def _tables(self, chunks: Iterable[pd.DataFrame]) -> Iterator['pa.Table']:
+        """
+        Arrow tables for each chunk, all cast to the schema of the first one
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet and Feather outputs")
+        schema = None
+        for chunk in self._align(chunks):
+            table = pa.Table.from_pandas(arrow_frame(chunk), schema=schema, preserve_index=False)
+            schema = schema or table.schema
+            yield table
+
+    @staticmethod
+    def _batches(first: 'pa.Table', tables: Iterator['pa.Table']) -> Iterator['pa.RecordBatch']:
+        yield from first.to_batches()
+        for table in tables:
+            yield from table.to_batches()
+
+    @staticmethod
+    def _align(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Columns are fixed by the first chunk, later chunks are put in its column order.
+        A chunk with other columns raises: chunks are decoded with the hints of the whole file (see
+        DataProcessor.chunk_hints) and all come out with the same columns, anything else would lose data.
+        """
+        columns: List = []
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                columns = list(chunk.columns)
+                yield chunk
+                continue
+            if set(chunk.columns) != set(columns) or len(chunk.columns) != len(columns):
+                extra = [column for column in chunk.columns if column not in columns]
+                missing = [column for column in columns if column not in chunk.columns]
+                raise ValueError(f"Chunk {i} has other columns than the first chunk, extra: {extra}, missing: {missing}")
+            yield chunk if list(chunk.columns) == columns else chunk[columns]
+
+    @staticmethod
+    def to_rows(df: pd.DataFrame) -> Iterator[tuple]:
+        '''Rows of python values with missing values as empty cells'''
+        values = df.astype(object).where(df.notna(), None)
+        return values.itertuples(index=False, name=None)
+
     @property
     def get_output_path(self):
-        return self._output_path
\ No newline at end of file
+        return self._output_path
+
+class BackgroundWriter:
+    """
+    Writer stage on its own thread: workbooks are queued by submit and serialised while the caller decodes the next register.
+    The queue is bounded, submit blocks once max_pending outputs are waiting, so processed frames cannot pile up in memory.
+    on_done / on_error receive the FileStatus of each output and run on the writer thread.
+    """
+    def __init__(self, writer: DataWriter | None = None, max_pending: int = MAX_PENDING,
+                 on_done: Callable[[FileStatus], None] | None = None,
+                 on_error: Callable[[FileStatus], None] | None = None):
+        self._writer = writer or DataWriter()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._on_done = on_done
+        self._on_error = on_error
+        self._closed = False
+        self.statuses: Dict[str, FileStatus] = {}
+        self._thread = threading.Thread(target=self._run, name='BackgroundWriter', daemon=True)
+        self._thread.start()
+
+    def submit(self, datasets: Dict[str, pd.DataFrame | Iterable[pd.DataFrame]], name: str, file: str = '') -> None:
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        file = file or name
+        self.statuses[file] = FileStatus(file)
+        self._queue.put((file, datasets, name))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting outputs, the ones already queued are still written
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while (job := self._queue.get()) is not None:
+            file, datasets, name = job
+            start = time.perf_counter()
+            try:
+                output = self._writer.save_workbook(datasets, name)
+                status = FileStatus(file, RunStatus.DONE, (output,), elapsed=time.perf_counter() - start)
+                callback = self._on_done
+            except Exception as e:
+                lg.exception(f"Err in |BackgroundWriter| for {file}")
+                status = FileStatus(file, RunStatus.FAILED, error=f'{type(e).__name__}: {e}',
+                                    elapsed=time.perf_counter() - start)
+                callback = self._on_error
+            self.statuses[file] = status
+            if callback is not None:
+                try:
+                    callback(status)
+                except Exception:
+                    lg.exception(f"Err in |BackgroundWriter| callback for {file}")
@@ -1,17 +1,42 @@
 import pandas as pd
 import logging as lg
+from typing import FrozenSet, List
 
-from logics.interfaces.decoders import Decoder
+from logics.functions.profiling import profiled
+from logics.interfaces.decoders import Decoder, ALL_COLUMNS
+from logics.functions.frames import is_text
+from logics.functions.std import Some
+
+NULL_LITERAL = 'null|NULL|Null|nan'
 
 class DataframeDecoder(Decoder):
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    reads = ALL_COLUMNS
+    writes = ALL_COLUMNS
+
+    def __init__(self, dataframe: pd.DataFrame, hints: Some[FrozenSet[str]] = None) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
         self.df = dataframe
+        self.hints = hints or frozenset()
+
+    @classmethod
+    def frame_hints(cls, df: pd.DataFrame) -> FrozenSet[str]:
+        """
+        Categorical columns with nulls anywhere in the whole frame, they get the '' category in every partition
+        """
+        return frozenset(
+            column for column in df.columns
+            if isinstance(df[column].dtype, pd.CategoricalDtype) and df[column].hasnans
+        )
+
+    @classmethod
+    def merge_hints(cls, hints: List[FrozenSet[str]]) -> FrozenSet[str]:
+        return frozenset().union(*hints)
 
     def __str__(self):
         return "Dataframe Decoder"
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         """
         Process the mechanical parts of the dataframe.
@@ -21,10 +46,12 @@ class DataframeDecoder(Decoder):
             self.replace_null_values()
             #self.drop_null_rows()
         except Exception as ex:
+            self.failed = True
             lg.warning('Could not process dataframe mechanics')
             lg.error(f"Traceback: {ex}")
         return self.df
 
+    @profiled
     def drop_unnamed(self) -> None:
         '''Dropping unused columns in the dataframe'''
         lg.info('Dropping unused fields')
@@ -38,9 +65,29 @@ class DataframeDecoder(Decoder):
         self.df = self.df.dropna(how=any, axis=0)
         return self.df
 
+    @profiled
     def replace_null_values(self) -> None:
         '''Replacing null values in the dataframe'''
         lg.info('Replacing null values')
-        self.df = self.df.apply(lambda x: x.replace('null|NULL|Null|nan', '') if x.dtype == 'object' else x)
-        self.df = self.df.apply(lambda x: x.fillna('') if x.dtype == 'object' else x.fillna(0))
-        #self.df = self.df.fillna('', inplace=True)
\ No newline at end of file
+        # column at a time instead of two frame-wide applies: under Copy-on-Write untouched columns stay shared
+        for i, name in enumerate(self.df.columns):
+            column = self.df.iloc[:, i]
+            if column.dtype == 'object' and (column == NULL_LITERAL).any():
+                column = column.replace(NULL_LITERAL, '')
+            filled = self.fill_nulls(column, name in self.hints)
+            if filled is not self.df.iloc[:, i]:
+                self.df.isetitem(i, filled)
+        #self.df = self.df.fillna('', inplace=True)
+
+    @staticmethod
+    def fill_nulls(column: pd.Series, nullable: bool = False) -> pd.Series:
+        '''Text columns (object, typed strings, categories) are filled with empty strings, the rest with zeroes'''
+        if column.dtype == 'object' or is_text(column):
+            return column.fillna('')
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            if not column.hasnans and not nullable:
+                return column
+            if '' not in column.cat.categories:
+                column = column.cat.add_categories('')
+            return column.fillna('')
+        return column.fillna(0)
\ No newline at end of file
@@ -1,31 +1,63 @@
 import pandas as pd
 import logging as lg
+from typing import List
 
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
 from logics.namespaces.enums import Passport, Debt, Person
+from logics.functions.std import Some
+
+DATE_COLUMNS = [Person.BIRTH_DATE.value, Passport.DATE.value, Debt.START_DATE.value, Debt.END_DATE.value]
+DATE_FORMAT = '%d.%m.%Y'
 
 class DateDecoder(Decoder):
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    reads = frozenset(DATE_COLUMNS)
+    writes = frozenset(DATE_COLUMNS)
+    skippable = True
+
+    def __init__(self, dataframe: pd.DataFrame, hints: Some[List[str]] = None) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
         self.df = dataframe
+        self.hints = hints
+
+    @classmethod
+    def frame_hints(cls, df: pd.DataFrame) -> List[str]:
+        """
+        Date columns formatted before the first one that fails to parse over the whole frame
+        """
+        columns = []
+        for column in DATE_COLUMNS:
+            if column in df.columns:
+                try:
+                    pd.to_datetime(df[column], format=DATE_FORMAT)
+                except Exception:
+                    break
+                columns.append(column)
+        return columns
+
+    @classmethod
+    def merge_hints(cls, hints: List[List[str]]) -> List[str]:
+        '''The columns before the first one that fails to parse in any chunk'''
+        return min(hints, key=len) if hints else []
 
     def __str__(self) -> str:
         return "Date Decoder"
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         try:
-            self._format_date(Person.BIRTH_DATE.value)
-            self._format_date(Passport.DATE.value)
-            self._format_date(Debt.START_DATE.value)
-            self._format_date(Debt.END_DATE.value)
+            for column in DATE_COLUMNS if self.hints is None else self.hints:
+                self._format_date(column)
         except Exception as ex:
+            self.failed = True
             lg.warning("Could not decode dates")
             lg.error(f"Traceback: {ex}")
         return self.df
 
+    @profiled
     def _format_date(self, column: str) -> None:
         if column in self.df.columns:
             lg.info(f"[{column}] in columns, formatting dates...")
-            self.df[column] = pd.to_datetime(self.df[column], format='%d.%m.%Y').dt.date
+            self.df[column] = pd.to_datetime(self.df[column], format=DATE_FORMAT).dt.date
 
@@ -1,10 +1,22 @@
 import pandas as pd
+import numpy as np
 import logging as lg
 
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
 from logics.namespaces.enums import  Debt, Register
 
 class DebtDecoder(Decoder):
+    reads = frozenset([
+        Debt.TOTAL.value, Debt.CURRENT.value, Debt.CURRENT_PERCENT.value, Debt.OVERDUE.value,
+        Debt.OVERDUE_PERCENT.value, Debt.COMISSIONS.value, Debt.FINES.value, Debt.FINAL_CURRENT.value,
+        Debt.FINAL_CURRENT_PERCENT.value, Debt.STATE_DUTY.value,
+    ])
+    writes = frozenset([
+        Debt.TOTAL.value, Debt.TOTAL_SUM.value, Debt.CURRENT_CALCULATED.value,
+        Debt.CURRENT_PERCENT_CALCULATED.value, Register.COLLECT_SCHEME.value,
+    ])
+
     def __init__(self, dataframe: pd.DataFrame) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
@@ -13,6 +25,7 @@ class DebtDecoder(Decoder):
     def __str__(self) -> str:
         return "Debt Decoder"
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         try:
             self._clean_total_debt()
@@ -24,12 +37,15 @@ class DebtDecoder(Decoder):
                 self._calculate_total_sum_with_current_debt_and_percent()
             self._set_scheme()
         except Exception as ex:
+            self.failed = True
             lg.warning('Could not decode debt information')
             lg.error(f'Traceback: {ex}')
         return self.df
 
+    @profiled
     def _clean_total_debt(self) -> None:
-        if Debt.TOTAL.value in self.df.columns:
+        # typed money columns (see namespaces.schema) are already coerced to float64
+        if Debt.TOTAL.value in self.df.columns and not pd.api.types.is_numeric_dtype(self.df[Debt.TOTAL.value]):
             self.df[Debt.TOTAL.value] = self.df[Debt.TOTAL.value].apply(lambda x: 0 if x in ['null', 'NULL', None, ''] else x)
 
     def _has_fcd_and_fcp(self) -> bool:
@@ -52,7 +68,17 @@ class DebtDecoder(Decoder):
         self.df[Debt.CURRENT_PERCENT_CALCULATED.value] = self.df[Debt.CURRENT_PERCENT.value] - self.df.get(Debt.OVERDUE_PERCENT.value, 0)
         self.df[Debt.TOTAL_SUM.value] = (self.df.get(Debt.CURRENT_CALCULATED.value, 0)) + self.df.get(Debt.OVERDUE.value, 0) + self.df.get(Debt.CURRENT_PERCENT_CALCULATED.value, 0) + (self.df.get(Debt.OVERDUE_PERCENT.value, 0)) + (self.df.get(Debt.COMISSIONS.value, 0)) + (self.df.get(Debt.FINES.value, 0))
 
+    @profiled
     def _set_scheme(self) -> None:
+        total, total_sum = self.df.get(Debt.TOTAL.value), self.df.get(Debt.TOTAL_SUM.value)
+        if total is not None and total_sum is not None and len(self.df) \
+                and pd.api.types.is_numeric_dtype(total) and pd.api.types.is_numeric_dtype(total_sum):
+            # same comparison as set_scheme, column at a time
+            same = np.round(total.to_numpy(dtype=float), 0) == np.round(total_sum.to_numpy(dtype=float), 0)
+            self.df[Register.COLLECT_SCHEME.value] = pd.Series(
+                np.where(same, 'FULL_COLLECT', 'BACK_TO_SCHEDULE'), index=self.df.index, dtype=object
+            )
+            return
         self.df[Register.COLLECT_SCHEME.value] = self.df.apply(self.set_scheme, axis=1)
 
     @staticmethod
@@ -0,0 +1,248 @@
+import os
+import glob
+import json
+import hashlib
+import threading
+import importlib.util
+import multiprocessing as mp
+import pandas as pd
+import logging as lg
+import phonenumbers as pn
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Set
+
+from logics.functions.profiling import profiled
+from logics.functions.std import Some
+
+# formatting phonenumbers discards when parsing: spaces, hyphens, brackets
+SEPARATORS = r'[ ()\-]'
+FORMATTED = r'\+?[0-9 ()\-]+'
+# Russian shapes whose E.164 form phonenumbers.parse(row, 'RU') gives without consulting anything else:
+# +7 with a 10 digit national number, 7 or the 8 trunk prefix before one, or the bare 10 digits,
+# the E.164 form is +7 and the last 10 digits in every case.
+# 810 is the Russian international prefix, phonenumbers reads what follows it as another country's number.
+# [0-9] rather than \d, which also matches the non ASCII digits phonenumbers translates
+RU_SHAPES = r'\+7([1-9][0-9]{9})|7([347-9][0-9]{9})|8([2-9][0-9]{9})|((?!810)[3-9][0-9]{9})'
+NATIONAL_DIGITS = 10
+EMPTY = ('', 'nan')
+PHONE_CACHE_SIZE = 1_000_000
+# what the cached E.164 forms depend on besides the phonenumbers version: find and the normaliser
+CACHE_MODULES = ('logics.processors.data.phones', 'logics.processors.data.normalizer')
+# distinct values worth sending to the phone pool, fewer are parsed in process
+PARALLEL_MIN = 2_000
+SHARDS_PER_PROCESS = 4
+
+def cache_version() -> str:
+    '''Digest of the phonenumbers version and the sources of CACHE_MODULES'''
+    digest = hashlib.sha256(pn.__version__.encode())
+    for module in CACHE_MODULES:
+        with open(importlib.util.find_spec(module).origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:32]
+
+class PhoneCache:
+    """
+    Bounded LRU cache of raw phone strings to their E.164 form (PhoneParser.find), in front of the slow parser.
+    One instance (PHONE_CACHE) is shared by every phone column decoded in the process, hits and misses
+    count its lookups. load / save keep it in a JSON file between runs, least recently used entries first,
+    under the version of the code and phonenumbers that parsed them: a file of another version is discarded.
+    """
+    def __init__(self, maxsize: int = PHONE_CACHE_SIZE, version: Some[str] = None) -> None:
+        self.maxsize = maxsize
+        self._version = version
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._loaded: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, values: Iterable[str], parse: Callable[[List[str]], List[str]]) -> Dict[str, str]:
+        '''E.164 form of every distinct value, the ones not cached are parsed in one parse call and cached'''
+        resolved, missing = {}, []
+        with self._lock:
+            for value in values:
+                if value in self._entries:
+                    self._entries.move_to_end(value)
+                    resolved[value] = self._entries[value]
+                else:
+                    missing.append(value)
+            self.hits += len(resolved)
+            self.misses += len(missing)
+        parsed = dict(zip(missing, parse(missing))) if missing else {}
+        with self._lock:
+            self._entries.update(parsed)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        resolved.update(parsed)
+        return resolved
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            self._version = cache_version()
+        return self._version
+
+    def load(self, path: str) -> None:
+        '''Entries saved to path, once per process; cached ones are kept and count as more recent'''
+        if path in self._loaded:
+            return
+        entries = self._read(path)
+        with self._lock:
+            self._entries = self._merged(entries, self._entries)
+            self._loaded.add(path)
+        if entries:
+            lg.info(f"Phone cache loaded {len(entries)} entries from {path}")
+
+    def save(self, path: str) -> None:
+        '''Entries merged into the ones saved to path meanwhile, the cached ones count as more recent'''
+        with self._lock:
+            entries = self._merged(self._read(path), self._entries)
+        # replaced atomically: readers never see a partial file
+        temporary = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'entries': entries}, f, ensure_ascii=False)
+        os.replace(temporary, path)
+        self._loaded.add(path)
+        lg.info(f"Phone cache saved {len(entries)} entries to {path}, {self.stats()}")
+
+    @staticmethod
+    def part(path: str) -> str:
+        '''File a batch worker saves its entries to instead of path, see merge_parts'''
+        return f"{path}.{os.getpid()}.part"
+
+    def merge_parts(self, path: str) -> None:
+        '''The parts batch workers saved next to path loaded and removed, then path saved once'''
+        for part in glob.glob(f"{glob.escape(path)}.*.part"):
+            self.load(part)
+            os.remove(part)
+        self.save(path)
+
+    def _read(self, path: str) -> Dict[str, str]:
+        if not os.path.isfile(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            lg.warning(f"Ignoring unreadable phone cache {path}: {e}")
+            return {}
+        if not isinstance(saved, dict) or saved.get('version') != self.version:
+            lg.info(f"Phone cache {path} was saved by another version, discarding it")
+            return {}
+        return saved.get('entries', {})
+
+    def _merged(self, older: Dict[str, str], newer: Dict[str, str]) -> OrderedDict:
+        merged = OrderedDict(item for item in older.items() if item[0] not in newer)
+        merged.update(newer)
+        while len(merged) > self.maxsize:
+            merged.popitem(last=False)
+        return merged
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        return f"hits: {self.hits}, misses: {self.misses}, hit rate: {self.hits / lookups if lookups else 0:.1%}"
+
+PHONE_CACHE = PhoneCache()
+
+def _load_metadata() -> None:
+    '''Phone pool initializer: RU metadata and the matcher patterns are loaded once per worker, not per shard'''
+    pn.parse('+74951234567', 'RU')
+    list(pn.PhoneNumberMatcher('8 (495) 123-45-67', 'RU'))
+
+def _parse_shard(slow: Callable[[str], str], shard: List[str]) -> List[str]:
+    return [slow(value) for value in shard]
+
+class PhonePool:
+    """
+    Process pool the phones the normaliser cannot vectorise are parsed in, disabled with processes <= 1.
+    PHONE_POOL is sized once by the entry points (phone_processes), a normaliser is given another pool explicitly.
+    The workers are spawned once, on first use, with the phonenumbers metadata loaded, and serve every
+    later column of the process; values are deduplicated and sharded across them.
+    Spawned rather than forked: the normaliser runs on graph threads, and Polars may be loaded.
+    A pool inherited by a forked process (row partitions) is not used there, its values are parsed in process.
+    """
+    def __init__(self, processes: int = 1) -> None:
+        self.processes = processes
+        self._pool: Some[ProcessPoolExecutor] = None
+        self._owner = os.getpid()
+        self._lock = threading.Lock()
+
+    def map(self, slow: Callable[[str], str], values: List[str]) -> List[str]:
+        if self.processes <= 1 or len(values) < PARALLEL_MIN or os.getpid() != self._owner:
+            return _parse_shard(slow, values)
+        size = -(-len(values) // (self.processes * SHARDS_PER_PROCESS))
+        shards = [values[start:start + size] for start in range(0, len(values), size)]
+        lg.debug(f"Parsing {len(values)} phones in {len(shards)} shards on {self.processes} processes")
+        return [value for parsed in self._executor().map(_parse_shard, [slow] * len(shards), shards) for value in parsed]
+
+    def resize(self, processes: int) -> None:
+        if processes != self.processes:
+            self.shutdown()
+            self.processes = processes
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None and os.getpid() == self._owner:
+                self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=mp.get_context('spawn'),
+                                                 initializer=_load_metadata)
+            return self._pool
+
+PHONE_POOL = PhonePool()
+
+class PhoneNormalizer:
+    """
+    Columnar PhoneParser.find. The common Russian shapes are normalised with vectorised string operations
+    on the whole column, the residue (anything else, foreign numbers and free text included) goes through
+    the slow parser once per distinct value, through the phone cache and the phone pool. Output is identical
+    to applying the slow parser cell by cell.
+    """
+    def __init__(self, slow: Callable[[str], str], cache: Some[PhoneCache] = None, pool: Some[PhonePool] = None) -> None:
+        self.slow = slow
+        self.cache = cache if cache is not None else PHONE_CACHE
+        self.pool = pool if pool is not None else PHONE_POOL
+
+    @profiled
+    def normalize(self, column: pd.Series) -> pd.Series:
+        original = column.astype(str)
+        text = original
+        floats = text.str.endswith('.0')
+        if floats.any():
+            # what find does to excel floats, every '.0' goes, not only the trailing one
+            text = text.where(~floats, text.str.replace('.0', '', regex=False))
+        formatted = text.str.fullmatch(FORMATTED)
+        digits = text.where(~formatted, text.str.replace(SEPARATORS, '', regex=True))
+        shaped = formatted & digits.str.fullmatch(RU_SHAPES)
+        empty = text.isin(EMPTY)
+
+        result = pd.Series('', index=column.index, dtype=object)
+        result[shaped] = '+7' + digits[shaped].str[-NATIONAL_DIGITS:]
+        residue = ~(shaped | empty)
+        if residue.any():
+            values = original[residue]
+            result[residue] = values.map(self.resolve(values.unique()))
+        lg.debug(f"Phones normalised: {int(shaped.sum())} vectorised, {int(residue.sum())} parsed, {int(empty.sum())} empty; "
+                 f"cache {self.cache.stats()}")
+        return result
+
+    def resolve(self, values: Iterable[str]) -> Dict[str, str]:
+        '''E.164 form of distinct residue values, through the cache and the pool'''
+        return self.cache.resolve(values, self.parse)
+
+    def parse(self, values: List[str]) -> List[str]:
+        return self.pool.map(self.slow, values)
@@ -0,0 +1,124 @@
+import os
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import logging as lg
+from typing import Dict, Tuple
+
+from logics.entities.program import ProgramPaths
+from logics.namespaces.enums import PhoneType
+from logics.functions.std import Some
+
+# Rossvyaz registry exports (ABC-3xx.csv, ABC-4xx.csv, ABC-8xx.csv, DEF-9xx.csv):
+# АВС/ DEF;От;До;Емкость;Оператор;Регион[;ИНН...], read by position, the headers vary between exports
+CODE, START, END, OPERATOR, REGION = 0, 1, 2, 4, 5
+ENCODINGS = ('utf-8-sig', 'cp1251')
+# DEF codes are the 9xx ones, every range under them is mobile
+MOBILE_CODE = 9
+RANGE_DIGITS = 7
+E164_RU = r'\+7[0-9]{10}'
+
+class NumberingPlan:
+    """
+    Russian numbering plan as sorted arrays of the first and last national number of every ABC / DEF range,
+    with the operator and region of each range as indices into their distinct names.
+    classify looks a whole column of E.164 phones up with one searchsorted.
+    """
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, operators: np.ndarray, operator_names: np.ndarray,
+                 regions: np.ndarray, region_names: np.ndarray, digest: str = '') -> None:
+        self.starts = starts
+        self.ends = ends
+        self.operators = operators
+        self.operator_names = operator_names
+        self.regions = regions
+        self.region_names = region_names
+        self.digest = digest
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def load(cls, path: str) -> 'NumberingPlan':
+        '''Every .csv export in the directory at path, or the single export at path'''
+        files = sorted(
+            os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith('.csv')
+        ) if os.path.isdir(path) else [path]
+        if not files:
+            raise FileNotFoundError(f"No numbering plan exports in {path}")
+        digest = hashlib.sha256()
+        frames = []
+        for file in files:
+            with open(file, 'rb') as f:
+                digest.update(f.read())
+            frames.append(cls._read(file))
+        ranges = pd.concat(frames, ignore_index=True).sort_values('start', kind='stable')
+        operators, operator_names = pd.factorize(ranges['operator'])
+        regions, region_names = pd.factorize(ranges['region'])
+        lg.info(f"Numbering plan: {len(ranges)} ranges from {len(files)} files")
+        return cls(ranges['start'].to_numpy(), ranges['end'].to_numpy(), operators.astype(np.int32),
+                   np.asarray(operator_names, dtype=object), regions.astype(np.int32),
+                   np.asarray(region_names, dtype=object), digest.hexdigest()[:32])
+
+    @staticmethod
+    def _read(file: str) -> pd.DataFrame:
+        for encoding in ENCODINGS:
+            try:
+                df = pd.read_csv(file, sep=';', header=0, usecols=[CODE, START, END, OPERATOR, REGION],
+                                 dtype=str, encoding=encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            raise ValueError(f"Numbering plan export {file} is neither {' nor '.join(ENCODINGS)}")
+        df = df.set_axis(['code', 'start', 'end', 'operator', 'region'], axis=1).dropna(subset=['code', 'start', 'end'])
+        code = df['code'].str.strip().astype(np.int64) * 10 ** RANGE_DIGITS
+        return pd.DataFrame({
+            'start': code + df['start'].str.strip().astype(np.int64),
+            'end': code + df['end'].str.strip().astype(np.int64),
+            'operator': df['operator'].fillna('').str.strip(),
+            'region': df['region'].fillna('').str.strip(),
+        })
+
+    def classify(self, column: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        Type (PhoneType), operator and region of a column of E.164 phones, '' for phones outside the plan
+        """
+        valid = column.str.fullmatch(E164_RU, na=False).to_numpy(dtype=bool)
+        national = np.zeros(len(column), dtype=np.int64)
+        national[valid] = column[valid].str.slice(2).astype(np.int64).to_numpy()
+        position = np.searchsorted(self.starts, national, side='right') - 1
+        found = valid & (position >= 0)
+        found[found] = national[found] <= self.ends[position[found]]
+        position = position[found]
+
+        types = np.full(len(column), '', dtype=object)
+        types[found] = np.where(national[found] // 10 ** RANGE_DIGITS // 100 == MOBILE_CODE,
+                                PhoneType.MOBILE.value, PhoneType.LANDLINE.value)
+        operators = np.full(len(column), '', dtype=object)
+        operators[found] = self.operator_names[self.operators[position]]
+        regions = np.full(len(column), '', dtype=object)
+        regions[found] = self.region_names[self.regions[position]]
+        lg.debug(f"Numbering plan: {int(found.sum())} of {len(column)} phones classified")
+        return (pd.Series(types, index=column.index), pd.Series(operators, index=column.index),
+                pd.Series(regions, index=column.index))
+
+_PLANS: Dict[str, Some[NumberingPlan]] = {}
+_PLANS_LOCK = threading.Lock()
+
+def numbering_plan(path: str = ProgramPaths.numbering_path) -> Some[NumberingPlan]:
+    """
+    Numbering plan at path, loaded once per process; None when there is none, phones are then not classified
+    """
+    with _PLANS_LOCK:
+        if path not in _PLANS:
+            plan = None
+            if os.path.exists(path):
+                try:
+                    plan = NumberingPlan.load(path)
+                except (OSError, ValueError, KeyError) as e:
+                    lg.warning(f"Ignoring unreadable numbering plan {path}: {e}")
+            else:
+                lg.info(f"No numbering plan at {path}, phones are not classified")
+            _PLANS[path] = plan
+        return _PLANS[path]
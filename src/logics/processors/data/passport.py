@@ -3,8 +3,10 @@ import logging as lg
 from dataclasses import dataclass
 
 from logics.namespaces.namespace import REG_REG
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
 from logics.namespaces.enums import Passport, PassportVariants
+from logics.functions.frames import as_text
 
 @dataclass
 class PassportFields:
@@ -14,6 +16,11 @@ class PassportFields:
     organization: str 
 
 class PassportDecoder(Decoder):
+    reads = frozenset([variant.value for variant in PassportVariants]
+                      + [Passport.SERIES.value, Passport.NUMBER.value, Passport.ORGANIZATION.value])
+    writes = frozenset([passport.value for passport in Passport])
+    skippable = True
+
     def __init__(self, dataframe: pd.DataFrame) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
@@ -22,6 +29,7 @@ class PassportDecoder(Decoder):
     def __str__(self) -> str:
         return "Passport Decoder"
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         """
         Extract and process passport information from the dataframe.
@@ -34,35 +42,38 @@ class PassportDecoder(Decoder):
                 self.df[[Passport.SERIES.value, Passport.NUMBER.value]] = self.df[[PassportVariants.DIVISION.value, Passport.SERIES.value]].apply(self.split_passport_number, axis=1)
 
             if Passport.NUMBER.value in self.df.columns:
-                self.df[Passport.NUMBER.value] = self.df[Passport.NUMBER.value].astype(str)
-                self.df[Passport.TYPE.value] = self.df[Passport.NUMBER.value].astype(str).apply(self.find_passport)
+                self.df[Passport.NUMBER.value] = as_text(self.df[Passport.NUMBER.value])
+                self.df[Passport.TYPE.value] = self.df[Passport.NUMBER.value].apply(self.find_passport)
 
             if Passport.SERIES.value in self.df.columns:
-                self.df[Passport.SERIES.value] = self.df[Passport.SERIES.value].astype(str).apply(self.truncate_floated)
-                self.df[Passport.SERIES.value] = self.df[Passport.SERIES.value].astype(str).apply(self.format_passport_series)
+                self.df[Passport.SERIES.value] = as_text(self.df[Passport.SERIES.value]).apply(self.truncate_floated)
+                self.df[Passport.SERIES.value] = self.df[Passport.SERIES.value].apply(self.format_passport_series)
                 self.df[Passport.REGION.value] = self.df[Passport.SERIES.value].astype(str).apply(lambda x: REG_REG.get(x[:2], 'UNKNOWN'))
 
             self._clean_up_passport_data()
 
         except Exception as ex:
+            self.failed = True
             lg.warning('Could not decode passport information')
             lg.error(f'Traceback: {ex}')
         return self.df
 
+    @profiled
     def _process_passport_column(self, column_name, func):
         if column_name in self.df.columns:
             match column_name:
                 case PassportVariants.DEFAULT.value:
                     self.df[[Passport.SERIES.value, Passport.NUMBER.value, Passport.DATE.value, Passport.ORGANIZATION.value]] = self.df[column_name].apply(func)
                 case PassportVariants.FULL.value:
-                    self.df[[Passport.SERIES.value, Passport.NUMBER.value]] = self.df[column_name].apply(func)
+                    self.df[[Passport.SERIES.value, Passport.NUMBER.value]] = as_text(self.df[column_name]).apply(func)
 
+    @profiled
     def _clean_up_passport_data(self):
         try:
             lg.info('Checking for zeroes in [passport_num]..')
-            self.df[Passport.NUMBER.value] = self.df[Passport.NUMBER.value].astype(str).apply(lambda row: self.add_cumulative_zeroes(row, 6))
+            self.df[Passport.NUMBER.value] = as_text(self.df[Passport.NUMBER.value]).apply(lambda row: self.add_cumulative_zeroes(row, 6))
             lg.info('Seeking nulls in [passport_org]..')
-            self.df[Passport.ORGANIZATION.value] = self.df[Passport.ORGANIZATION.value].apply(self.fill_nans)
+            self.df[Passport.ORGANIZATION.value] = as_text(self.df[Passport.ORGANIZATION.value]).apply(self.fill_nans)
         except Exception:
             lg.warn('Could not drop nulls in [passport_org]')
             pass
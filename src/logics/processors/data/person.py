@@ -1,20 +1,69 @@
 import pandas as pd
 import numpy as np
 import logging as lg
+from typing import Dict, List
 
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
-from logics.namespaces.enums import Person, NameVariants
-from logics.functions.std import expect, NullException
+from logics.namespaces.enums import Person, NameVariants, Residence
+from logics.functions.std import expect, NullException, Some
+
+REG_COLUMNS = [Residence.REG_REGION.value, Residence.REG_LOCALITY.value, Residence.REG_STREET.value,
+               Residence.REG_HOUSE.value, Residence.REG_BUILDING.value, Residence.REG_FLAT.value]
+LIV_COLUMNS = [Residence.LIV_REGION.value, Residence.LIV_LOCALITY.value, Residence.LIV_STREET.value,
+               Residence.LIV_HOUSE.value, Residence.LIV_BUILDING.value, Residence.LIV_FLAT.value]
+NAME_SPLITS = {NameVariants.FIO.value: 4, NameVariants.IFO.value: 5}
 
 class PersonDecoder(Decoder):
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    reads = frozenset([
+        NameVariants.FIO.value, NameVariants.IFO.value, Person.SEX.value, Person.LASTNAME.value,
+        Person.POSITION.value, Person.MAIL.value, Person.MAILS.value, *REG_COLUMNS, *LIV_COLUMNS,
+    ])
+    writes = frozenset([
+        Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value, Person.POSTFIX.value,
+        Person.SEX.value, Person.WORK.value, Person.MAIL.value, Person.REG_ADDRESS.value, Person.HOME_ADDRESS.value,
+        *REG_COLUMNS, *LIV_COLUMNS,
+    ])
+    skippable = True
+
+    def __init__(self, dataframe: pd.DataFrame, hints: Some[Dict[str, int]] = None) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
         self.df = dataframe
+        self.hints = hints or {}
 
     def __str__(self) -> str:
         return "Person Decoder"
 
+    @classmethod
+    def frame_hints(cls, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Width of the name split over the whole frame, a partition pads its split up to it
+        """
+        hints = {}
+        for variant, n in NAME_SPLITS.items():
+            if variant in df.columns:
+                try:
+                    hints[variant] = int(df[variant].str.split(' ', n=n).str.len().max())
+                except (AttributeError, TypeError, ValueError):
+                    pass
+        return hints
+
+    @classmethod
+    def merge_hints(cls, hints: List[Dict[str, int]]) -> Dict[str, int]:
+        '''The widest split of any chunk'''
+        merged: Dict[str, int] = {}
+        for chunk in hints:
+            for variant, width in chunk.items():
+                merged[variant] = max(merged.get(variant, 0), width)
+        return merged
+
+    @classmethod
+    def partitionable(cls, df: pd.DataFrame) -> bool:
+        # split_mail adds m1..mN columns row by row, their order depends on the whole frame
+        return Person.MAILS.value not in df.columns
+
+    @profiled
     def decode(self) -> pd.DataFrame:
         try:
             self.df = expect(self._name_splitter(), "Name splitter caused an error | ")
@@ -23,10 +72,12 @@ class PersonDecoder(Decoder):
             self.df = expect(self._mail(), "Mail finder caused an error | ")
             self.df = expect(self._regliv(), "RegLiv finder caused an error | ")
         except NullException as ex:
+            self.failed = True
             lg.warning('Could not decode personal information')
             lg.error(f'Traceback: {ex}')
         return self.df
 
+    @profiled
     def _name_splitter(self) -> pd.DataFrame:
         """
         FIO will be splitted into name, surname, lastname, addname
@@ -35,7 +86,7 @@ class PersonDecoder(Decoder):
         if NameVariants.FIO.value in self.df.columns:
             lg.info('[fio_full] found in columns, splitting names.')
             try:
-                names = self.df[NameVariants.FIO.value].str.split(' ', n=4, expand=True)
+                names = self._pad(self.df[NameVariants.FIO.value].str.split(' ', n=4, expand=True), NameVariants.FIO.value)
                 names.columns = [Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value]
                 self.df = pd.concat([self.df, names], axis=1)
                 lg.info("Names split successfully")
@@ -46,7 +97,7 @@ class PersonDecoder(Decoder):
         if NameVariants.IFO.value in self.df.columns:
             lg.info('[ifo_full] found in columns, splitting names...')
             try:
-                names = self.df[NameVariants.IFO.value].str.split(' ', n=5, expand=True)
+                names = self._pad(self.df[NameVariants.IFO.value].str.split(' ', n=5, expand=True), NameVariants.IFO.value)
                 names.columns = [Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value, Person.POSTFIX.value]
                 self.df = pd.concat([self.df, names], axis=1)
                 lg.info("Names split successfully")
@@ -56,6 +107,15 @@ class PersonDecoder(Decoder):
                 pass
         return self.df
 
+    def _pad(self, names: pd.DataFrame, variant: str) -> pd.DataFrame:
+        """
+        Missing split columns of a partition, filled the way str.split fills short names
+        """
+        for i in range(names.shape[1], self.hints.get(variant, 0)):
+            names[i] = np.where(self.df[variant].isna(), np.nan, None)
+        return names
+
+    @profiled
     def _sex_finder(self) -> pd.DataFrame:
         if Person.SEX.value in self.df.columns:
             lg.info('[sex] found in columns, processing...')
@@ -66,12 +126,14 @@ class PersonDecoder(Decoder):
             self.df[Person.SEX.value] = self.df[Person.SEX.value].apply(lambda x: 'М' if x[-2:] in ['ич', 'ов', 'ин'] else 'Ж')
         return self.df
 
+    @profiled
     def _workplace(self) -> pd.DataFrame:
         if Person.POSITION.value in self.df.columns:
             lg.info('Found [position] column. mapping workplace...')
             self.df[Person.WORK.value] = self.df[Person.POSITION.value].apply(lambda x: 'ООО' if pd.isna(x) or str(x).strip() == '' else str(x))
         return self.df
 
+    @profiled
     def _mail(self) -> pd.DataFrame:
         if Person.MAIL.value in self.df.columns:
             lg.info('Found [mail] column (UNIQUE). mapping mail...')
@@ -79,21 +141,20 @@ class PersonDecoder(Decoder):
             self.df[Person.MAIL.value] = self.df[Person.MAIL.value].apply(lambda x: '' if x == 'не задано' else x)
             self.df[Person.MAIL.value] = self.df[Person.MAIL.value].apply(lambda x: '' if x in ['null', 'NULL'] else x)
             self.df[Person.MAIL.value] = self.df[Person.MAIL.value].apply(self.fill_nans)
-        if 'mails' in self.df.columns:
+        if Person.MAILS.value in self.df.columns:
             lg.info('Found [mails] column (MULTIPLE). applying multiple mapping...')
             self.df = self.df.apply(self.split_mail, axis=1)
         return self.df
 
+    @profiled
     def _regliv(self) -> pd.DataFrame:
-        required_columns = ['rg_reg', 'np_reg', 'rg_liv', 'np_liv']
+        required_columns = REG_COLUMNS[:2] + LIV_COLUMNS[:2]
         if all(col in self.df.columns for col in required_columns):
             try:
                 lg.info('Found registration and living related columns. concatenating results...')
-                self.df[Person.REG_ADDRESS.value] = self.df[['rg_reg', 'np_reg', 'st_reg', 'hs_reg', 'cp_reg', 'ft_reg']].apply(lambda x: ', '.join(x.astype(str)), axis=1)
-                self.df[Person.HOME_ADDRESS.value] = self.df[['rg_liv', 'np_liv', 'st_liv', 'hs_liv', 'cp_liv', 'ft_liv']].apply(lambda x: ', '.join(x.astype(str)), axis=1)
-                self.df = self.df.drop(['rg_reg', 'np_reg', 'st_reg', 'hs_reg', 'cp_reg', 'ft_reg',
-                            'rg_liv', 'np_liv', 'st_liv', 'hs_liv', 'cp_liv', 'ft_liv',],
-                            axis=1)
+                self.df[Person.REG_ADDRESS.value] = self.join_columns(self.df[REG_COLUMNS], ', ')
+                self.df[Person.HOME_ADDRESS.value] = self.join_columns(self.df[LIV_COLUMNS], ', ')
+                self.df = self.df.drop(REG_COLUMNS + LIV_COLUMNS, axis=1)
             except Exception as e:
                 lg.warning(f"Error processing registration/living related columns: {e}")
                 return self.df
@@ -104,10 +165,16 @@ class PersonDecoder(Decoder):
             lg.info("Reg/liv columns not found in dataframe")
             return self.df
 
+    @staticmethod
+    def join_columns(df: pd.DataFrame, separator: str) -> pd.Series:
+        '''Row-wise str join of the columns, values cast the way a row of df would cast them'''
+        text = pd.DataFrame(df.to_numpy(), index=df.index).astype(str)
+        return text[0].str.cat([text[i] for i in range(1, text.shape[1])], sep=separator)
+
     @staticmethod
     def split_mail(row):
         '''Split 'mails' column into separate ones'''
-        mail_count = row['mails']
+        mail_count = row[Person.MAILS.value]
         split_mail = mail_count.split(',')
         for i, num in enumerate(split_mail):
             if len(num) > i:
@@ -2,24 +2,96 @@ import pandas as pd
 import logging as lg
 import phonenumbers as pn
 import re
-from typing import List, Tuple, Dict
+from typing import List, Set, Tuple, Dict
 
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
 from logics.namespaces.enums import Phones, Clients, PhoneEnum, Register
 from logics.functions.std import expect, unwrap, Some
+from logics.functions.frames import as_text
+from logics.processors.data.normalizer import PhoneNormalizer
+from logics.processors.data.numbering import numbering_plan
+
+DELIMITERS = (',', ';')
+DEFAULT_DELIMITER = '\t'
+# columns normalised after the multiple phones are split: phones_N, pN and the split columns of phones_N
+NORMALISED = r"^phones_\d+|p\d+"
 
 class PhoneParser(Decoder):
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    reads = frozenset([phone.value for phone in PhoneEnum])
+    writes = frozenset([phone.value for phone in PhoneEnum])
+    skippable = True
+
+    def __init__(self, dataframe: pd.DataFrame, hints: Some[Dict[str, Tuple[str, int]]] = None) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
         self.df: pd.DataFrame = dataframe
+        self.hints: Dict[str, Tuple[str, int]] = hints or {}
         self.columns: List[str] = self._find_columns()
         self.multiple_phones, self.single_phones = self._classify_columns()
+        self.normalizer = PhoneNormalizer(self.find)
+        self.numbering = numbering_plan()
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         self.prepare()
         return self.parse()
 
+    @classmethod
+    def data_version(cls) -> str:
+        plan = numbering_plan()
+        return plan.digest if plan is not None else ''
+
+    @classmethod
+    def frame_hints(cls, df: pd.DataFrame) -> Dict[str, Tuple[str, int]]:
+        """
+        Delimiter and number of phones|pN columns of every multiple phones column over the whole frame
+        """
+        hints = {}
+        for phone in PhoneEnum:
+            if phone.value in df.columns and phone.value.startswith('phones'):
+                text = as_text(df[phone.value])
+                delimiter = cls.get_delimiter(text)
+                hints[phone.value] = (delimiter, int(text.str.split(delimiter, regex=False).str.len().max()) if len(text) else 0)
+        return hints
+
+    @classmethod
+    def chunk_hints(cls, df: pd.DataFrame) -> Dict[str, Tuple[Set[str], Dict[str, int]]]:
+        """
+        Delimiters found in every multiple phones column of the chunk, and its widest cell under every delimiter
+        """
+        hints = {}
+        for phone in PhoneEnum:
+            if phone.value in df.columns and phone.value.startswith('phones'):
+                text = as_text(df[phone.value])
+                hints[phone.value] = (
+                    {d for d in DELIMITERS if text.str.contains(d).any()},
+                    {d: int(text.str.split(d, regex=False).str.len().max()) if len(text) else 0
+                     for d in DELIMITERS + (DEFAULT_DELIMITER,)},
+                )
+        return hints
+
+    @classmethod
+    def merge_hints(cls, hints: List[Dict[str, Tuple[Set[str], Dict[str, int]]]]) -> Dict[str, Tuple[str, int]]:
+        """
+        frame_hints of the frame the chunks make up: the delimiter found in the whole column
+        and the widest cell under it, so every chunk gets the same phones|pN columns
+        """
+        found: Dict[str, Set[str]] = {}
+        widths: Dict[str, Dict[str, int]] = {}
+        for chunk in hints:
+            for column, (delimiters, chunk_widths) in chunk.items():
+                found.setdefault(column, set()).update(delimiters)
+                column_widths = widths.setdefault(column, {})
+                for delimiter, width in chunk_widths.items():
+                    column_widths[delimiter] = max(column_widths.get(delimiter, 0), width)
+        merged = {}
+        for column, delimiters in found.items():
+            delimiter = next((d for d in DELIMITERS if d in delimiters), DEFAULT_DELIMITER)
+            merged[column] = (delimiter, widths[column][delimiter])
+        return merged
+
+    @profiled
     def process_phones(self) -> pd.DataFrame:
         """
         POST BANK specific method
@@ -47,9 +119,10 @@ class PhoneParser(Decoder):
         self.columns: List[str] = self._find_columns()
         self.multiple_phones, self.single_phones = self._classify_columns()
 
+    @profiled
     def prepare(self) -> None:
         for column in self.columns:
-            self.df[column] = self.df[column].astype(str)
+            self.df[column] = as_text(self.df[column])
     
     def parse(self) -> pd.DataFrame:
         if self.multiple_phones:
@@ -59,35 +132,49 @@ class PhoneParser(Decoder):
         self.df = self._drop_nulls()
         return self.df
 
+    @profiled
     def _multiple_strategy(self) -> None:
         delimiters = self._delimiters()
         if delimiters:
             lg.info('Delimiters found.')
             for phones_column, delimiter in delimiters.items():
-                result = self.df[phones_column].apply(lambda row: self.split_phone_numbers(row, delimiter))
-                max_len = max(len(x) for x in result)
+                result = self.split_phone_column(self.df[phones_column], delimiter)
+                max_len = self.hints[phones_column][1] if phones_column in self.hints else len(result.columns)
+                result = result.reindex(columns=range(max_len))
+                # positions a row has no phone at are None, as split_phone_numbers row by row left them
+                result = result.astype(object).where(result.notna(), None)
                 for i in range(max_len):
-                    self.df[f'{phones_column}|p{i+1}'] = result.apply(lambda x: x[i] if i < len(x) else None)
+                    self.df[f'{phones_column}|p{i+1}'] = result[i]
         lg.info("Phones created.")
         self._single_after_multiple()
         lg.info("Phones submerged.")
 
+    @profiled
     def _single_strategy(self) -> None:
         for phone in self.single_phones:
-            self.df[phone] = self.df[phone].apply(self.find)
-            self.df[[f'{phone}_code', f'{phone}_body']] = self.df[phone].apply(
-                lambda row: pd.Series(self.format_phones(row))
-                )
+            self.df[phone] = self.normalizer.normalize(self.df[phone])
+            for suffix, values in self.describe(self.df[phone]).items():
+                self.df[f'{phone}{suffix}'] = values
 
+    @profiled
     def _single_after_multiple(self) -> None:
         new_cols = {}
         for col in self.df.columns:
-            if re.match(r"^phones_\d+|p\d+", col):
-                self.df[col] = self.df[col].apply(self.find)
-                new_cols[f'{col}_code'] = self.df[col].apply(lambda row: self.format_phones(row)[0])
-                new_cols[f'{col}_body'] = self.df[col].apply(lambda row: self.format_phones(row)[1])
+            if re.match(NORMALISED, col):
+                self.df[col] = self.normalizer.normalize(self.df[col])
+                new_cols.update({f'{col}{suffix}': values for suffix, values in self.describe(self.df[col]).items()})
         self.df = pd.concat([self.df, pd.DataFrame(new_cols)], axis=1)
             
+    def describe(self, column: pd.Series) -> Dict[str, pd.Series]:
+        '''
+        Columns derived from a column of E.164 phones by suffix: _code and _body,
+        _type, _operator and _region as well when there is a numbering plan (see numbering_plan)
+        '''
+        columns = dict(zip(('_code', '_body'), self.format_phone_column(column)))
+        if self.numbering is not None:
+            columns.update(zip(('_type', '_operator', '_region'), self.numbering.classify(column)))
+        return columns
+
     def _delimiters(self) -> Dict[str, str]:
         if self.multiple_phones is None:
             pass
@@ -95,6 +182,9 @@ class PhoneParser(Decoder):
             delimiter_stack: dict = {}
             for phone_column in self.multiple_phones:
                 if phone_column in self.df.columns:
+                    if phone_column in self.hints:
+                        delimiter_stack[phone_column] = self.hints[phone_column][0]
+                        continue
                     delimiter = self.get_delimiter(self.df[phone_column])
                     if delimiter:
                         delimiter_stack[phone_column] = delimiter
@@ -114,6 +204,7 @@ class PhoneParser(Decoder):
         single_phones: list = [col for col in columns if col.startswith('p') and len(col) == 2]
         return multiple_phones, single_phones
 
+    @profiled
     def _drop_nulls(self) -> pd.DataFrame:
         for col in self.df.columns:
             if col.startswith("phones_"):
@@ -159,16 +250,27 @@ class PhoneParser(Decoder):
 
     @staticmethod
     def get_delimiter(column: str) -> str:
-        for delimiter in [',', ';']:
+        for delimiter in DELIMITERS:
             if column.str.contains(delimiter).any():
                 return delimiter
-        return '\t'
+        return DEFAULT_DELIMITER
 
     @staticmethod
     def split_phone_numbers(row: str, delimiter: str) -> List[str]:
         splitted_numbers = row.split(delimiter)
         return [num.strip() for num in splitted_numbers]
     
+    @staticmethod
+    def split_phone_column(column: pd.Series, delimiter: str) -> pd.DataFrame:
+        '''split_phone_numbers over a whole column, one column per position'''
+        parts = pd.DataFrame(column.str.split(delimiter, regex=False).tolist(), index=column.index)
+        return parts.apply(lambda part: part.str.strip())
+
+    @staticmethod
+    def format_phone_column(column: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        '''format_phones over a whole column of E.164 phones: codes and bodies'''
+        return column.str.slice(2, 5), column.str.slice(5)
+
     @staticmethod
     def format_phones(row: str) -> tuple:
         match row:
@@ -2,20 +2,65 @@ import pandas as pd
 import numpy as np
 import logging as lg
 import re
+from typing import List
 
+from logics.functions.profiling import profiled
 from logics.interfaces.decoders import Decoder
 from logics.namespaces.namespace import Namespace, CARD_GROUP
 from logics.namespaces.enums import Register
+from logics.functions.std import Some
+
+PRODUCTS = {
+    'Автокредит': 'CAR',
+    'Целевой потребительский кредит': 'POS',
+    'Нецелевой потребительский кредит': 'CASH',
+    **{group: 'CARD' for group in CARD_GROUP},
+}
+PRODUCT_NAMES = {
+    'CARD': 'Карточные продукты',
+    'CAR': 'Автокредит',
+    'POS': 'Потребительский целевой кредит',
+    'CASH': 'Потребительский нецелевой кредит',
+}
+UNMAPPED = 'nan'
 
 class RegisterDecoder(Decoder):
-    def __init__(self, dataframe: pd.DataFrame) -> None:
+    reads = frozenset([
+        Register.CURRENCY.value, Register.CLIENT_ID.value, Register.CREDIT_ID.value, Register.OUTER_ID.value,
+        Register.PRODUCT_GROUP.value, Register.PLACEMENT.value,
+    ])
+    writes = frozenset([
+        Register.CURRENCY.value, Register.EXTENSION.value, Register.CLIENT_ID.value, Register.CREDIT_ID.value,
+        Register.OUTER_ID.value, Register.PRODUCT.value, Register.PRODUCT_NAME.value, Register.PLACEMENT.value,
+        Register.NAME.value, Register.DATE.value,
+    ])
+
+    def __init__(self, dataframe: pd.DataFrame, hints: Some[bool] = None) -> None:
         if dataframe is None:
             raise ValueError("Dataframe is null")
         self.df = dataframe
+        self.hints = hints
+
+    @classmethod
+    def frame_hints(cls, df: pd.DataFrame) -> Some[bool]:
+        """
+        Whether any row of the whole frame is in roubles
+        """
+        if Register.CURRENCY.value in df.columns:
+            return bool(df[Register.CURRENCY.value].isin(['RUB', 'RUR']).any())
+        return None
+
+    @classmethod
+    def merge_hints(cls, hints: List[Some[bool]]) -> Some[bool]:
+        '''Roubles in any chunk'''
+        if all(hint is None for hint in hints):
+            return None
+        return any(hints)
 
     def __str__(self):
         return "Register Decoder"
 
+    @profiled
     def decode(self) -> pd.DataFrame:
         try:
             self.df = self._currency()
@@ -23,10 +68,12 @@ class RegisterDecoder(Decoder):
             self.df = self._product_group()
             self.df = self._lifetimes()
         except Exception as ex:
+            self.failed = True
             lg.warning('Could not decode register information')
             lg.error(f'Traceback: {ex}')
         return self.df
 
+    @profiled
     def process_addresses(self) -> pd.DataFrame:
         """
         POST BANK specific method
@@ -44,10 +91,12 @@ class RegisterDecoder(Decoder):
         except KeyError:
             raise ValueError(f"Column [{Register.ADDRESS_TYPE.value}] not found in axis")
 
+    @profiled
     def _currency(self) -> pd.DataFrame: 
         if Register.CURRENCY.value in self.df.columns:
             lg.info('Mapping currency...')
-            if self.df[Register.CURRENCY.value].isin(['RUB', 'RUR']).any():
+            roubles = self.hints if self.hints is not None else self.df[Register.CURRENCY.value].isin(['RUB', 'RUR']).any()
+            if roubles:
                 self.df[Register.CURRENCY.value] = getattr(Namespace, 'currency')
             else:
                 self.df[Register.CURRENCY.value] = 'ERROR_CHECK_CURRENCY'
@@ -56,26 +105,26 @@ class RegisterDecoder(Decoder):
             self.df[Register.CURRENCY.value] = getattr(Namespace, 'currency')
         return self.df
 
+    @profiled
     def _concatenate_ids(self) -> pd.DataFrame:
         if Register.CLIENT_ID.value in self.df.columns and Register.CREDIT_ID.value in self.df.columns and Register.OUTER_ID.value in self.df.columns:
             lg.info('Found [client_id], [credit_id] and [outer_id] columns. concatenating results...')
-            self.df[Register.EXTENSION.value] = self.df.apply(self.concat_values, axis=1)
+            self.df[Register.EXTENSION.value] = self.concat_columns(
+                self.df[[Register.CLIENT_ID.value, Register.CREDIT_ID.value, Register.OUTER_ID.value]]
+            )
             self.df = self.df.drop([Register.CLIENT_ID.value, Register.CREDIT_ID.value, Register.OUTER_ID.value], axis=1)
         return self.df
 
+    @profiled
     def _product_group(self) -> pd.DataFrame:
         if Register.PRODUCT_GROUP.value in self.df.columns:
             lg.info('Found [product_group] column. mapping product...')
-            self.df[Register.PRODUCT.value] = np.where(self.df[Register.PRODUCT_GROUP.value].isin(CARD_GROUP), 'CARD',
-                            np.where(self.df[Register.PRODUCT_GROUP.value] == 'Автокредит', 'CAR',
-                            np.where(self.df[Register.PRODUCT_GROUP.value] == 'Целевой потребительский кредит', 'POS',
-                            np.where(self.df[Register.PRODUCT_GROUP.value] == 'Нецелевой потребительский кредит', 'CASH', np.nan))))
-            self.df[Register.PRODUCT_NAME.value] = np.where(self.df[Register.PRODUCT.value].isin(['CARD']), 'Карточные продукты',
-                            np.where(self.df[Register.PRODUCT.value] == 'CAR', 'Автокредит',
-                            np.where(self.df[Register.PRODUCT.value] == 'POS', 'Потребительский целевой кредит',
-                            np.where(self.df[Register.PRODUCT.value] == 'CASH', 'Потребительский нецелевой кредит', np.nan))))
+            # dict lookups instead of nested np.where, which built fixed-width unicode arrays of the whole column
+            self.df[Register.PRODUCT.value] = self.map_values(self.df[Register.PRODUCT_GROUP.value], PRODUCTS)
+            self.df[Register.PRODUCT_NAME.value] = self.map_values(self.df[Register.PRODUCT.value], PRODUCT_NAMES)
         return self.df
 
+    @profiled
     def _lifetimes(self) -> pd.DataFrame:
         lg.info('Setting lifetime attributes...')
         if Register.PLACEMENT.value in self.df.columns:
@@ -86,6 +135,17 @@ class RegisterDecoder(Decoder):
         self.df[Register.DATE.value] = getattr(Namespace, 'reg_date')
         return self.df
 
+    @staticmethod
+    def map_values(column: pd.Series, mapping: dict) -> list:
+        '''Mapped values of the column, unknown ones as the 'nan' string the np.where mapping produced'''
+        return [mapping.get(value, UNMAPPED) for value in column.to_numpy(dtype=object)]
+
+    @staticmethod
+    def concat_columns(df: pd.DataFrame) -> pd.Series:
+        '''Vectorised concat_values: values cast the way a row of df casts them (ints next to a float are floats), str-joined with |'''
+        text = pd.DataFrame(df.to_numpy(), index=df.index).astype(str)
+        return text[0].str.cat([text[i] for i in range(1, text.shape[1])], sep='|')
+
     @staticmethod
     def concat_values(row) -> str:
         '''Value concatenation for client'''
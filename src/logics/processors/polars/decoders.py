@@ -0,0 +1,531 @@
+import re
+import datetime
+import pandas as pd
+from typing import ClassVar, Dict, List, Type
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from logics.interfaces.decoders import Decoder
+from logics.namespaces.namespace import Namespace, REG_REG
+from logics.namespaces.enums import Person, NameVariants, Passport, PassportVariants, Debt, Register, PhoneEnum, PhoneType
+from logics.functions.frames import is_text
+from logics.processors.data.person import PersonDecoder, REG_COLUMNS, LIV_COLUMNS, NAME_SPLITS
+from logics.processors.data.dates import DateDecoder, DATE_COLUMNS, DATE_FORMAT
+from logics.processors.data.passport import PassportDecoder
+from logics.processors.data.debt import DebtDecoder
+from logics.processors.data.register import RegisterDecoder, PRODUCTS, PRODUCT_NAMES, UNMAPPED
+from logics.processors.data.phones import PhoneParser, NORMALISED, DELIMITERS, DEFAULT_DELIMITER
+from logics.processors.data.normalizer import PhoneNormalizer, SEPARATORS, FORMATTED, NATIONAL_DIGITS, EMPTY
+from logics.processors.data.numbering import numbering_plan, E164_RU, RANGE_DIGITS, MOBILE_CODE
+from logics.processors.data.dataframe import DataframeDecoder, NULL_LITERAL
+
+NAN_TEXT = 'nan'
+# str(float) and a Polars float -> String cast agree inside this range
+FLOAT_TEXT_RANGE = (1e-4, 1e16)
+# pd.Timestamp bounds, pd.to_datetime raises outside of them
+DATE_YEARS = (1678, 2261)
+DATE_PATTERN = r'^[0-9]{1,2}\.[0-9]{1,2}\.[0-9]{4}$'
+# normalizer.RU_SHAPES without the lookahead the Polars regex engine lacks, the 810 prefix is excluded apart
+RU_SHAPES = r'^(?:\+7[1-9][0-9]{9}|7[347-9][0-9]{9}|8[2-9][0-9]{9}|[3-9][0-9]{9})$'
+INTERNATIONAL_PREFIX = '810'
+# whitespace str.strip removes and Polars strip_chars keeps
+PYTHON_SPACES = r'[\x1c-\x1f]'
+# the values of a step kept in the query for the graph, see PolarsGraph._query
+STEP_COLUMN = '__step_{}__{}'
+NAMES = {
+    NameVariants.FIO.value: [Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value],
+    NameVariants.IFO.value: [Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value,
+                             Person.POSTFIX.value],
+}
+
+def strings(series: pd.Series) -> bool:
+    '''object column of python strings with NaN as the missing value'''
+    if series.dtype != object:
+        return False
+    return pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty') and not (series.values == None).any()
+
+def numbers(series: pd.Series) -> bool:
+    return series.dtype.kind in 'iuf'
+
+def textual(series: pd.Series) -> bool:
+    '''astype(str) of the column renders every value the way a Polars cast to String does'''
+    if strings(series) or series.dtype.kind in 'iu':
+        return True
+    if series.dtype.kind == 'f':
+        values = series.abs()
+        values = values[values.notna() & (values != 0)]
+        return bool(((values >= FLOAT_TEXT_RANGE[0]) & (values < FLOAT_TEXT_RANGE[1])).all())
+    return False
+
+def as_text(column: str) -> 'pl.Expr':
+    '''functions.frames.as_text: missing values become 'nan' '''
+    return pl.col(column).cast(pl.String).fill_null(NAN_TEXT)
+
+def foreign(text: 'pl.Expr') -> 'pl.Expr':
+    '''PassportDecoder.check_passport'''
+    return text.str.contains(r'^\p{L}') | (text.str.len_chars() >= 8)
+
+class PolarsDecoder:
+    """
+    Port of a pandas decoder to Polars expressions, planned as steps of one lazy query.
+    A port gives exactly what its decoder gives, so it only takes inputs it can reproduce:
+    supports() checks the dtypes on the pandas frame, valid() the values once the frame is in Polars.
+    Anything else (mixed object columns, None values, inputs the pandas decoder gives up on) stays with pandas.
+    """
+    decoder: ClassVar[Type[Decoder]]
+
+    def __init__(self, frame: 'pl.DataFrame') -> None:
+        self.frame = frame
+        self.written: List[str] = []
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        return True
+
+    def valid(self) -> bool:
+        return True
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        ...
+
+    @staticmethod
+    def columns(query: 'pl.LazyFrame') -> List[str]:
+        '''Columns of the frame being decoded, without the step columns'''
+        return [column for column in query.collect_schema().names() if not column.startswith(STEP_COLUMN.split('{')[0])]
+
+    def assign(self, query: 'pl.LazyFrame', columns: Dict[str, 'pl.Expr']) -> 'pl.LazyFrame':
+        self.written += [column for column in columns if column not in self.written]
+        return query.with_columns([expr.alias(column) for column, expr in columns.items()])
+
+class PolarsPersonDecoder(PolarsDecoder):
+    decoder = PersonDecoder
+
+    def __init__(self, frame: 'pl.DataFrame') -> None:
+        super().__init__(frame)
+        self.variant = next((variant for variant in NAMES if variant in frame.columns), None)
+        self.split = self.variant is not None and self._width() == len(NAMES[self.variant])
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        if Person.MAILS.value in df.columns:
+            return False
+        variants = [variant for variant in NAMES if variant in df.columns]
+        if len(variants) > 1:
+            return False
+        for variant in variants:
+            # the split appends its names, an existing one would be duplicated
+            if not strings(df[variant]) or df[variant].isna().all() or any(name in df.columns for name in NAMES[variant]):
+                return False
+        sex = df.get(Person.SEX.value)
+        if sex is not None and not (strings(sex) or numbers(sex)):
+            return False
+        for column in (Person.LASTNAME.value, Person.MAIL.value):
+            if column in df.columns and not strings(df[column]):
+                return False
+        position = df.get(Person.POSITION.value)
+        if position is not None and not (strings(position) or position.isna().all()):
+            return False
+        if all(column in df.columns for column in REG_COLUMNS + LIV_COLUMNS):
+            for block in (REG_COLUMNS, LIV_COLUMNS):
+                # join_columns casts the row block as a whole, numbers stay numbers only next to a text column
+                if not all(textual(df[column]) for column in block) or not any(df[column].dtype == object for column in block):
+                    return False
+        return True
+
+    def valid(self) -> bool:
+        if Person.SEX.value in self.frame.columns:
+            return True
+        # the sex is then read off last_name, which pandas cannot do on missing values
+        if self.split:
+            return self.frame[self.variant].null_count() == 0
+        if Person.LASTNAME.value in self.frame.columns:
+            return self.frame[Person.LASTNAME.value].null_count() == 0
+        return True
+
+    def _width(self) -> int:
+        '''columns of str.split(' ', n=N, expand=True)'''
+        n = NAME_SPLITS[self.variant]
+        return min(self.frame[self.variant].str.split(' ').list.len().max() or 0, n + 1)
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        columns = query.collect_schema().names()
+        if self.split:
+            parts = pl.col(self.variant).str.splitn(' ', NAME_SPLITS[self.variant] + 1)
+            query = self.assign(query, {
+                name: parts.struct.field(f'field_{i}') for i, name in enumerate(NAMES[self.variant])
+            })
+            columns = query.collect_schema().names()
+        if Person.SEX.value in columns:
+            sex = pl.col(Person.SEX.value)
+            female = sex.is_in(['Женский', 'Ж']) if self.frame.schema[Person.SEX.value] == pl.String else sex == 1
+            query = self.assign(query, {Person.SEX.value: pl.when(female).then(pl.lit('Ж')).otherwise(pl.lit('М'))})
+        elif Person.LASTNAME.value in columns:
+            last_name = pl.col(Person.LASTNAME.value)
+            male = last_name.str.ends_with('ич') | last_name.str.ends_with('ов') | last_name.str.ends_with('ин')
+            query = self.assign(query, {Person.SEX.value: pl.when(male).then(pl.lit('М')).otherwise(pl.lit('Ж'))})
+        if Person.POSITION.value in columns:
+            position = pl.col(Person.POSITION.value).cast(pl.String)
+            query = self.assign(query, {
+                Person.WORK.value: pl.when(position.is_null() | (position.str.strip_chars() == '')).then(pl.lit('ООО')).otherwise(position)
+            })
+        if Person.MAIL.value in columns:
+            mail = pl.col(Person.MAIL.value).cast(pl.String).str.to_lowercase()
+            query = self.assign(query, {
+                Person.MAIL.value: pl.when(mail.is_null() | mail.is_in(['не задано', 'null', ' null', NAN_TEXT])).then(pl.lit('')).otherwise(mail)
+            })
+        if all(column in columns for column in REG_COLUMNS + LIV_COLUMNS):
+            query = self.assign(query, {
+                Person.REG_ADDRESS.value: pl.concat_str([as_text(column) for column in REG_COLUMNS], separator=', '),
+                Person.HOME_ADDRESS.value: pl.concat_str([as_text(column) for column in LIV_COLUMNS], separator=', '),
+            }).drop(REG_COLUMNS + LIV_COLUMNS)
+            home = pl.col(Person.HOME_ADDRESS.value)
+            query = self.assign(query, {
+                Person.HOME_ADDRESS.value: pl.when(pl.col(Person.REG_ADDRESS.value) == home).then(pl.lit('')).otherwise(home)
+            })
+        return query
+
+class PolarsDateDecoder(PolarsDecoder):
+    decoder = DateDecoder
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        for column in DATE_COLUMNS:
+            if column in df.columns:
+                series = df[column]
+                if not (strings(series) or is_text(series) or series.dtype.kind == 'M' or series.isna().all()):
+                    return False
+        return True
+
+    def valid(self) -> bool:
+        # pandas stops at the first column that does not parse
+        for column in DATE_COLUMNS:
+            if column in self.frame.columns and self.frame.schema[column] == pl.String:
+                values = self.frame[column].drop_nulls()
+                if not values.str.contains(DATE_PATTERN).all():
+                    return False
+                dates = values.str.strptime(pl.Date, DATE_FORMAT, strict=False)
+                if dates.null_count() or not dates.dt.year().is_between(*DATE_YEARS).all():
+                    return False
+        return True
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        columns = {}
+        for column in DATE_COLUMNS:
+            if column not in self.frame.columns:
+                continue
+            dtype = self.frame.schema[column]
+            if dtype == pl.String:
+                columns[column] = pl.col(column).str.strptime(pl.Date, DATE_FORMAT)
+            elif dtype.is_temporal():
+                columns[column] = pl.col(column).dt.date()
+            else:
+                columns[column] = pl.lit(None, dtype=pl.Date)
+        return self.assign(query, columns)
+
+class PolarsPassportDecoder(PolarsDecoder):
+    decoder = PassportDecoder
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        if PassportVariants.DEFAULT.value in df.columns or PassportVariants.DIVISION.value in df.columns:
+            return False
+        columns = [PassportVariants.FULL.value, Passport.SERIES.value, Passport.NUMBER.value, Passport.ORGANIZATION.value]
+        return all(textual(df[column]) or is_text(df[column]) for column in columns if column in df.columns)
+
+    def valid(self) -> bool:
+        # check_passport indexes the first character, an empty passport aborts the pandas decoder
+        if PassportVariants.FULL.value in self.frame.columns:
+            _, number = self._split()
+            empty = self.frame.select((as_text(PassportVariants.FULL.value) == '').any() | (number == '').any()).item()
+        elif Passport.NUMBER.value in self.frame.columns:
+            empty = self.frame.select((as_text(Passport.NUMBER.value) == '').any()).item()
+        else:
+            return True
+        return not empty
+
+    @staticmethod
+    def _split() -> tuple:
+        '''PassportDecoder.split_passport_full: (series, number)'''
+        full = as_text(PassportVariants.FULL.value)
+        short = ~foreign(full) & (full.str.len_chars() <= 6)
+        padded = ~foreign(full) & (full.str.len_chars() < 10)
+        zeroes = full.str.pad_start(10, '0')
+        series = pl.when(short).then(pl.lit('')).when(padded).then(zeroes.str.slice(0, 4)).otherwise(full.str.slice(0, 4))
+        number = pl.when(short).then(full).when(padded).then(zeroes.str.slice(4)).otherwise(full.str.slice(4))
+        return series, number
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        if PassportVariants.FULL.value in self.frame.columns:
+            series, number = self._split()
+            query = self.assign(query, {Passport.SERIES.value: series, Passport.NUMBER.value: number})
+        columns = query.collect_schema().names()
+        if Passport.NUMBER.value in columns:
+            number = as_text(Passport.NUMBER.value)
+            query = self.assign(query, {
+                Passport.NUMBER.value: number,
+                Passport.TYPE.value: pl.when(foreign(number)).then(pl.lit('Паспорт ин. гос.')).otherwise(pl.lit('Паспорт РФ')),
+            })
+        if Passport.SERIES.value in columns:
+            text = as_text(Passport.SERIES.value)
+            text = pl.when(text.str.ends_with('.0')).then(text.str.replace_all('.0', '', literal=True)).otherwise(text)
+            text = pl.when(text == NAN_TEXT).then(pl.lit('')).otherwise(text)
+            zeroes = text.str.pad_start(4, '0')
+            series = (
+                pl.when((text == '') | ~text.str.contains(r'^\d+$') | (text.str.len_chars() > 4)).then(text)
+                .otherwise(pl.concat_str([zeroes.str.slice(0, 2), zeroes.str.slice(2)], separator=' '))
+            )
+            query = self.assign(query, {Passport.SERIES.value: series})
+            query = self.assign(query, {
+                Passport.REGION.value: pl.col(Passport.SERIES.value).str.slice(0, 2)
+                .replace_strict(REG_REG, default=pl.lit('UNKNOWN'), return_dtype=pl.String)
+            })
+        if Passport.NUMBER.value in columns:
+            query = self.assign(query, {Passport.NUMBER.value: as_text(Passport.NUMBER.value).str.pad_start(6, '0')})
+            if Passport.ORGANIZATION.value in columns:
+                organization = as_text(Passport.ORGANIZATION.value)
+                query = self.assign(query, {
+                    Passport.ORGANIZATION.value: pl.when(organization.is_in([' null', NAN_TEXT])).then(pl.lit(''))
+                    .otherwise(organization.str.replace_all('nan| null|None|NULL|Null', '', literal=True))
+                })
+        return query
+
+class PolarsDebtDecoder(PolarsDecoder):
+    decoder = DebtDecoder
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        return all(df[column].dtype.kind in 'if' for column in DebtDecoder.reads if column in df.columns)
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        columns = self.frame.columns
+        value = lambda debt: pl.col(debt.value) if debt.value in columns else pl.lit(0)
+        def total(*debts: Debt) -> 'pl.Expr':
+            # the same additions in the same order as pandas, missing columns are 0
+            if not any(debt.value in columns for debt in debts):
+                return pl.lit(0, dtype=pl.Int64)
+            expr = value(debts[0])
+            for debt in debts[1:]:
+                expr = expr + value(debt)
+            return expr
+        if Debt.FINAL_CURRENT.value in columns and Debt.FINAL_CURRENT_PERCENT.value in columns:
+            query = self.assign(query, {Debt.TOTAL_SUM.value: total(
+                Debt.FINAL_CURRENT, Debt.FINAL_CURRENT_PERCENT, Debt.OVERDUE, Debt.OVERDUE_PERCENT,
+                Debt.FINES, Debt.COMISSIONS, Debt.STATE_DUTY,
+            )})
+        elif not (Debt.CURRENT.value in columns and Debt.CURRENT_PERCENT.value in columns):
+            query = self.assign(query, {Debt.TOTAL_SUM.value: total(
+                Debt.OVERDUE, Debt.OVERDUE_PERCENT, Debt.COMISSIONS, Debt.FINES,
+            )})
+        else:
+            query = self.assign(query, {
+                Debt.CURRENT_CALCULATED.value: pl.col(Debt.CURRENT.value) - value(Debt.OVERDUE),
+                Debt.CURRENT_PERCENT_CALCULATED.value: pl.col(Debt.CURRENT_PERCENT.value) - value(Debt.OVERDUE_PERCENT),
+            })
+            query = self.assign(query, {Debt.TOTAL_SUM.value: (
+                pl.col(Debt.CURRENT_CALCULATED.value) + value(Debt.OVERDUE) + pl.col(Debt.CURRENT_PERCENT_CALCULATED.value)
+                + value(Debt.OVERDUE_PERCENT) + value(Debt.COMISSIONS) + value(Debt.FINES)
+            )})
+        if Debt.TOTAL.value in columns:
+            same = pl.col(Debt.TOTAL.value).cast(pl.Float64).round(0) == pl.col(Debt.TOTAL_SUM.value).cast(pl.Float64).round(0)
+            scheme = pl.when(same).then(pl.lit('FULL_COLLECT')).otherwise(pl.lit('BACK_TO_SCHEDULE'))
+        else:
+            scheme = pl.lit(None, dtype=pl.String)
+        return self.assign(query, {Register.COLLECT_SCHEME.value: scheme})
+
+class PolarsRegisterDecoder(PolarsDecoder):
+    decoder = RegisterDecoder
+    IDS = [Register.CLIENT_ID.value, Register.CREDIT_ID.value, Register.OUTER_ID.value]
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        if all(column in df.columns for column in cls.IDS):
+            # concat_columns is str() of every value, NaN and floats print differently in Polars
+            if not all((strings(df[column]) and df[column].notna().all()) or df[column].dtype.kind in 'iu' for column in cls.IDS):
+                return False
+        for column in (Register.CURRENCY.value, Register.PRODUCT_GROUP.value):
+            series = df.get(column)
+            if series is not None and not (strings(series) or is_text(series) or numbers(series) or series.isna().all()
+                                           or isinstance(series.dtype, pd.CategoricalDtype)):
+                return False
+        # extract_int gives up on anything but strings
+        placement = df.get(Register.PLACEMENT.value)
+        if placement is not None and not (strings(placement) and placement.notna().all()):
+            return False
+        reg_date = getattr(Namespace, 'reg_date')
+        return type(reg_date) in (datetime.date, str)
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        columns = self.frame.columns
+        if Register.CURRENCY.value in columns:
+            roubles = pl.col(Register.CURRENCY.value).cast(pl.String).is_in(['RUB', 'RUR']).any()
+            currency = pl.when(roubles).then(pl.lit(getattr(Namespace, 'currency'))).otherwise(pl.lit('ERROR_CHECK_CURRENCY'))
+        else:
+            currency = pl.lit(getattr(Namespace, 'currency'))
+        query = self.assign(query, {Register.CURRENCY.value: currency})
+        if all(column in columns for column in self.IDS):
+            query = self.assign(query, {
+                Register.EXTENSION.value: pl.concat_str([pl.col(column).cast(pl.String) for column in self.IDS], separator='|')
+            }).drop(self.IDS)
+        if Register.PRODUCT_GROUP.value in columns:
+            query = self.assign(query, {
+                Register.PRODUCT.value: self.map_values(Register.PRODUCT_GROUP.value, PRODUCTS),
+            })
+            query = self.assign(query, {
+                Register.PRODUCT_NAME.value: self.map_values(Register.PRODUCT.value, PRODUCT_NAMES),
+            })
+        if Register.PLACEMENT.value in columns:
+            placement = pl.col(Register.PLACEMENT.value).str.extract(r'\d+', 0).cast(pl.Int64).fill_null(0)
+        else:
+            placement = pl.lit(1, dtype=pl.Int64)
+        return self.assign(query, {
+            Register.PLACEMENT.value: placement,
+            Register.NAME.value: pl.lit(getattr(Namespace, 'reg_name')),
+            Register.DATE.value: pl.lit(getattr(Namespace, 'reg_date')),
+        })
+
+    @staticmethod
+    def map_values(column: str, mapping: dict) -> 'pl.Expr':
+        '''RegisterDecoder.map_values'''
+        return pl.col(column).cast(pl.String).replace_strict(mapping, default=pl.lit(UNMAPPED), return_dtype=pl.String).fill_null(UNMAPPED)
+
+class PolarsPhoneParser(PolarsDecoder):
+    decoder = PhoneParser
+
+    def __init__(self, frame: 'pl.DataFrame') -> None:
+        super().__init__(frame)
+        # PhoneParser._find_columns and _classify_columns
+        self.found = [phone.value for phone in PhoneEnum if phone.value in frame.columns]
+        self.multiple = [column for column in self.found if column.startswith('phones')]
+        self.single = [column for column in self.found if column.startswith('p') and len(column) == 2]
+        self.normalizer = PhoneNormalizer(PhoneParser.find)
+        self.numbering = numbering_plan()
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        for column in PhoneParser.reads:
+            if column in df.columns:
+                series = df[column]
+                # as_text keeps typed strings typed, phones is the one column that is not normalised afterwards
+                if not (textual(series) or (is_text(series) and column != PhoneEnum.PHONES.value)):
+                    return False
+        return True
+
+    def valid(self) -> bool:
+        if self.numbering is not None and not len(self.numbering):
+            return False
+        return not any(self.frame.select(as_text(column).str.contains(PYTHON_SPACES).any()).item() for column in self.multiple)
+
+    def _split(self, column: str) -> Dict[str, 'pl.Expr']:
+        '''PhoneParser.split_phone_column with the delimiter and width over the whole frame'''
+        text = self.frame.select(as_text(column)).to_series()
+        delimiter = next((d for d in DELIMITERS if text.str.contains(d, literal=True).any()), DEFAULT_DELIMITER)
+        width = text.str.split(delimiter).list.len().max() or 0
+        parts = as_text(column).str.split(delimiter)
+        return {f'{column}|p{i + 1}': parts.list.get(i, null_on_oob=True).str.strip_chars() for i in range(width)}
+
+    def normalized(self, column: str) -> 'pl.Expr':
+        '''PhoneNormalizer.normalize, the residue resolved in one batch through the phone cache'''
+        # astype(str): the missing positions of a split are 'None'
+        original = pl.col(column).fill_null('None')
+        text = pl.when(original.str.ends_with('.0')).then(original.str.replace_all('.0', '', literal=True)).otherwise(original)
+        formatted = text.str.contains(f'^(?:{FORMATTED})$')
+        digits = pl.when(formatted).then(text.str.replace_all(SEPARATORS, '')).otherwise(text)
+        shaped = formatted & digits.str.contains(RU_SHAPES) & ~digits.str.starts_with(INTERNATIONAL_PREFIX)
+        empty = text.is_in(EMPTY)
+        residue = pl.when(~(shaped | empty)).then(original).map_batches(self._resolve, return_dtype=pl.String)
+        return (
+            pl.when(shaped).then(pl.lit('+7') + digits.str.slice(-NATIONAL_DIGITS))
+            .when(empty).then(pl.lit(''))
+            .otherwise(residue)
+        )
+
+    def _resolve(self, values: 'pl.Series') -> 'pl.Series':
+        resolved = self.normalizer.resolve(values.drop_nulls().unique().to_list())
+        return values.replace_strict(resolved, default=None, return_dtype=pl.String)
+
+    def describe(self, column: str) -> Dict[str, 'pl.Expr']:
+        '''PhoneParser.describe'''
+        phone = pl.col(column)
+        columns = {'_code': phone.str.slice(2, 3), '_body': phone.str.slice(5)}
+        if self.numbering is not None:
+            columns.update(zip(('_type', '_operator', '_region'), self._classify(phone)))
+        return columns
+
+    def _classify(self, phone: 'pl.Expr') -> tuple:
+        '''NumberingPlan.classify'''
+        plan = self.numbering
+        valid = phone.str.contains(f'^{E164_RU}$')
+        national = pl.when(valid).then(phone.str.slice(2).cast(pl.Int64)).otherwise(pl.lit(0, dtype=pl.Int64))
+        position = pl.lit(pl.Series(plan.starts)).search_sorted(national, side='right').cast(pl.Int64) - 1
+        index = position.clip(lower_bound=0)
+        found = valid & (position >= 0) & (national <= pl.lit(pl.Series(plan.ends)).gather(index))
+        mobile = national // 10 ** RANGE_DIGITS // 100 == MOBILE_CODE
+        names = lambda names, indices: pl.lit(pl.Series(names[indices], dtype=pl.String)).gather(index)
+        return (
+            pl.when(found).then(pl.when(mobile).then(pl.lit(PhoneType.MOBILE.value)).otherwise(pl.lit(PhoneType.LANDLINE.value)))
+            .otherwise(pl.lit('')),
+            pl.when(found).then(names(plan.operator_names, plan.operators)).otherwise(pl.lit('')),
+            pl.when(found).then(names(plan.region_names, plan.regions)).otherwise(pl.lit('')),
+        )
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        query = self.assign(query, {column: as_text(column) for column in self.found})
+        if self.multiple:
+            for column in self.multiple:
+                query = self.assign(query, self._split(column))
+            normalised = [column for column in self.columns(query) if column in self.written and re.match(NORMALISED, column)]
+            query = self.assign(query, {column: self.normalized(column) for column in normalised})
+            query = self.assign(query, {
+                f'{column}{suffix}': expr for column in normalised for suffix, expr in self.describe(column).items()
+            })
+        if self.single:
+            query = self.assign(query, {column: self.normalized(column) for column in self.single})
+            query = self.assign(query, {
+                f'{column}{suffix}': expr for column in self.single for suffix, expr in self.describe(column).items()
+            })
+        # PhoneParser._drop_nulls
+        columns = [column for column in self.columns(query) if column.startswith('phones_') and column in self.written]
+        return self.assign(query, {
+            column: pl.when(pl.col(column).is_null() | pl.col(column).is_in([NAN_TEXT, 'Нет'])).then(pl.lit('')).otherwise(pl.col(column))
+            for column in columns
+        })
+
+class PolarsDataframeDecoder(PolarsDecoder):
+    decoder = DataframeDecoder
+
+    @classmethod
+    def supports(cls, df: pd.DataFrame) -> bool:
+        # text columns come back as object columns, typed strings and categories would lose their dtype
+        return all(
+            strings(df[column]) or df[column].dtype.kind in 'iufb' or (column in DATE_COLUMNS and df[column].dtype.kind == 'M')
+            for column in df.columns
+        )
+
+    def valid(self) -> bool:
+        # a missing date stays a missing date in Polars, pandas fills it with ''
+        return all(self.frame[column].null_count() == 0 for column in DATE_COLUMNS if column in self.frame.columns)
+
+    def plan(self, query: 'pl.LazyFrame') -> 'pl.LazyFrame':
+        query = query.drop([column for column in self.columns(query) if column.startswith('Unnamed')])
+        schema = query.collect_schema()
+        columns = {}
+        for column in self.columns(query):
+            dtype = schema[column]
+            if dtype == pl.String:
+                text = pl.col(column)
+                columns[column] = pl.when(text == NULL_LITERAL).then(pl.lit('')).otherwise(text).fill_null('')
+            elif dtype.is_float():
+                columns[column] = pl.col(column).fill_nan(0).fill_null(0)
+            elif dtype.is_numeric():
+                columns[column] = pl.col(column).fill_null(0)
+        return self.assign(query, columns)
+
+PORTS: Dict[Type[Decoder], Type[PolarsDecoder]] = {
+    port.decoder: port for port in (
+        PolarsPersonDecoder, PolarsDateDecoder, PolarsPhoneParser, PolarsPassportDecoder, PolarsDebtDecoder,
+        PolarsRegisterDecoder, PolarsDataframeDecoder,
+    )
+}
@@ -0,0 +1,130 @@
+import pandas as pd
+import logging as lg
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Set, Tuple, Type
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from logics.interfaces.decoders import Decoder
+from logics.processors.core.graph import DecoderGraph
+from logics.processors.polars.decoders import PolarsDecoder, PORTS, STEP_COLUMN
+from logics.functions.profiling import profiled
+from logics.functions.std import Some
+from logics.processors.core.checkpoint import Checkpoint
+
+@dataclass
+class QueryResult:
+    """
+    Columns of one ported decoder as they stood right after its step of the query
+    """
+    columns: FrozenSet[str]
+    dropped: List[str]
+    added: List[str]
+    values: Dict[str, pd.Series]
+
+    def decoded(self, df: pd.DataFrame) -> Tuple[List[str], pd.DataFrame, bool]:
+        '''What DecoderGraph._decode returns for the decoder'''
+        columns = [column for column in df.columns if column in self.columns]
+        kept = [self.values.get(column, df[column]) for column in columns if column not in self.dropped]
+        series = kept + [self.values[column] for column in self.added]
+        result = pd.concat(series, axis=1) if series else pd.DataFrame(index=df.index)
+        return columns, result, False
+
+class PolarsGraph(DecoderGraph):
+    """
+    DecoderGraph with the decoders that have a Polars port (processors.polars.decoders) run as one lazy query.
+    The ports are planned in chain order over the input frame and collected once before the levels run,
+    each ported decoder then takes its columns from the query result instead of decoding with pandas.
+    Decoders without a port, or whose input their port does not support, run with pandas as before,
+    and so does any port that depends on one of them (an earlier decoder sharing a written column).
+    Frame-level hints are pandas decisions for row partitions, a run given hints is left to pandas entirely.
+    """
+    def __init__(self, decoders: List[Type[Decoder]], workers: int | None = None,
+                 ports: Dict[Type[Decoder], Type[PolarsDecoder]] = PORTS):
+        super().__init__(decoders, workers)
+        self.ports = ports
+
+    def classes(self) -> List[type]:
+        return [*super().classes(), *self.ports.values()]
+
+    def _run(self, df: pd.DataFrame, hints: Dict[Type[Decoder], Any],
+             checkpoint: Some[Checkpoint] = None) -> Tuple[pd.DataFrame, List[str]]:
+        if pl is not None and not hints and len(df) and df.columns.is_unique \
+                and all(isinstance(column, str) for column in df.columns):
+            active = [decoder for decoder in self.decoders if not self.skipped(decoder, df)]
+            ported = self._depending(active, {
+                decoder for decoder in active if decoder in self.ports and self.ports[decoder].supports(df)
+            })
+            if ported:
+                try:
+                    hints = self._query(df, active, ported)
+                except pl.exceptions.PolarsError as ex:
+                    lg.warning(f"Polars query failed, decoding with pandas: {ex}")
+        return super()._run(df, hints, checkpoint)
+
+    def _decode(self, decoder: Type[Decoder], df: pd.DataFrame, hints: Any = None) -> Tuple[List[str], pd.DataFrame, bool]:
+        if isinstance(hints, QueryResult):
+            lg.debug(f"_Call_::{decoder.__name__}::polars")
+            return hints.decoded(df)
+        return super()._decode(decoder, df, hints)
+
+    def _depending(self, active: List[Type[Decoder]], ported: Set[Type[Decoder]]) -> Set[Type[Decoder]]:
+        """
+        Ported decoders that do not depend on a pandas one: the query runs on the input frame,
+        so a port may only follow decoders that are in the query too
+        """
+        ported = set(ported)
+        for i, decoder in enumerate(active):
+            if decoder in ported and any(
+                earlier not in ported and self.conflicts(earlier, decoder) for earlier in active[:i]
+            ):
+                ported.discard(decoder)
+        return ported
+
+    @profiled
+    def _query(self, df: pd.DataFrame, active: List[Type[Decoder]],
+               ported: Set[Type[Decoder]]) -> Dict[Type[Decoder], QueryResult]:
+        if any(self.full_frame(decoder) for decoder in ported):
+            columns = list(df.columns)
+        else:
+            columns = [column for column in df.columns if any(column in d.reads or column in d.writes for d in ported)]
+        frame = pl.from_pandas(df[columns])
+        ports = {decoder: self.ports[decoder](frame) for decoder in ported}
+        ported = self._depending(active, {decoder for decoder, port in ports.items() if port.valid()})
+        steps = []
+        query = frame.lazy()
+        for i, decoder in enumerate(decoder for decoder in active if decoder in ported):
+            before = PolarsDecoder.columns(query)
+            query = ports[decoder].plan(query)
+            after = PolarsDecoder.columns(query)
+            added = [column for column in after if column not in before]
+            written = [column for column in after if column in ports[decoder].written or column in added]
+            # intermediate values are kept under step columns, a later port may overwrite or drop them
+            query = query.with_columns([pl.col(column).alias(STEP_COLUMN.format(i, column)) for column in written])
+            # a full frame decoder reads every column there is at its step
+            read = frozenset(before) if self.full_frame(decoder) else decoder.reads | decoder.writes
+            steps.append((decoder, i, read, [column for column in before if column not in after], added, written))
+        if not steps:
+            return {}
+        lg.info(f"Polars query: {[decoder.__name__ for decoder, *_ in steps]}")
+        result = query.select([
+            STEP_COLUMN.format(i, column) for _, i, _, _, _, written in steps for column in written
+        ]).collect()
+        return {
+            decoder: QueryResult(
+                read, dropped, added,
+                {column: self.to_pandas(result[STEP_COLUMN.format(i, column)], column, df.index) for column in written},
+            )
+            for decoder, i, read, dropped, added, written in steps
+        }
+
+    @staticmethod
+    def to_pandas(series: 'pl.Series', name: str, index: pd.Index) -> pd.Series:
+        '''Dates come back the way pandas decoders leave them, as datetime.date objects'''
+        values = series.to_pandas()
+        if series.dtype == pl.Date:
+            values = values.dt.date
+        return values.set_axis(index).rename(name)
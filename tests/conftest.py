@@ -0,0 +1,84 @@
+import os
+import sys
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the package is imported from src, as main.py runs it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from logics.benchmarks.synthetic import make_register
+
+ROWS = 400
+FRAMES = ['register', 'unnamed', 'wide', 'no-phones', 'bare', 'late', 'failing', 'single', 'multiple', 'numbers', 'typed']
+PHONES = [
+    '+7 (912) 345-67-89', '89123456789', '79123456789.0', '9123456789', '8101234567', '+442079460958',
+    'Нет', '', 'nan', 'тел 8(495)123-45-67 доб', '+70123456789', '8-800-555-35-35', '12345', ' 89123456789 ',
+]
+
+def pick(rng: np.random.Generator, values: list, rows: int) -> pd.Series:
+    return pd.Series(np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)])
+
+def phones(rng: np.random.Generator, rows: int, delimiter: str) -> pd.Series:
+    parts = [pick(rng, PHONES, rows) for _ in range(3)]
+    widths = rng.integers(1, 4, rows)
+    return pd.Series([delimiter.join(part[i] for part in parts[:widths[i]]) for i in range(rows)], dtype=object)
+
+@pytest.fixture(scope='session')
+def frames() -> Dict[str, pd.DataFrame]:
+    """
+    Registers the decoder, graph, partition and backend tests run on, built once per session.
+    Tests must not modify them, the frame fixture hands out copies.
+    """
+    rng = np.random.default_rng(7)
+    base = make_register(ROWS, 3)
+    unnamed = base.copy()
+    unnamed['Unnamed: 5'] = 'x'
+    unnamed['amount'] = np.where(np.arange(ROWS) % 4 == 0, np.nan, 1.5)
+    wide = base.copy()
+    wide['passport_full'] = wide['passport_series'].astype(str) + wide['passport_num'].astype(str).str.zfill(6)
+    wide = wide.drop(columns=['passport_series', 'passport_num'])
+    wide['mails'] = 'a@b.ru, c@d.ru'
+    for block in ('reg', 'liv'):
+        for prefix, value in zip(['rg', 'np', 'st', 'hs', 'cp', 'ft'], ['МО', 'Химки', 'Ленина', '1', '2', '3']):
+            wide[f'{prefix}_{block}'] = value
+    wide['passport_date'] = '01.02.2010'
+    wide['sex'] = np.where(np.arange(ROWS) % 2, 'Женский', 'М')
+    wide['placement'] = 'Размещение 3'
+    wide['fcd'], wide['fcp'], wide['Unnamed: 3'] = 1.0, 2.0, 1
+    # frame-wide decisions that only the last partition would take on its own
+    late = base.copy()
+    late['phones'] = late['phones'].str.replace(', ', ' ')
+    late.loc[ROWS - 5:, 'phones'] = '89161234567; 89031234567; 84951234567'
+    late['fio_full'] = 'Иванов Иван'
+    late.loc[ROWS - 3:, 'fio_full'] = 'Иванов Иван Иванович Оглы'
+    late['currency'] = 'USD'
+    late.loc[ROWS - 1, 'currency'] = 'RUR'
+    late['product_group'] = pd.Categorical(late['product_group'])
+    late.loc[ROWS - 2, 'product_group'] = np.nan
+    late['passport_date'] = '01.02.2010'
+    late.loc[ROWS - 4, 'passport_date'] = 'bad'
+    # the passport decoder gives up on the whole frame
+    failing = base.copy()
+    failing['passport_full'] = failing['passport_series'].astype(str) + failing['passport_num'].astype(str).str.zfill(6)
+    failing.loc[ROWS - 7, 'passport_full'] = np.nan
+    return {
+        'register': base,
+        'unnamed': unnamed,
+        'wide': wide,
+        'no-phones': base.drop(columns=['phones', 'p1']),
+        'bare': base[['credit_num']].copy(),
+        'late': late,
+        'failing': failing.drop(columns=['passport_series', 'passport_num']),
+        'single': pd.DataFrame({'p1': pick(rng, PHONES, ROWS), 'p2': pick(rng, PHONES + [np.nan], ROWS), 'p10': pick(rng, PHONES, ROWS)}),
+        'multiple': pd.DataFrame({'p2': pick(rng, PHONES, ROWS), 'phones_2': phones(rng, ROWS, '; '), 'phones': phones(rng, ROWS, ',')}),
+        'numbers': pd.DataFrame({'p1': rng.choice([89123456789.0, 4951234567.0, np.nan], ROWS), 'p2': rng.integers(10**9, 10**10, ROWS)}),
+        'typed': pd.DataFrame({'p1': pd.Series(pick(rng, PHONES + [np.nan], ROWS), dtype='string'),
+                               'phones_3': pd.Series(phones(rng, ROWS, ';'), dtype='string')}),
+    }
+
+@pytest.fixture(params=FRAMES)
+def frame(request, frames) -> pd.DataFrame:
+    return frames[request.param].copy()
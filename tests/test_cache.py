@@ -0,0 +1,83 @@
+import os
+
+import pandas as pd
+import pytest
+
+from logics.processors.core.cache import SheetCache, MANIFEST
+from logics.processors.core.readers import FileReader
+from logics.benchmarks.synthetic import make_register, make_post_register, write_workbook
+
+@pytest.fixture
+def workbook(tmp_path) -> str:
+    return write_workbook(str(tmp_path / 'reg.xlsx'), make_post_register(30, 1))
+
+@pytest.fixture
+def cache(tmp_path) -> SheetCache:
+    return SheetCache(str(tmp_path / 'cache'))
+
+def parses(monkeypatch) -> list:
+    '''Files FileReader parsed instead of loading from the cache'''
+    parsed = []
+    parse = FileReader._parse_excel_file
+    def counted(self, file_path):
+        parsed.append(file_path)
+        return parse(self, file_path)
+    monkeypatch.setattr(FileReader, '_parse_excel_file', counted)
+    return parsed
+
+def test_cached_read_matches_parsed_read(workbook, cache, tmp_path, monkeypatch):
+    parsed = parses(monkeypatch)
+    reader = FileReader(str(tmp_path), 'reg', '.xlsx', cache=cache)
+    first = reader.read_file()
+    second = reader.read_file()
+    assert len(parsed) == 1
+    assert list(second) == list(first) and len(first) == 3
+    uncached = FileReader(str(tmp_path), 'reg', '.xlsx').read_file()
+    for sheet in first:
+        pd.testing.assert_frame_equal(second[sheet], first[sheet])
+        pd.testing.assert_frame_equal(second[sheet], uncached[sheet])
+
+def test_changed_file_is_parsed_again(workbook, cache, tmp_path, monkeypatch):
+    parsed = parses(monkeypatch)
+    reader = FileReader(str(tmp_path), 'reg', '.xlsx', cache=cache)
+    reader.read_file()
+    write_workbook(workbook, {'default': make_register(20, 3)})
+    changed = reader.read_file()
+    assert len(parsed) == 2
+    assert list(changed) == ['default'] and len(changed['default']) == 20
+
+def test_invalidate_drops_every_variant(workbook, cache, tmp_path, monkeypatch):
+    parsed = parses(monkeypatch)
+    sheets = FileReader(str(tmp_path), 'reg', '.xlsx', cache=cache).read_file()
+    cache.write(workbook, sheets, variant='projected')
+    assert cache.read(workbook, 'projected') is not None
+    cache.invalidate(workbook)
+    assert cache.read(workbook) is None and cache.read(workbook, 'projected') is None
+    FileReader(str(tmp_path), 'reg', '.xlsx', cache=cache).read_file()
+    assert len(parsed) == 2
+
+def test_unreadable_entry_is_dropped(workbook, cache):
+    cache.write(workbook, {'default': make_register(5, 1)})
+    entry = os.path.join(cache.get_cache_path, cache.file_hash(workbook))
+    for file in os.listdir(entry):
+        if file != MANIFEST:
+            os.remove(os.path.join(entry, file))
+    assert cache.read(workbook) is None
+    assert not os.path.exists(entry)
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    files = []
+    for i in range(3):
+        files.append(str(tmp_path / f'{i}.csv'))
+        make_register(10, i).to_csv(files[-1], index=False)
+    cache = SheetCache(str(tmp_path / 'cache'))
+    for i, file in enumerate(files):
+        cache.write(file, {'default': make_register(200, i)})
+        manifest = os.path.join(cache.get_cache_path, cache.file_hash(file), MANIFEST)
+        os.utime(manifest, (i, i))
+    cache.read(files[0])
+    kept = sum(SheetCache._size(os.path.join(cache.get_cache_path, cache.file_hash(file))) for file in files[::2])
+    cache = SheetCache(cache.get_cache_path, max_bytes=kept)
+    cache.evict()
+    assert cache.read(files[1]) is None
+    assert cache.read(files[0]) is not None and cache.read(files[2]) is not None
@@ -0,0 +1,37 @@
+import logging
+import pandas as pd
+import pytest
+
+from logics.processors.core.data import DataProcessor
+from logics.processors.core.checkpoint import Checkpoint
+from logics.benchmarks.synthetic import make_register
+
+DECODERS = DataProcessor().decoders
+
+@pytest.fixture(scope='module')
+def register() -> pd.DataFrame:
+    return make_register(200, 2)
+
+@pytest.mark.parametrize('victim', DECODERS, ids=[decoder.__name__ for decoder in DECODERS])
+def test_resume_after_decoder_raised(victim, register, tmp_path, monkeypatch, caplog):
+    expected = DataProcessor().process_data(register.copy())
+    def boom(self):
+        raise RuntimeError('boom')
+    with monkeypatch.context() as patch:
+        patch.setattr(victim, 'decode', boom)
+        with pytest.raises(RuntimeError):
+            DataProcessor(checkpoint=Checkpoint('reg', str(tmp_path))).process_data(register.copy())
+    with caplog.at_level(logging.INFO):
+        resumed = DataProcessor(checkpoint=Checkpoint('reg', str(tmp_path))).process_data(register.copy())
+    done = DECODERS[:DECODERS.index(victim)]
+    if done:
+        assert 'Resuming from checkpoint' in caplog.text
+    pd.testing.assert_frame_equal(resumed, expected)
+
+def test_other_register_starts_over(register, tmp_path, caplog):
+    DataProcessor(checkpoint=Checkpoint('reg', str(tmp_path))).process_data(register.copy())
+    other = register.iloc[::-1]
+    with caplog.at_level(logging.INFO):
+        decoded = DataProcessor(checkpoint=Checkpoint('reg', str(tmp_path))).process_data(other.copy())
+    assert 'belongs to another run, starting over' in caplog.text
+    pd.testing.assert_frame_equal(decoded, DataProcessor().process_data(other.copy()))
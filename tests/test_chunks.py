@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from logics.processors.core.data import DataProcessor
+from logics.processors.core.readers import FileReader
+from logics.processors.core.writers import DataWriter
+from logics.interfaces.paths import Extension
+from logics.benchmarks.synthetic import make_register
+
+ROWS = 100
+CHUNK = 30
+
+@pytest.fixture
+def register() -> pd.DataFrame:
+    df = make_register(ROWS, 1)
+    # decisions only the rows of the last chunk take: roubles, a wider name, more phones, a bad date
+    df['currency'] = 'USD'
+    df.loc[ROWS - 5, 'currency'] = 'RUR'
+    df.loc[ROWS - 3, 'fio_full'] = df.loc[ROWS - 3, 'fio_full'] + ' Оглы'
+    df.loc[ROWS - 2, 'phones'] = '89161234567; 89031234567; 84951234567'
+    df['passport_date'] = '01.02.2010'
+    df.loc[ROWS - 4, 'passport_date'] = 'bad'
+    return df
+
+def chunks(df: pd.DataFrame):
+    return (('default', df.iloc[start:start + CHUNK]) for start in range(0, len(df), CHUNK))
+
+def test_chunks_decode_like_the_whole_frame(register):
+    processor = DataProcessor()
+    decoded = list(processor.process_data(chunks(register), processor.chunk_hints(chunks(register))))
+    assert len({tuple(chunk.columns) for _, chunk in decoded}) == 1
+    pd.testing.assert_frame_equal(pd.concat([chunk for _, chunk in decoded]), processor.process_data(register.copy()))
+
+def test_streamed_file_decodes_like_the_whole_file(register, tmp_path):
+    register.to_csv(tmp_path / 'reg.csv', index=False)
+    reader = FileReader(str(tmp_path), 'reg', '.csv')
+    processor = DataProcessor()
+    hints = processor.chunk_hints(reader.read_chunks(CHUNK))
+    streamed = pd.concat([chunk for _, chunk in processor.process_data(reader.read_chunks(CHUNK), hints)])
+    pd.testing.assert_frame_equal(streamed, processor.process_data(reader.read_file()))
+
+def test_chunks_need_hints(register):
+    with pytest.raises(ValueError):
+        DataProcessor().process_data(chunks(register))
+    with pytest.raises(ValueError):
+        list(DataProcessor().process_data(chunks(register), {'other': {}}))
+
+def test_writer_refuses_chunks_with_other_columns(tmp_path):
+    first = pd.DataFrame({'a': [1], 'b': [2]})
+    reordered = pd.DataFrame({'b': [4], 'a': [3]})
+    DataWriter(str(tmp_path)).save_file(iter([first, reordered]), Extension.CSV, 'same')
+    assert pd.read_csv(tmp_path / 'same.csv').to_dict('list') == {'a': [1, 3], 'b': [2, 4]}
+    with pytest.raises(ValueError, match='extra'):
+        DataWriter(str(tmp_path)).save_file(iter([first, pd.DataFrame({'a': [1], 'b': [2], 'c': [3]})]), Extension.CSV, 'other')
@@ -0,0 +1,38 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+
+from logics.processors.core.database import DatabaseSink, TABLE
+from logics.processors.data.dataframe import DataframeDecoder
+
+@pytest.fixture
+def database(tmp_path) -> str:
+    return str(tmp_path / 'registers.db')
+
+def stored(database: str) -> pd.DataFrame:
+    with sqlite3.connect(database) as connection:
+        return pd.read_sql(f'SELECT credit_num, extend, total_debt FROM {TABLE} ORDER BY rowid', connection)
+
+def test_keyed_rows_are_upserted(database):
+    sink = DatabaseSink.sqlite(database)
+    assert sink.load([pd.DataFrame({'credit_num': ['CR1', 'CR2'], 'extend': ['1|2|3', '4|5|6'], 'total_debt': [1.0, 2.0]})]) == 2
+    assert sink.load([pd.DataFrame({'credit_num': ['CR1'], 'extend': ['1|2|3'], 'total_debt': [10.0]})]) == 1
+    assert stored(database).values.tolist() == [['CR1', '1|2|3', 10.0], ['CR2', '4|5|6', 2.0]]
+
+def test_keyless_rows_are_inserted(database):
+    # the sink gets DataframeDecoder output, where a missing key is already ''
+    decoded = DataframeDecoder(pd.DataFrame({
+        'credit_num': ['CR1', np.nan, 'CR3', ' '], 'extend': [np.nan, '4|5|6', np.nan, '7|8|9'], 'total_debt': [1.0, 2.0, 3.0, 4.0],
+    })).decode()
+    keyed, keyless = DatabaseSink.keyed(decoded)
+    assert keyed.empty and len(keyless) == 4
+    assert DatabaseSink.sqlite(database).load([decoded]) == 4
+    assert stored(database)['total_debt'].tolist() == [1.0, 2.0, 3.0, 4.0]
+
+def test_keyless_rows_do_not_collapse(database):
+    sink = DatabaseSink.sqlite(database)
+    keyless = pd.DataFrame({'credit_num': ['', '', ''], 'extend': ['', '', ''], 'total_debt': [1.0, 2.0, 3.0]})
+    assert sink.load([keyless]) == 3
+    assert sink.load([keyless]) == 3
+    assert len(stored(database)) == 6
@@ -0,0 +1,39 @@
+import os
+import pandas as pd
+
+from logics.entry import execute_pipeline, execute_batch, process_file, output_names
+from logics.namespaces.enums import RunStatus
+from logics.benchmarks.synthetic import make_register
+
+def test_same_stem_registers_keep_their_outputs(tmp_path, monkeypatch):
+    # the checkpoints go to the relative ProgramPaths.checkpoint_path
+    monkeypatch.chdir(tmp_path)
+    uploads, downloads = tmp_path / 'uploads', tmp_path / 'downloads'
+    uploads.mkdir()
+    make_register(30, 1).to_excel(uploads / 'foo.xlsx', index=False)
+    make_register(20, 2).to_csv(uploads / 'foo.csv', index=False)
+
+    statuses = execute_pipeline(str(uploads), str(downloads), checkpoint=True)
+
+    assert {file: status.status for file, status in statuses.items()} == {'foo.csv': RunStatus.DONE, 'foo.xlsx': RunStatus.DONE}
+    assert statuses['foo.xlsx'].outputs == (str(downloads / 'foo_xlsx.xlsx'),)
+    assert statuses['foo.csv'].outputs == (str(downloads / 'foo_csv.xlsx'),)
+    assert len(pd.read_excel(downloads / 'foo_xlsx.xlsx')) == 30
+    assert len(pd.read_excel(downloads / 'foo_csv.xlsx')) == 20
+    checkpoints = tmp_path / 'assets' / 'checkpoints'
+    assert not checkpoints.exists() or not os.listdir(checkpoints)
+
+def test_outputs_are_the_written_workbooks(tmp_path):
+    uploads, downloads = tmp_path / 'uploads', tmp_path / 'downloads'
+    uploads.mkdir()
+    downloads.mkdir()
+    make_register(20, 1).to_excel(uploads / 'bar.xlsx', index=False)
+
+    assert process_file(str(uploads), 'bar', '.xlsx', str(downloads)) == [str(downloads / 'bar.xlsx')]
+    statuses = execute_batch(str(uploads), str(tmp_path / 'batch'), workers=1)
+    assert statuses['bar.xlsx'].outputs == (str(tmp_path / 'batch' / 'bar.xlsx'),)
+    for output in (downloads / 'bar.xlsx', tmp_path / 'batch' / 'bar.xlsx'):
+        assert len(pd.read_excel(output)) == 20
+
+def test_output_names_strip_the_input_extension():
+    assert output_names(['foo.xlsx', 'foo.csv', 'bar.ndjson']) == {'foo.xlsx': 'foo_xlsx', 'foo.csv': 'foo_csv', 'bar.ndjson': 'bar'}
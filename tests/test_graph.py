@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from logics.processors.core.data import DataProcessor
+from logics.processors.core.graph import DecoderGraph
+from logics.processors.data.phones import PhoneParser
+
+def serial(df: pd.DataFrame) -> pd.DataFrame:
+    '''The chain as it ran before the graph: every decoder on the whole frame, one after another'''
+    for decoder in DataProcessor().decoders:
+        df = decoder(df).decode()
+    return df
+
+@pytest.mark.parametrize('workers', [1, None])
+def test_graph_matches_serial_chain(frame, workers):
+    graph = DecoderGraph(DataProcessor().decoders, workers)
+    pd.testing.assert_frame_equal(graph.run(frame.copy()), serial(frame.copy()))
+
+def test_skippable_decoders_are_not_run(frames):
+    assert DecoderGraph.skipped(PhoneParser, frames['bare'])
+    assert not DecoderGraph.skipped(PhoneParser, frames['register'])
+
+def test_levels_keep_conflicting_decoders_apart():
+    graph = DecoderGraph(DataProcessor().decoders)
+    for level in graph.levels:
+        assert not any(DecoderGraph.conflicts(first, second) for first in level for second in level if first is not second)
+    # the full frame decoder waits for every other one
+    assert graph.levels[-1] == [DataProcessor().decoders[-1]]
@@ -0,0 +1,47 @@
+import os
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+
+from logics.processors.core.graph import DecoderGraph
+from logics.processors.data.numbering import NumberingPlan
+from logics.processors.data.phones import PhoneParser
+
+NUMBERING = os.path.join(os.path.dirname(__file__), 'fixtures', 'numbering')
+
+@pytest.fixture
+def plan(monkeypatch) -> NumberingPlan:
+    plan = NumberingPlan.load(NUMBERING)
+    monkeypatch.setattr('logics.processors.data.phones.numbering_plan', lambda: plan)
+    monkeypatch.setattr('logics.processors.polars.decoders.numbering_plan', lambda: plan)
+    return plan
+
+def test_load_reads_both_encodings(plan):
+    assert len(plan) == 7
+    assert list(plan.starts) == sorted(plan.starts)
+    assert 'г. Санкт-Петербург' in plan.region_names and 'ООО "Т2 Мобайл"' in plan.operator_names
+
+def test_classify(plan):
+    column = pd.Series(['+79120000001', '+79123500000', '+79125000000', '+74951500000', '+78120000000',
+                        '+442079460958', '', np.nan, None], dtype=object)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        types, operators, regions = plan.classify(column)
+    assert types.tolist() == ['mobile', 'mobile', '', 'landline', 'landline', '', '', '', '']
+    assert operators.tolist() == ['ПАО "МТС"', 'ПАО "МегаФон"', '', 'ПАО "Ростелеком"', 'ПАО "Ростелеком"', '', '', '', '']
+    assert regions.tolist()[:2] == ['Свердловская обл.', 'Пермский край']
+
+def test_phone_parser_columns(plan):
+    df = pd.DataFrame({'p1': ['8 (912) 000-00-01', '84952500000', 'нет'], 'phones': ['89160000000, 8124567890', '', '89990000000']})
+    decoded = PhoneParser(df).decode()
+    assert decoded['p1_type'].tolist() == ['mobile', 'landline', '']
+    assert decoded['p1_operator'].tolist() == ['ПАО "МТС"', 'ПАО "МГТС"', '']
+    assert decoded['p1_region'].tolist() == ['Свердловская обл.', 'г. Москва', '']
+
+def test_polars_classify(plan):
+    pytest.importorskip('polars')
+    from logics.processors.polars.graph import PolarsGraph
+    df = pd.DataFrame({'p1': ['89120000001', '84951500000', '', '+442079460958'] * 5,
+                       'phones_2': ['89160000000; 89991050000', '88120000000', 'x', ''] * 5})
+    pd.testing.assert_frame_equal(DecoderGraph([PhoneParser]).run(df.copy()), PolarsGraph([PhoneParser]).run(df.copy()))
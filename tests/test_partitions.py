@@ -0,0 +1,12 @@
+import logging
+import pandas as pd
+
+from logics.processors.core.data import DataProcessor
+
+def test_partitions_match_serial_run(frame, caplog):
+    processor = DataProcessor(processes=2, partition_size=len(frame) // 4)
+    with caplog.at_level(logging.INFO):
+        partitioned = processor.process_data(frame.copy())
+    if processor.graph.partitionable(frame):
+        assert f'Decoding {len(frame)} rows in 4 partitions' in caplog.text
+    pd.testing.assert_frame_equal(partitioned, DataProcessor().process_data(frame.copy()))
@@ -0,0 +1,21 @@
+import logging
+
+import pytest
+
+from logics.benchmarks.synthetic import make_register
+from logics.namespaces.enums import Person
+from logics.processors.data.person import PersonDecoder
+
+NAMES = [Person.NAME.value, Person.SURNAME.value, Person.LASTNAME.value, Person.ADDNAME.value]
+
+@pytest.mark.parametrize('rows', [1, 19, 300])
+def test_synthetic_names_split(rows, caplog):
+    df = make_register(rows, 1)
+    decoder = PersonDecoder(df.copy())
+    with caplog.at_level(logging.WARNING):
+        decoded = decoder.decode()
+    assert not decoder.failed
+    assert not [record for record in caplog.records if 'Error splitting' in record.getMessage()]
+    assert set(NAMES) <= set(decoded.columns)
+    assert (decoded[Person.NAME.value] + ' ' + decoded[Person.SURNAME.value] + ' ' + decoded[Person.LASTNAME.value]
+            + decoded[Person.ADDNAME.value].map(lambda addname: f' {addname}' if addname else '')).equals(df['fio_full'])
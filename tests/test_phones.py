@@ -0,0 +1,95 @@
+import random
+import pandas as pd
+import pytest
+
+from logics.processors.data import normalizer
+from logics.processors.data.phones import PhoneParser
+from logics.processors.data.normalizer import PhoneNormalizer, PhoneCache, PhonePool
+
+LEADS = ['', '+', '8', '7', '+7', '+8', '810', '8810', '+7810', '0', '00', '9', '89', '79', '+79', '80', '81', '7 ', '+ 7']
+ODD = ['nan', '', 'Нет', 'None', '.0', '-', '+', '7', '8', '+7', '12', '+1 650 253 0000', '+44 20 7946 0958',
+       '8-800-555-35-35', '(495)123-45-67']
+
+def samples(seed: int, count: int) -> pd.Series:
+    '''Phones in the shapes registers have them: formatted, excel floats, extensions, non ASCII digits, two in a cell'''
+    rng = random.Random(seed)
+    digits = lambda n: ''.join(rng.choice('0123456789') for _ in range(n))
+    values = []
+    for _ in range(count):
+        lead = rng.choice(LEADS)
+        value = lead + digits(max(0, rng.choice([9, 10, 11, 12]) - len(lead.replace('+', '').replace(' ', ''))))
+        shape = rng.random()
+        if shape < 0.2 and len(value) >= 11:
+            value = f"{value[:-10]} ({value[-10:-7]}) {value[-7:-4]}-{value[-4:-2]}-{value[-2:]}"
+        elif shape < 0.3:
+            value = value[:3] + ' ' + value[3:]
+        extra = rng.random()
+        if extra < 0.1:
+            value += '.0'
+        elif extra < 0.12:
+            value += '.0.0'
+        elif extra < 0.14:
+            value = value.replace('9', '９')
+        elif extra < 0.16:
+            value += ' доб. 12'
+        elif extra < 0.2:
+            value = rng.choice(ODD)
+        elif extra < 0.22:
+            value = value + ',' + value
+        values.append(value)
+    return pd.Series(values + [None, float('nan')], dtype=object)
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_normalize_matches_find(seed):
+    column = samples(seed, 3000)
+    normalized = PhoneNormalizer(PhoneParser.find, cache=PhoneCache()).normalize(column)
+    assert normalized.tolist() == column.apply(PhoneParser.find).tolist()
+
+def test_normalize_through_the_pool(monkeypatch):
+    monkeypatch.setattr(normalizer, 'PARALLEL_MIN', 1)
+    column = samples(2, 500)
+    pool = PhonePool(2)
+    try:
+        normalized = PhoneNormalizer(PhoneParser.find, cache=PhoneCache(), pool=pool).normalize(column)
+    finally:
+        pool.shutdown()
+    assert normalized.tolist() == column.apply(PhoneParser.find).tolist()
+
+def test_cache_parses_each_value_once():
+    cache = PhoneCache()
+    column = samples(3, 500)
+    PhoneNormalizer(PhoneParser.find, cache=cache).normalize(column)
+    misses = cache.misses
+    PhoneNormalizer(PhoneParser.find, cache=cache).normalize(column)
+    assert cache.misses == misses and cache.hits >= misses
+
+def split_rows(column: pd.Series, delimiter: str, width: int) -> pd.DataFrame:
+    '''The split as _multiple_strategy took it row by row: split_phone_numbers, None past a row's last phone'''
+    rows = column.apply(lambda row: PhoneParser.split_phone_numbers(row, delimiter))
+    return pd.DataFrame({i: rows.apply(lambda phones: phones[i] if i < len(phones) else None) for i in range(width)})
+
+@pytest.mark.parametrize('delimiter', [',', ';', '\t'])
+def test_split_matches_row_wise(delimiter):
+    rng = random.Random(4)
+    phones = samples(4, 300).fillna('nan').astype(str).str.replace(delimiter, ' ', regex=False)
+    column = pd.Series([f'{delimiter} '.join(rng.sample(list(phones), rng.randint(1, 4))) for _ in range(300)] + ['', ' '])
+    width = int(column.str.split(delimiter, regex=False).str.len().max())
+    split = PhoneParser.split_phone_column(column, delimiter).reindex(columns=range(width))
+    split = split.astype(object).where(split.notna(), None)
+    pd.testing.assert_frame_equal(split, split_rows(column, delimiter, width))
+
+def test_codes_match_row_wise():
+    column = PhoneNormalizer(PhoneParser.find, cache=PhoneCache()).normalize(samples(5, 500))
+    codes, bodies = PhoneParser.format_phone_column(column)
+    assert list(zip(codes, bodies)) == [PhoneParser.format_phones(row) for row in column]
+
+def test_multiple_phones_columns_match_row_wise():
+    phones = samples(6, 198).fillna('nan').astype(str).str.replace(',', ' ', regex=False)
+    df = pd.DataFrame({'phones_2': [', '.join(phones[i:i + 1 + i % 3]) for i in range(200)], 'p1': phones.iloc[::-1].tolist()})
+    decoded = PhoneParser(df.copy()).decode()
+    split = split_rows(df['phones_2'], ',', 3)
+    for i in range(3):
+        expected = split[i].apply(PhoneParser.find).where(split[i].notna(), '')
+        assert decoded[f'phones_2|p{i + 1}'].tolist() == expected.tolist()
+        assert decoded[f'phones_2|p{i + 1}_code'].tolist() == [PhoneParser.format_phones(row)[0] for row in expected]
+    assert decoded['p1'].tolist() == df['p1'].apply(PhoneParser.find).tolist()
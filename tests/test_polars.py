@@ -0,0 +1,28 @@
+import logging
+import pandas as pd
+import pytest
+
+pytest.importorskip('polars')
+
+from logics.interfaces.xl import Backend
+from logics.processors.core.data import DataProcessor
+from logics.processors.core.graph import DecoderGraph
+from logics.processors.data.phones import PhoneParser
+from logics.processors.polars.graph import PolarsGraph
+
+def test_phone_parser_port(frame, caplog):
+    with caplog.at_level(logging.INFO):
+        polars = PolarsGraph([PhoneParser]).run(frame.copy())
+    if not DecoderGraph.skipped(PhoneParser, frame):
+        assert "Polars query: ['PhoneParser']" in caplog.text
+    pd.testing.assert_frame_equal(DecoderGraph([PhoneParser]).run(frame.copy()), polars)
+
+def test_backends(frame):
+    pandas = DataProcessor(backend=Backend.PANDAS).process_data(frame.copy())
+    polars = DataProcessor(backend=Backend.POLARS).process_data(frame.copy())
+    pd.testing.assert_frame_equal(pandas, polars)
+
+def test_full_chain_in_one_query(frames, caplog):
+    with caplog.at_level(logging.INFO):
+        DataProcessor(backend=Backend.POLARS).process_data(frames['unnamed'].copy())
+    assert "'PhoneParser'" in caplog.text and "'DataframeDecoder']" in caplog.text
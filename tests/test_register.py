@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from logics.processors.data.register import RegisterDecoder
+
+IDS = ['client_id', 'credit_id', 'outer_id']
+
+@pytest.mark.parametrize('ids', [
+    {'client_id': [1, 2], 'credit_id': [3.0, np.nan], 'outer_id': [5, 6]},
+    {'client_id': [1, 2], 'credit_id': [3, 4], 'outer_id': [5, 6]},
+    {'client_id': ['A1', 'B2'], 'credit_id': [3.0, np.nan], 'outer_id': [5, 6]},
+    {'client_id': ['A1', np.nan], 'credit_id': ['C1', 'C2'], 'outer_id': [True, False]},
+    {'client_id': [1.5, np.nan], 'credit_id': [np.nan, np.nan], 'outer_id': [7, 8]},
+], ids=['int-float-nan', 'ints', 'text-float-nan', 'text-nan-bool', 'floats'])
+def test_concat_columns_matches_row_wise(ids):
+    df = pd.DataFrame(ids)
+    expected = df.apply(RegisterDecoder.concat_values, axis=1)
+    pd.testing.assert_series_equal(RegisterDecoder.concat_columns(df[IDS]), expected, check_names=False)
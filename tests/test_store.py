@@ -0,0 +1,44 @@
+import logging
+import pandas as pd
+import pytest
+
+from logics.processors.core.data import DataProcessor
+from logics.processors.core.store import RowStore, package_modules
+from logics.namespaces.namespace import Namespace
+from logics.benchmarks.synthetic import make_register
+
+ROWS = 300
+
+@pytest.fixture
+def days() -> tuple:
+    full = make_register(ROWS + ROWS // 5, 1)
+    first = full.iloc[:ROWS].reset_index(drop=True)
+    # a tenth of the first day gone, a tenth new, shuffled, and a few rows changed
+    second = pd.concat([full.iloc[ROWS // 10:ROWS], full.iloc[ROWS:ROWS + ROWS // 10]]).sample(frac=1, random_state=0)
+    second.iloc[:5, second.columns.get_loc('credit_num')] = 'changed'
+    return first, second
+
+def test_overlapping_register_reuses_stored_rows(tmp_path, days, caplog):
+    first, second = days
+    store = RowStore(str(tmp_path))
+    pd.testing.assert_frame_equal(DataProcessor(store=store).process_data(first.copy()), DataProcessor().process_data(first.copy()))
+    with caplog.at_level(logging.INFO):
+        incremental = DataProcessor(store=store).process_data(second.copy())
+    # the rows of the first day still there, but for the changed ones
+    reused = ROWS - ROWS // 10 - 5
+    assert f"Row store: {reused} of {len(second)} rows reused, decoding {len(second) - reused}" in caplog.text
+    pd.testing.assert_frame_equal(incremental, DataProcessor().process_data(second.copy()))
+
+def test_namespace_change_decodes_again(tmp_path, days, monkeypatch, caplog):
+    first, _ = days
+    store = RowStore(str(tmp_path))
+    DataProcessor(store=store).process_data(first.copy())
+    monkeypatch.setattr(Namespace, 'plan', 'OTHER')
+    with caplog.at_level(logging.INFO):
+        decoded = DataProcessor(store=store).process_data(first.copy())
+    assert f'Row store: 0 of {ROWS} rows reused' in caplog.text
+    pd.testing.assert_frame_equal(decoded, DataProcessor().process_data(first.copy()))
+
+def test_fingerprint_follows_imports():
+    modules = package_modules(frozenset(['logics.processors.data.phones']))
+    assert {'logics.processors.data.normalizer', 'logics.processors.data.numbering', 'logics.functions.frames'} <= set(modules)
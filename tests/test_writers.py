@@ -0,0 +1,146 @@
+import json
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from logics.processors.core import writers
+from logics.processors.core.readers import FileReader
+from logics.processors.core.writers import DataWriter, BackgroundWriter
+from logics.interfaces.paths import Extension
+from logics.namespaces.enums import Partition, RunStatus
+
+ROWS = 120
+CHUNK = 50
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'name': [f'client {i}' for i in range(ROWS)],
+        'total': [i * 1.5 for i in range(ROWS)],
+        'count': list(range(ROWS)),
+        'region': [['Москва', 'Казань', np.nan][i % 3] for i in range(ROWS)],
+    })
+
+def chunks(df: pd.DataFrame):
+    return (df.iloc[start:start + CHUNK] for start in range(0, len(df), CHUNK))
+
+@pytest.mark.parametrize('streamed', [False, True], ids=['frame', 'chunks'])
+def test_xlsx_roundtrip(frame, tmp_path, streamed):
+    DataWriter(str(tmp_path)).save_file(chunks(frame) if streamed else frame, Extension.XLSX, 'out')
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path / 'out.xlsx', sheet_name='Main'), frame)
+
+@pytest.mark.parametrize('streamed', [False, True], ids=['frame', 'chunks'])
+def test_csv_roundtrip(frame, tmp_path, streamed):
+    DataWriter(str(tmp_path)).save_file(chunks(frame) if streamed else frame, Extension.CSV, 'out')
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'out.csv'), frame)
+
+def test_workbook_holds_every_dataset(frame, tmp_path):
+    DataWriter(str(tmp_path)).save_workbook({'Main': chunks(frame), 'Empty': frame.iloc[:0]}, 'out')
+    sheets = pd.read_excel(tmp_path / 'out.xlsx', sheet_name=None)
+    assert list(sheets) == ['Main', 'Empty']
+    pd.testing.assert_frame_equal(sheets['Main'], frame)
+    assert list(sheets['Empty'].columns) == list(frame.columns) and sheets['Empty'].empty
+
+@pytest.mark.parametrize('method, read', [
+    (Extension.PARQUET, pd.read_parquet),
+    (Extension.FEATHER, pd.read_feather),
+    (Extension.CSV_GZ, pd.read_csv),
+], ids=['parquet', 'feather', 'csv.gz'])
+def test_columnar_roundtrip(frame, tmp_path, method, read):
+    DataWriter(str(tmp_path)).save_file(chunks(frame), method, 'out')
+    written = read(tmp_path / f'out{method.value}')
+    # Arrow reads missing strings back as None
+    pd.testing.assert_frame_equal(written.where(written.notna(), np.nan), frame)
+
+def test_mixed_column_is_written_as_text(frame, tmp_path):
+    frame['count'] = frame['count'].astype(object)
+    frame.loc[0, 'count'] = 'none'
+    DataWriter(str(tmp_path)).save_file(chunks(frame), Extension.PARQUET, 'out')
+    assert pd.read_parquet(tmp_path / 'out.parquet')['count'].tolist() == frame['count'].astype(str).tolist()
+
+@pytest.mark.parametrize('method, suffix', [(Extension.PARQUET, 'parquet'), (Extension.FEATHER, 'feather')])
+def test_partitioned_output(frame, tmp_path, method, suffix):
+    DataWriter(str(tmp_path)).save_file(chunks(frame), method, 'out', partition_by=Partition.REGION)
+    parts = sorted(unquote(path.parent.name) for path in (tmp_path / 'out').rglob(f'*.{suffix}'))
+    assert parts == ['region=__HIVE_DEFAULT_PARTITION__', 'region=Казань', 'region=Москва']
+    read = pd.read_parquet if method is Extension.PARQUET else pd.read_feather
+    written = pd.concat(read(path) for path in (tmp_path / 'out').rglob(f'*.{suffix}'))
+    assert len(written) == ROWS
+    assert sorted(written['name']) == sorted(frame['name'])
+
+def test_partitioning_needs_an_arrow_format_and_the_column(frame, tmp_path):
+    writer = DataWriter(str(tmp_path))
+    with pytest.raises(ValueError):
+        writer.save_file(frame, Extension.CSV, 'out', partition_by=Partition.REGION)
+    with pytest.raises(KeyError):
+        writer.save_file(frame, Extension.PARQUET, 'out', partition_by=Partition.PRODUCT)
+
+@pytest.mark.parametrize('max_rows, sheets', [
+    (ROWS + 1, ['Main']),
+    (ROWS, ['Main', 'Main_2']),
+    (41, ['Main', 'Main_2', 'Main_3']),
+])
+def test_sheets_split_at_max_rows(frame, tmp_path, max_rows, sheets):
+    DataWriter(str(tmp_path), max_rows=max_rows).save_file(chunks(frame), Extension.XLSX, 'out')
+    written = pd.read_excel(tmp_path / 'out.xlsx', sheet_name=None)
+    assert list(written) == sheets
+    # max_rows counts the header of each sheet
+    assert all(len(sheet) <= max_rows - 1 for sheet in written.values())
+    pd.testing.assert_frame_equal(pd.concat(written.values(), ignore_index=True), frame)
+
+def test_split_sheet_titles_fit_excel():
+    title = 'A' * 40
+    assert DataWriter.sheet_title(title, 1) == 'A' * 31
+    assert DataWriter.sheet_title(title, 12) == 'A' * 28 + '_12'
+
+def test_background_writer_writes_queued_outputs(frame, tmp_path):
+    done = []
+    with BackgroundWriter(DataWriter(str(tmp_path)), on_done=done.append) as writer:
+        writer.submit({'Main': frame}, 'first')
+        writer.submit({'Main': chunks(frame)}, 'second', file='second.csv')
+    assert [status.file for status in done] == ['first', 'second.csv']
+    assert all(writer.statuses[file].status is RunStatus.DONE for file in ('first', 'second.csv'))
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path / 'second.xlsx'), frame)
+    with pytest.raises(RuntimeError):
+        writer.submit({'Main': frame}, 'late')
+
+def test_background_writer_reports_errors_and_goes_on(frame, tmp_path):
+    failed, done = [], []
+    def broken(status):
+        raise RuntimeError('callback')
+    with BackgroundWriter(DataWriter(str(tmp_path)), on_done=broken, on_error=failed.append) as writer:
+        writer.submit({'Main': iter([frame, frame.drop(columns='region')])}, 'broken')
+        writer.submit({'Main': frame}, 'fine')
+    assert [status.file for status in failed] == ['broken']
+    assert writer.statuses['broken'].status is RunStatus.FAILED
+    assert writer.statuses['broken'].error.startswith('ValueError')
+    # neither the failed output nor the raising callback stopped the thread
+    assert writer.statuses['fine'].status is RunStatus.DONE
+    assert (tmp_path / 'fine.xlsx').is_file()
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(writers, 'JSON_CHUNK', 7)
+
+def test_ndjson_is_one_record_per_line(frame, tmp_path, small_batches):
+    DataWriter(str(tmp_path)).save_file(chunks(frame), Extension.NDJSON, 'out')
+    lines = (tmp_path / 'out.ndjson').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == ROWS
+    assert [json.loads(line) for line in lines] == json.loads(frame.to_json(orient='records'))
+
+def test_json_array_matches_to_json(frame, tmp_path, small_batches):
+    DataWriter(str(tmp_path)).save_file(chunks(frame), Extension.JSON, 'out')
+    assert json.loads((tmp_path / 'out.json').read_text(encoding='utf-8')) == json.loads(frame.to_json(orient='records'))
+    DataWriter(str(tmp_path)).save_file(frame.iloc[:0], Extension.JSON, 'empty')
+    assert json.loads((tmp_path / 'empty.json').read_text(encoding='utf-8')) == []
+
+def test_ndjson_reads_back_whole_and_streamed(frame, tmp_path, small_batches):
+    DataWriter(str(tmp_path)).save_file(chunks(frame), Extension.NDJSON, 'out')
+    reader = FileReader(str(tmp_path), 'out', Extension.NDJSON.value)
+    whole = reader.read_file()
+    streamed = list(reader.read_chunks(CHUNK))
+    assert [len(chunk) for _, chunk in streamed] == [50, 50, 20]
+    pd.testing.assert_frame_equal(pd.concat([chunk for _, chunk in streamed]), whole)
+    pd.testing.assert_frame_equal(whole.where(whole.notna(), np.nan), frame)